@@ -0,0 +1,137 @@
+# AI 서버 요청 수 제한 (프로세스 단위 admission control / backpressure)
+# - 동시에 무거운 처리(파싱/인코딩)를 하는 요청 수를 max_concurrent 로 제한
+# - 자리를 기다리는 요청은 max_queue 개까지만 허용, 넘치면 바로 429
+# - queue_timeout 동안 자리가 나지 않으면 503
+# - 처리 중인 이력서 파일 수 합계를 max_inflight_files 로 제한 (메모리 상한)
+#   업로드 본문을 받기 전에 admit() 으로 자리를 잡고, 파일 수를 알게 된 뒤 Ticket.add_files() 로 확인할 수 있다
+# 거절 시 Retry-After 헤더에 넣을 초 값을 같이 전달한다.
+import threading
+import time
+from typing import Dict, Optional
+
+
+class Overloaded(Exception):
+    """서버가 포화 상태라 요청을 받을 수 없음 (429 / 503)"""
+
+    def __init__(self, message: str, status_code: int, retry_after: int):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class RequestTimeout(TimeoutError):
+    """요청 처리 시간 제한 초과 (504)"""
+
+
+class Deadline:
+    """요청별 처리 마감 시각. 단계 사이에서 check(), 대기 함수에는 remaining() 을 넘긴다"""
+
+    def __init__(self, seconds: Optional[float]):
+        self.expires_at = time.monotonic() + seconds if seconds and seconds > 0 else None
+
+    def remaining(self) -> Optional[float]:
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def check(self, stage: str = ""):
+        if self.expires_at is not None and time.monotonic() >= self.expires_at:
+            raise RequestTimeout(f"요청 처리 시간 초과{f' ({stage})' if stage else ''}")
+
+
+class Ticket:
+    """admit() 로 받은 처리 자격. with 문 또는 release() 로 반납 (중복 반납은 무시)"""
+
+    def __init__(self, controller: "AdmissionController", files: int):
+        self._controller = controller
+        self._files = files
+        self._released = False
+
+    def add_files(self, files: int):
+        """자리를 잡은 뒤 알게 된 파일 수를 추가. 파일 수 상한 초과가 queue_timeout 안에 풀리지 않으면 503 (Overloaded)"""
+        self._controller._add_files(files)
+        self._files += files
+
+    def release(self):
+        if not self._released:
+            self._released = True
+            self._controller._release(self._files)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class AdmissionController:
+    def __init__(self, max_concurrent: int, max_queue: int, queue_timeout: float,
+                 max_inflight_files: int, retry_after: int):
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout = queue_timeout
+        self.max_inflight_files = max_inflight_files
+        self.retry_after = retry_after
+        self._cond = threading.Condition()
+        self._active = 0
+        self._waiting = 0
+        self._files = 0
+        self._rejected = {429: 0, 503: 0}
+
+    def _has_room(self, files: int) -> bool:
+        if self._active >= self.max_concurrent:
+            return False
+        return self._has_file_room(files)
+
+    def _has_file_room(self, files: int) -> bool:
+        # 파일 수 상한보다 큰 요청 하나는 다른 요청이 없을 때만 처리
+        return self._files == 0 or self.max_inflight_files <= 0 or self._files + files <= self.max_inflight_files
+
+    def _reject(self, message: str, status_code: int):
+        self._rejected[status_code] += 1
+        return Overloaded(message, status_code, self.retry_after)
+
+    def admit(self, files: int = 0) -> Ticket:
+        """처리 자격 획득. 대기열이 가득 차면 429, queue_timeout 안에 자리가 없으면 503 (Overloaded)"""
+        with self._cond:
+            if not self._has_room(files):
+                if self._waiting >= self.max_queue:
+                    raise self._reject("요청이 많아 대기열이 가득 찼습니다.", 429)
+                self._waiting += 1
+                try:
+                    deadline = time.monotonic() + self.queue_timeout
+                    while not self._has_room(files):
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            raise self._reject("요청이 많아 처리 대기 시간이 초과되었습니다.", 503)
+                        self._cond.wait(remaining)
+                finally:
+                    self._waiting -= 1
+            self._active += 1
+            self._files += files
+        return Ticket(self, files)
+
+    def _add_files(self, files: int):
+        with self._cond:
+            deadline = time.monotonic() + self.queue_timeout
+            while not self._has_file_room(files):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise self._reject("처리 중인 이력서 파일이 많아 대기 시간이 초과되었습니다.", 503)
+                self._cond.wait(remaining)
+            self._files += files
+
+    def _release(self, files: int):
+        with self._cond:
+            self._active -= 1
+            self._files -= files
+            self._cond.notify_all()
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            return {
+                "active": self._active, "waiting": self._waiting, "inflight_files": self._files,
+                "max_concurrent": self.max_concurrent, "max_queue": self.max_queue,
+                "max_inflight_files": self.max_inflight_files,
+                "rejected_429": self._rejected[429], "rejected_503": self._rejected[503],
+            }
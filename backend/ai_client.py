@@ -0,0 +1,179 @@
+# AI 서버(final_ai_server.py) 호출 모음
+import asyncio
+import json
+import os
+import re
+import secrets
+from typing import List, Optional
+
+import anyio
+import httpx
+
+# --- AI 서버 설정 ---
+AI_SERVER_URL = os.getenv("AI_SERVER_URL", "http://34.168.7.102:5000/api/v1/screen")
+AI_SEARCH_URL = os.getenv("AI_SEARCH_URL", AI_SERVER_URL.rsplit("/", 1)[0] + "/search")
+AI_INDEX_JOBS_URL = os.getenv("AI_INDEX_JOBS_URL", AI_SERVER_URL.rsplit("/", 1)[0] + "/index/jobs")
+AI_TIMEOUT = float(os.getenv("AI_TIMEOUT", "300"))
+AI_TOP_K = int(os.getenv("AI_TOP_K", "0"))          # 0 이면 전체 지원자 저장
+AI_MAX_CONNECTIONS = int(os.getenv("AI_MAX_CONNECTIONS", "20"))
+AI_MAX_KEEPALIVE = int(os.getenv("AI_MAX_KEEPALIVE", "10"))
+AI_STREAM = os.getenv("AI_STREAM", "true").lower() == "true"   # NDJSON 스트리밍 응답 사용 여부
+# 요청에서 명시한 필수 조건(required_*)을 AI 서버의 사전 필터(조건 미달 지원자는 인코딩/저장 안 함)로 보낼지 여부
+AI_HARD_FILTER = os.getenv("AI_HARD_FILTER", "true").lower() == "true"
+UPLOAD_CHUNK_SIZE = 1024 * 1024   # 업로드 파일을 읽어 보내는 단위
+# ------------------
+
+# 요청마다 새로 만들지 않고 커넥션 풀을 공유하는 클라이언트 (main.py startup/shutdown 에서 관리)
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=AI_TIMEOUT,
+            limits=httpx.Limits(max_connections=AI_MAX_CONNECTIONS, max_keepalive_connections=AI_MAX_KEEPALIVE),
+        )
+    return _client
+
+
+async def close_client():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+class AIServerError(Exception):
+    """AI 서버가 200 이외의 응답을 준 경우"""
+
+
+async def screen(upload_files: list, prompt: str, job_id: int, requirements: Optional[dict] = None) -> dict:
+    """
+    이력서 ZIP 분석 요청. upload_files 는 (디스크 경로, 원본 파일명, content_type) 목록.
+    job_id 를 같이 보내 AI 서버가 지원자 벡터를 (작업 id, 순위)로 인덱싱하도록 한다.
+    multipart 본문은 MultipartUpload 가 파일을 청크 단위로 읽어 만들어 전송한다
+    (ZIP 전체를 메모리에 올리지 않고, 파일 읽기로 이벤트 루프를 막지 않음).
+    """
+    upload = await MultipartUpload.create(_screen_form(prompt, job_id, requirements), upload_files)
+    response = await get_client().post(AI_SERVER_URL, content=upload, headers=upload.headers)
+
+    if response.status_code != 200:
+        raise AIServerError(f"AI Error: {response.text}")
+    return response.json()
+
+
+_FORM_PARAM_ESCAPES = {'"': "%22", "\\": "\\\\", **{chr(c): f"%{c:02X}" for c in range(0x20) if c != 0x1B}}
+_FORM_PARAM_PATTERN = re.compile("|".join(re.escape(c) for c in _FORM_PARAM_ESCAPES))
+
+
+def _form_param(value: str) -> str:
+    # 브라우저(HTML5)와 같은 방식으로 따옴표/제어 문자만 escape (한글 파일명은 UTF-8 그대로)
+    return _FORM_PARAM_PATTERN.sub(lambda m: _FORM_PARAM_ESCAPES[m.group(0)], value)
+
+
+class MultipartUpload:
+    """
+    multipart/form-data 요청 본문 (httpx 의 content 로 넘기는 비동기 iterator).
+    httpx 의 files= 는 동기 파일 객체를 이벤트 루프에서 그대로 읽으므로 쓰지 않고,
+    파일은 anyio(워커 스레드)로 UPLOAD_CHUNK_SIZE 씩 읽어 보낸다. 파일 크기로 Content-Length 를 미리 계산
+    """
+
+    def __init__(self, fields: list, length: int):
+        self.boundary = secrets.token_hex(16)
+        self._fields = fields   # (헤더 bytes, 값 bytes 또는 None, 파일 경로 또는 None)
+        self.headers = {
+            "Content-Type": f"multipart/form-data; boundary={self.boundary}",
+            "Content-Length": str(length + self._overhead()),
+        }
+
+    @classmethod
+    async def create(cls, data: dict, upload_files: list) -> "MultipartUpload":
+        """data: 폼 필드, upload_files: (디스크 경로, 원본 파일명, content_type) 목록 ('file' 필드로 전송)"""
+        fields, length = [], 0
+        for name, value in data.items():
+            value = str(value).encode("utf-8")
+            fields.append((f'Content-Disposition: form-data; name="{_form_param(name)}"\r\n\r\n'.encode("utf-8"),
+                           value, None))
+            length += len(value)
+        for path, filename, content_type in upload_files:
+            header = (f'Content-Disposition: form-data; name="file"; filename="{_form_param(filename)}"\r\n'
+                      f'Content-Type: {content_type or "application/octet-stream"}\r\n\r\n')
+            fields.append((header.encode("utf-8"), None, path))
+            length += await asyncio.to_thread(os.path.getsize, path)
+        return cls(fields, length)
+
+    def _part_start(self, header: bytes) -> bytes:
+        return f"--{self.boundary}\r\n".encode("ascii") + header
+
+    def _end(self) -> bytes:
+        return f"--{self.boundary}--\r\n".encode("ascii")
+
+    def _overhead(self) -> int:
+        # 값/파일 내용을 뺀 구분자, 헤더, 줄바꿈 길이
+        return sum(len(self._part_start(header)) + 2 for header, _, _ in self._fields) + len(self._end())
+
+    async def __aiter__(self):
+        for header, value, path in self._fields:
+            yield self._part_start(header)
+            if path is None:
+                yield value
+            else:
+                async with await anyio.open_file(path, "rb") as f:
+                    while True:
+                        chunk = await f.read(UPLOAD_CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        yield chunk
+            yield b"\r\n"
+        yield self._end()
+
+
+def _screen_form(prompt: str, job_id: int, requirements: Optional[dict] = None) -> dict:
+    data = {"job_description": prompt, "job_id": str(job_id)}
+    if AI_TOP_K > 0:
+        data["top_k"] = str(AI_TOP_K)
+    # requirements: required_degree / required_certifications / required_skills / preferred_terms / lexical_weight (빈 값은 생략)
+    for key, value in (requirements or {}).items():
+        if value not in (None, "") and (AI_HARD_FILTER or not key.startswith("required_")):
+            data[key] = str(value)
+    return data
+
+
+async def screen_stream(upload_files: list, prompt: str, job_id: int, requirements: Optional[dict] = None):
+    """
+    screen 의 스트리밍 버전. AI 서버가 NDJSON 으로 보내는 메시지(dict)를 도착하는 대로 yield.
+    (start -> batch ... -> result, 실패 시 error 메시지)
+    """
+    data = _screen_form(prompt, job_id, requirements)
+    data["stream"] = "1"
+    upload = await MultipartUpload.create(data, upload_files)
+
+    async with get_client().stream("POST", AI_SERVER_URL, content=upload, headers=upload.headers) as response:
+        if response.status_code != 200:
+            await response.aread()
+            raise AIServerError(f"AI Error: {response.text}")
+        async for line in response.aiter_lines():
+            if line.strip():
+                yield json.loads(line)
+
+
+async def search(query: str, top_k: int, job_ids: Optional[List[int]] = None) -> list:
+    """과거 분석 작업 지원자 벡터 검색. [{job_id, rank, name, score}] 반환"""
+    payload = {"job_description": query, "top_k": top_k}
+    if job_ids is not None:
+        payload["job_ids"] = job_ids
+
+    response = await get_client().post(AI_SEARCH_URL, json=payload)
+
+    if response.status_code != 200:
+        raise AIServerError(f"AI Error: {response.text}")
+    return response.json().get("data", [])
+
+
+async def delete_job_vectors(job_id: int) -> int:
+    """삭제된 분석 작업의 지원자 벡터를 AI 서버 검색 대상에서 제외. 제외된 벡터 수 반환"""
+    response = await get_client().delete(f"{AI_INDEX_JOBS_URL}/{job_id}")
+    if response.status_code != 200:
+        raise AIServerError(f"AI Error: {response.text}")
+    return response.json().get("removed", 0)
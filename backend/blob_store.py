@@ -0,0 +1,173 @@
+# 업로드 파일(ZIP / 이력서) 내용 주소 저장소 (content-addressed blob store)
+# - 파일은 내용의 sha256 을 이름으로 한 번만 저장: BLOB_STORE_DIR/ab/cd/<sha256>
+#   같은 이력서가 여러 분석 작업에 다시 올라와도 디스크에는 한 벌만 남는다.
+# - 작업별 "표시 이름 -> sha256" 매니페스트(job_files)와 blob 별 참조 수(blobs.ref_count)는 DB 에서 관리 (crud 참고)
+# - 참조 수가 0 이 되고 BLOB_GC_GRACE_SECONDS 가 지난 blob 은 collect_garbage 에서 삭제
+#   (파일만 쓰이고 DB 행이 만들어지지 못한 blob, 남은 임시 파일도 유예 시간이 지나면 함께 삭제)
+# 파일 쓰기는 임시 파일에 해시를 계산하며 복사한 뒤 rename 하므로, 읽는 쪽은 완성된 파일만 본다.
+import asyncio
+import hashlib
+import os
+import re
+import tempfile
+import threading
+import time
+import zipfile
+from typing import Iterator, List, Tuple
+
+import crud
+
+BLOB_STORE_DIR = os.getenv("BLOB_STORE_DIR", os.path.join("storage", "blobs"))
+BLOB_GC_GRACE_SECONDS = int(os.getenv("BLOB_GC_GRACE_SECONDS", "3600"))   # 참조가 끊긴 뒤 삭제까지 유예 시간
+COPY_CHUNK_SIZE = 1024 * 1024
+GC_SWEEP_BATCH = 500   # 디스크 파일 정리 시 DB 행 존재 여부를 한 번에 확인하는 개수
+
+_DIGEST_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+# 매니페스트 항목 종류: 업로드 원본(ZIP) / 이력서 파일
+KIND_ARCHIVE = "archive"
+KIND_RESUME = "resume"
+
+
+def is_digest(value: str) -> bool:
+    return bool(_DIGEST_PATTERN.match(value or ""))
+
+
+class BlobStore:
+    def __init__(self, root: str):
+        self.root = root
+        self._tmp_dir = os.path.join(root, "tmp")
+        os.makedirs(self._tmp_dir, exist_ok=True)
+        # 같은 프로세스 안에서 저장(존재 확인/갱신)과 GC 삭제가 엇갈리지 않도록
+        self._lock = threading.Lock()
+
+    def path(self, digest: str) -> str:
+        if not is_digest(digest):
+            raise ValueError(f"잘못된 blob 해시입니다: {digest}")
+        return os.path.join(self.root, digest[:2], digest[2:4], digest)
+
+    def exists(self, digest: str) -> bool:
+        return is_digest(digest) and os.path.isfile(self.path(digest))
+
+    def put_file(self, source) -> Tuple[str, int]:
+        """파일 객체를 청크 단위로 저장. (sha256, 크기) 반환. 이미 있는 내용이면 새로 쓰지 않음"""
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=self._tmp_dir)
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                while True:
+                    chunk = source.read(COPY_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    digest.update(chunk)
+                    tmp.write(chunk)
+                    size += len(chunk)
+            digest = digest.hexdigest()
+            target = self.path(digest)
+            with self._lock:
+                if os.path.isfile(target):
+                    # 수정 시각 갱신 -> GC 유예 시간 동안 삭제되지 않음
+                    os.utime(target)
+                else:
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                    os.replace(tmp_path, target)
+                    tmp_path = None
+        finally:
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return digest, size
+
+    def iter_digests(self) -> Iterator[str]:
+        """디스크에 저장된 blob 해시 (임시 폴더 제외)"""
+        for directory, subdirs, filenames in os.walk(self.root):
+            if directory == self.root:
+                subdirs[:] = [d for d in subdirs if d != os.path.basename(self._tmp_dir)]
+            for filename in filenames:
+                if is_digest(filename):
+                    yield filename
+
+    def remove_stale_tmp(self, grace_seconds: float) -> int:
+        """저장 도중 프로세스가 죽어 남은 임시 파일 삭제"""
+        removed = 0
+        now = time.time()
+        for entry in os.scandir(self._tmp_dir):
+            try:
+                if entry.is_file() and now - entry.stat().st_mtime >= grace_seconds:
+                    os.remove(entry.path)
+                    removed += 1
+            except FileNotFoundError:
+                continue
+        return removed
+
+    def remove_if_stale(self, digest: str, grace_seconds: float) -> bool:
+        """유예 시간 안에 다시 저장되지 않은 blob 파일 삭제"""
+        target = self.path(digest)
+        with self._lock:
+            try:
+                if time.time() - os.stat(target).st_mtime < grace_seconds:
+                    return False
+                os.remove(target)
+            except FileNotFoundError:
+                return False
+        for directory in (os.path.dirname(target), os.path.dirname(os.path.dirname(target))):
+            try:
+                os.rmdir(directory)   # 비어 있을 때만 삭제됨
+            except OSError:
+                break
+        return True
+
+
+store = BlobStore(BLOB_STORE_DIR)
+
+
+def ingest_upload(source, original_name: str) -> List[dict]:
+    """
+    업로드 파일 1개를 저장소에 넣고 매니페스트 항목 목록 반환 (압축 해제 디렉터리를 만들지 않음).
+    ZIP 이면 원본(archive) + 각 멤버(resume), ZIP 이 아니면 업로드 파일 자체가 이력서.
+    항목: {"name", "sha256", "size", "kind"}
+    """
+    archive_digest, archive_size = store.put_file(source)
+    entries = [{"name": original_name, "sha256": archive_digest, "size": archive_size, "kind": KIND_ARCHIVE}]
+    try:
+        with zipfile.ZipFile(store.path(archive_digest), "r") as zip_ref:
+            for info in zip_ref.infolist():
+                name = info.filename
+                if info.is_dir() or name.startswith("__") or name.startswith("."):
+                    continue
+                with zip_ref.open(info) as member:
+                    digest, size = store.put_file(member)
+                entries.append({"name": name, "sha256": digest, "size": size, "kind": KIND_RESUME})
+    except zipfile.BadZipFile:
+        entries.append({"name": original_name, "sha256": archive_digest, "size": archive_size, "kind": KIND_RESUME})
+    return entries
+
+
+async def collect_garbage(db, grace_seconds: float = BLOB_GC_GRACE_SECONDS) -> int:
+    """참조 수 0 인 blob 행/파일, DB 행이 없는 blob 파일 삭제. 삭제한 파일 수 반환"""
+    removed = 0
+    for digest in await crud.get_unreferenced_blobs(db, older_than_seconds=grace_seconds):
+        # 행 삭제는 참조 수가 여전히 0 일 때만 (그 사이 다시 참조되면 건너뜀)
+        if await crud.delete_unreferenced_blob(db, digest):
+            await db.commit()
+            if store.remove_if_stale(digest, grace_seconds):
+                removed += 1
+    return removed + await _sweep_orphan_files(db, grace_seconds)
+
+
+async def _sweep_orphan_files(db, grace_seconds: float) -> int:
+    """
+    업로드 저장 후 매니페스트 저장 전에 실패한 요청은 blob 파일만 남고 blobs 행이 없다.
+    디스크의 blob 중 행이 없고 수정 시각이 유예 시간보다 오래된 파일 삭제
+    (저장 직후 아직 행을 만들기 전인 파일은 수정 시각이 최근이라 건너뜀)
+    """
+    digests = await asyncio.to_thread(lambda: list(store.iter_digests()))
+    removed = 0
+    for start in range(0, len(digests), GC_SWEEP_BATCH):
+        batch = digests[start:start + GC_SWEEP_BATCH]
+        known = await crud.get_existing_blobs(db, batch)
+        for digest in batch:
+            if digest not in known and await asyncio.to_thread(store.remove_if_stale, digest, grace_seconds):
+                removed += 1
+    await asyncio.to_thread(store.remove_stale_tmp, grace_seconds)
+    return removed
@@ -1,45 +1,323 @@
 # DB에서 데이터를 읽고, 쓰고, 수정하고, 지우는(CRUD) 함수
-from sqlalchemy.orm import Session
+# 모든 함수는 AsyncSession 을 받는 비동기 함수 (database.get_async_db)
+import base64
+import datetime
+import json
+import os
+from sqlalchemy import and_, case, delete, func, insert, literal_column, or_, select, update, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 import schemas, security, dbmodels
 
+# --- 커서(keyset) 페이지네이션 ---
+# 커서는 마지막 행의 정렬 키를 담은 불투명 문자열 (base64 JSON)
+def encode_cursor(values: dict) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+def decode_cursor(cursor: str) -> dict:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except Exception:
+        raise ValueError("잘못된 커서입니다.")
+    if not isinstance(values, dict):
+        raise ValueError("잘못된 커서입니다.")
+    return values
+
 # 이메일로 유저 찾기 (로그인/가입 중복체크용)
-def get_user_by_email(db: Session, email: str):
-    return db.query(dbmodels.User).filter(dbmodels.User.email == email).first()
+async def get_user_by_email(db: AsyncSession, email: str):
+    result = await db.execute(select(dbmodels.User).where(dbmodels.User.email == email))
+    return result.scalars().first()
 
 # 유저네임으로 찾기 (선택 사항)
-def get_user_by_username(db: Session, username: str):
-    return db.query(dbmodels.User).filter(dbmodels.User.username == username).first()
+async def get_user_by_username(db: AsyncSession, username: str):
+    result = await db.execute(select(dbmodels.User).where(dbmodels.User.username == username))
+    return result.scalars().first()
 
 # 유저 생성 (회원가입)
-def create_user(db: Session, user: schemas.UserCreate, hashed_password: str):
+async def create_user(db: AsyncSession, user: schemas.UserCreate, hashed_password: str):
     # 2. DB 모델 생성
     # schemas.UserCreate에 username이 추가되었으므로 user.username 접근 가능!
     db_user = dbmodels.User(
-        email=user.email, 
-        username=user.username, 
+        email=user.email,
+        username=user.username,
         hashed_password=hashed_password
     )
-    
+
     # 3. 저장
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     return db_user
 
 # 분석 작업 생성
-def create_analysis_job(db: Session, owner_id: int, title: str = "", degree: str = "",license: str = "", criteria: str = ""):
+async def create_analysis_job(db: AsyncSession, owner_id: int, title: str = "", degree: str = "",license: str = "", criteria: str = ""):
     db_job = dbmodels.AnalysisJob(owner_id=owner_id, status="PENDING", progress=0,title=title,degree=degree,license=license,criteria=criteria)
     db.add(db_job)
-    db.commit()
-    db.refresh(db_job)
+    await db.commit()
+    await db.refresh(db_job)
+    return db_job
+
+async def get_analysis_job(db: AsyncSession, job_id: int):
+    return await db.get(dbmodels.AnalysisJob, job_id)
+
+# 분석 작업 상태/진행률 갱신 (None인 값은 변경하지 않음)
+async def update_analysis_job(db: AsyncSession, db_job: dbmodels.AnalysisJob, status: str = None, progress: int = None, total_count: int = None):
+    if status is not None:
+        db_job.status = status
+    if progress is not None:
+        db_job.progress = progress
+    if total_count is not None:
+        db_job.total_count = total_count
+    db.add(db_job)
+    await db.commit()
+    await db.refresh(db_job)
     return db_job
 
-def get_analysis_stats(db: Session, job_id: int):
-    # (예시) 통계 데이터 조회 로직 (추후 구현)
-    return {"total": 100, "passed": 20, "avg_score": 85.0}
+# 작업 id 로 바로 상태 갱신 (워커용, 객체 조회 없이 UPDATE 1회)
+async def update_analysis_job_by_id(db: AsyncSession, job_id: int, **values):
+    values = {k: v for k, v in values.items() if v is not None}
+    if values:
+        await db.execute(update(dbmodels.AnalysisJob).where(dbmodels.AnalysisJob.id == job_id).values(**values))
+
+# --- 분석 작업 통계 (SQL 집계 + 작업별 스냅샷) ---
+STATS_PASS_SCORE = float(os.getenv("STATS_PASS_SCORE", "0.5"))   # 합격 기준 점수 (코사인 유사도, lexical_weight 를 준 작업은 혼합 점수)
+STATS_HISTOGRAM_BUCKETS = 10                                      # 0~1 구간을 0.1 단위로
+STATS_PERCENTILES = (25, 50, 75, 90)
+STATS_TOP_LABELS = 20                                             # 학위/자격증 분포 상위 N개
+
+async def compute_analysis_stats(db: AsyncSession, job_id: int) -> dict:
+    """applicants 행을 파이썬으로 읽지 않고 SQL 집계로 통계 계산"""
+    Applicant = dbmodels.Applicant
+    in_job = Applicant.job_id == job_id
+
+    summary = (await db.execute(
+        select(
+            func.count(Applicant.id),
+            func.avg(Applicant.score),
+            func.min(Applicant.score),
+            func.max(Applicant.score),
+            func.sum(case((Applicant.score >= STATS_PASS_SCORE, 1), else_=0)),
+        ).where(in_job)
+    )).one()
+    total = summary[0] or 0
+
+    # 점수 히스토그램: FLOOR(score * 버킷 수) 로 GROUP BY (범위 밖 값은 양 끝 버킷으로)
+    # (SELECT/GROUP BY 식이 같아야 하므로 상수는 바인드 파라미터 대신 리터럴로)
+    bucket = func.floor(Applicant.score * literal_column(str(STATS_HISTOGRAM_BUCKETS)))
+    counts = [0] * STATS_HISTOGRAM_BUCKETS
+    for index, count in (await db.execute(select(bucket, func.count()).where(in_job).group_by(bucket))).all():
+        index = min(max(int(index or 0), 0), STATS_HISTOGRAM_BUCKETS - 1)
+        counts[index] += count
+    histogram = [
+        {"start": i / STATS_HISTOGRAM_BUCKETS, "end": (i + 1) / STATS_HISTOGRAM_BUCKETS, "count": counts[i]}
+        for i in range(STATS_HISTOGRAM_BUCKETS)
+    ]
+
+    # 백분위수 (nearest-rank): 순위는 점수 내림차순으로 매겨지므로 점수 오름차순 = (Rank, id) 내림차순.
+    # (job_id, Rank, id) 인덱스를 역순으로 OFFSET 만큼 건너뛰어 한 행씩만 읽음 (점수로 정렬하지 않음)
+    percentiles = {}
+    if total:
+        for p in STATS_PERCENTILES:
+            offset = max(0, -(-p * total // 100) - 1)
+            percentiles[f"p{p}"] = (await db.execute(
+                select(Applicant.score).where(in_job)
+                .order_by(Applicant.rank.desc(), Applicant.id.desc()).offset(offset).limit(1)
+            )).scalar()
+
+    async def breakdown(column):
+        label = func.coalesce(func.nullif(column, literal_column("''")), literal_column("'N/A'"))
+        rows = (await db.execute(
+            select(label, func.count()).where(in_job)
+            .group_by(label).order_by(func.count().desc()).limit(STATS_TOP_LABELS)
+        )).all()
+        return [{"label": name, "count": count} for name, count in rows]
+
+    return {
+        "job_id": job_id,
+        "total": total,
+        "passed": summary[4] or 0,
+        "avg_score": float(summary[1]) if summary[1] is not None else 0.0,
+        "min_score": summary[2],
+        "max_score": summary[3],
+        "percentiles": percentiles,
+        "histogram": histogram,
+        "degrees": await breakdown(Applicant.education),
+        "certifications": await breakdown(Applicant.certification),
+    }
+
+# COMPLETED 처리와 같은 트랜잭션에서 호출 (커밋은 호출하는 쪽에서)
+async def save_analysis_stats_snapshot(db: AsyncSession, job_id: int) -> dict:
+    stats = await compute_analysis_stats(db, job_id)
+    await db.merge(dbmodels.AnalysisJobStats(job_id=job_id, stats=stats))
+    return stats
+
+# 통계 조회: 완료된 작업은 스냅샷(PK 조회 1회), 스냅샷이 없는 예전 작업은 한 번 집계해서 저장
+async def get_analysis_stats(db: AsyncSession, job_id: int):
+    snapshot = await db.get(dbmodels.AnalysisJobStats, job_id)
+    if snapshot is not None:
+        return snapshot.stats
+
+    db_job = await get_analysis_job(db, job_id)
+    if db_job is None:
+        return None
+    if db_job.status != "COMPLETED":
+        return await compute_analysis_stats(db, job_id)
+
+    stats = await save_analysis_stats_snapshot(db, job_id)
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()   # 동시에 다른 요청이 먼저 저장한 경우 (내용은 같음)
+    return stats
+
+# 지원자 일괄 저장 (executemany, 청크 단위). 커밋은 호출하는 쪽에서 한 번에
+async def bulk_create_applicants(db: AsyncSession, rows: list, chunk_size: int = 1000):
+    for start in range(0, len(rows), chunk_size):
+        await db.execute(insert(dbmodels.Applicant), rows[start:start + chunk_size])
+
+# 작업별 지원자 목록 (커서 페이지네이션). (목록, 다음 커서 또는 None) 반환
+# (job_id, Rank, id) 인덱스로 순위 오름차순. sort="score"(점수 내림차순)도 같은 순서
+async def get_applicants_page(db: AsyncSession, job_id: int, limit: int = 100, cursor: str = None,
+                              sort: str = "rank", min_score: float = None):
+    Applicant = dbmodels.Applicant
+    query = select(Applicant).where(Applicant.job_id == job_id)
+    if min_score is not None:
+        query = query.where(Applicant.score >= min_score)
+
+    # 순위는 점수 내림차순으로 매겨지므로 sort=score 도 (rank, id) 키셋을 사용
+    # (Score 는 MySQL 에서 단정밀도 FLOAT 라 파이썬 float 와의 비교/동점 처리가 정확하지 않음)
+    after = decode_cursor(cursor) if cursor else None
+    if after is not None:
+        query = query.where(or_(
+            Applicant.rank > after["rank"],
+            and_(Applicant.rank == after["rank"], Applicant.id > after["id"]),
+        ))
+    query = query.order_by(Applicant.rank.asc(), Applicant.id.asc())
+
+    result = await db.execute(query.limit(limit + 1))
+    items = list(result.scalars().all())
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        last = items[-1]
+        next_cursor = encode_cursor({"rank": last.rank, "id": last.id})
+    return items, next_cursor
+
+async def get_applicant_detail(db: AsyncSession, applicant_id: int):
+    return await db.get(dbmodels.Applicant, applicant_id)
+
+# 사용자별 분석 작업 히스토리 (최신순, 커서 페이지네이션)
+async def get_analysis_jobs_page(db: AsyncSession, owner_id: int, limit: int = 20, cursor: str = None):
+    AnalysisJob = dbmodels.AnalysisJob
+    query = select(AnalysisJob).where(AnalysisJob.owner_id == owner_id)
+    if cursor:
+        query = query.where(AnalysisJob.id < decode_cursor(cursor)["id"])
+    result = await db.execute(query.order_by(AnalysisJob.id.desc()).limit(limit + 1))
+    items = list(result.scalars().all())
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_cursor({"id": items[-1].id})
+    return items, next_cursor
+
+# 사용자가 만든 분석 작업 id 목록
+async def get_job_ids_by_owner(db: AsyncSession, owner_id: int):
+    result = await db.execute(select(dbmodels.AnalysisJob.id).where(dbmodels.AnalysisJob.owner_id == owner_id))
+    return list(result.scalars().all())
+
+# 끝나지 않은(PENDING/PROCESSING) 분석 작업 id 목록 (서버 재시작 시 정리용)
+async def get_unfinished_job_ids(db: AsyncSession):
+    result = await db.execute(
+        select(dbmodels.AnalysisJob.id).where(dbmodels.AnalysisJob.status.in_(("PENDING", "PROCESSING")))
+    )
+    return list(result.scalars().all())
+
+# (작업 id, 순위) 쌍으로 지원자 조회 (벡터 인덱스 검색 결과 매핑용)
+async def get_applicants_by_job_rank(db: AsyncSession, pairs):
+    if not pairs:
+        return []
+    result = await db.execute(
+        select(dbmodels.Applicant).where(tuple_(dbmodels.Applicant.job_id, dbmodels.Applicant.rank).in_(pairs))
+    )
+    return result.scalars().all()
+
+# --- 업로드 파일 매니페스트 / blob 참조 수 (blob_store) ---
+async def _add_blob_refs(db: AsyncSession, digest: str, size: int, count: int):
+    Blob = dbmodels.Blob
+    increment = update(Blob).where(Blob.sha256 == digest).values(ref_count=Blob.ref_count + count)
+    if (await db.execute(increment)).rowcount:
+        return
+    # 처음 보는 blob: 행 추가 (동시에 다른 요청이 먼저 넣었으면 무시하고 다시 증가)
+    inserted = await db.execute(
+        insert(Blob).values(sha256=digest, size=size, ref_count=count, created_at=datetime.datetime.utcnow())
+        .prefix_with("IGNORE", dialect="mysql").prefix_with("OR IGNORE", dialect="sqlite")
+    )
+    if not inserted.rowcount:
+        await db.execute(increment)
+
+# 작업 매니페스트 저장 + blob 참조 수 증가 (커밋은 호출하는 쪽에서)
+async def add_job_files(db: AsyncSession, job_id: int, entries: list):
+    if not entries:
+        return
+    refs = {}
+    for entry in entries:
+        count, size = refs.get(entry["sha256"], (0, entry["size"]))
+        refs[entry["sha256"]] = (count + 1, size)
+    # 여러 요청이 같은 blob 을 갱신할 때 잠금 순서가 같도록 해시 순으로
+    for digest in sorted(refs):
+        count, size = refs[digest]
+        await _add_blob_refs(db, digest, size, count)
+    await db.execute(insert(dbmodels.JobFile), [{"job_id": job_id, **entry} for entry in entries])
+
+async def get_job_files(db: AsyncSession, job_id: int, kind: str = None):
+    query = select(dbmodels.JobFile).where(dbmodels.JobFile.job_id == job_id)
+    if kind is not None:
+        query = query.where(dbmodels.JobFile.kind == kind)
+    result = await db.execute(query.order_by(dbmodels.JobFile.id))
+    return list(result.scalars().all())
+
+# 작업 매니페스트 항목 삭제 + blob 참조 수 감소 (kind 를 주면 해당 종류만). 커밋은 호출하는 쪽에서
+async def release_job_files(db: AsyncSession, job_id: int, kind: str = None):
+    JobFile, Blob = dbmodels.JobFile, dbmodels.Blob
+    condition = JobFile.job_id == job_id
+    if kind is not None:
+        condition = and_(condition, JobFile.kind == kind)
+    rows = (await db.execute(
+        select(JobFile.sha256, func.count()).where(condition).group_by(JobFile.sha256).order_by(JobFile.sha256)
+    )).all()
+    if not rows:
+        return
+    await db.execute(delete(JobFile).where(condition))
+    now = datetime.datetime.utcnow()
+    for digest, count in rows:
+        await db.execute(update(Blob).where(Blob.sha256 == digest)
+                         .values(ref_count=Blob.ref_count - count, released_at=now))
+
+# 참조가 끊긴 지 older_than_seconds 이상 지난 blob 해시 목록 (GC 대상)
+async def get_unreferenced_blobs(db: AsyncSession, older_than_seconds: float, limit: int = 1000):
+    Blob = dbmodels.Blob
+    cutoff = datetime.datetime.utcnow() - datetime.timedelta(seconds=older_than_seconds)
+    result = await db.execute(
+        select(Blob.sha256).where(Blob.ref_count <= 0, Blob.released_at <= cutoff).limit(limit)
+    )
+    return list(result.scalars().all())
+
+# 주어진 해시 중 blobs 행이 있는 것 (디스크 파일 정리용)
+async def get_existing_blobs(db: AsyncSession, digests: list) -> set:
+    if not digests:
+        return set()
+    result = await db.execute(select(dbmodels.Blob.sha256).where(dbmodels.Blob.sha256.in_(digests)))
+    return set(result.scalars().all())
 
-def get_applicants(db: Session, job_id: int, skip: int = 0, limit: int = 100):
-    return db.query(dbmodels.Applicant).filter(dbmodels.Applicant.job_id == job_id).offset(skip).limit(limit).all()
+# 참조 수가 여전히 0 이하일 때만 blob 행 삭제. 삭제했으면 True
+async def delete_unreferenced_blob(db: AsyncSession, digest: str) -> bool:
+    Blob = dbmodels.Blob
+    result = await db.execute(delete(Blob).where(Blob.sha256 == digest, Blob.ref_count <= 0))
+    return bool(result.rowcount)
 
-def get_applicant_detail(db: Session, applicant_id: int):
-    return db.query(dbmodels.Applicant).filter(dbmodels.Applicant.id == applicant_id).first()
\ No newline at end of file
+# 분석 작업 삭제: 지원자 / 통계 스냅샷 / 파일 매니페스트(blob 참조 해제) / 작업 행. 커밋은 호출하는 쪽에서
+async def delete_analysis_job(db: AsyncSession, job_id: int):
+    await db.execute(delete(dbmodels.Applicant).where(dbmodels.Applicant.job_id == job_id))
+    await db.execute(delete(dbmodels.AnalysisJobStats).where(dbmodels.AnalysisJobStats.job_id == job_id))
+    await release_job_files(db, job_id)
+    await db.execute(delete(dbmodels.AnalysisJob).where(dbmodels.AnalysisJob.id == job_id))
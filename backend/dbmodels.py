@@ -1,5 +1,5 @@
 # DB 테이블 모델을 정의
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, Text, DateTime
+from sqlalchemy import BigInteger, Column, Integer, String, Float, ForeignKey, Text, DateTime, Index, JSON
 from sqlalchemy.orm import relationship
 from database import Base
 import datetime
@@ -36,6 +36,11 @@ class AnalysisJob(Base):
     owner = relationship("User", back_populates="analysis_jobs")
     applicants = relationship("Applicant", back_populates="job")
 
+    # 사용자별 히스토리 커서 페이지네이션 (owner_id, id 내림차순)
+    __table_args__ = (
+        Index("ix_analysis_jobs_owner_id_id", "owner_id", "id"),
+    )
+
 class Applicant(Base):
     """지원자 테이블 (분석 결과)"""
     __tablename__ = "applicants"
@@ -57,4 +62,46 @@ class Applicant(Base):
     # resume_original_path = Column(String(1024)) # 원본 파일 저장 경로 
     pdf_url = Column(String(500), nullable=True)
 
-    job = relationship("AnalysisJob", back_populates="applicants")
\ No newline at end of file
+    job = relationship("AnalysisJob", back_populates="applicants")
+
+    # 작업별 지원자 커서 페이지네이션: (순위, id) 순 (DB 컬럼명 기준). 점수 순 정렬도 순위 순과 같음
+    __table_args__ = (
+        Index("ix_applicants_job_id_rank", "job_id", "Rank", "id"),
+    )
+
+class AnalysisJobStats(Base):
+    """분석 작업 통계 스냅샷 (COMPLETED 이후 지원자 데이터는 바뀌지 않으므로 한 번만 집계)"""
+    __tablename__ = "analysis_job_stats"
+
+    job_id = Column(Integer, ForeignKey("analysis_jobs.id"), primary_key=True)
+    stats = Column(JSON, nullable=False)
+    created_at = Column(DateTime, default=datetime.datetime.utcnow)
+
+class Blob(Base):
+    """업로드 파일 내용 저장소의 blob (파일은 blob_store 에 sha256 이름으로 한 벌만 저장)"""
+    __tablename__ = "blobs"
+
+    sha256 = Column(String(64), primary_key=True)
+    size = Column(BigInteger, nullable=False)
+    ref_count = Column(Integer, nullable=False, default=0)   # 이 blob 을 가리키는 job_files 행 수
+    created_at = Column(DateTime, default=datetime.datetime.utcnow)
+    released_at = Column(DateTime, nullable=True)             # 마지막으로 참조가 줄어든 시각 (GC 유예 기준)
+
+    __table_args__ = (
+        Index("ix_blobs_ref_count_released_at", "ref_count", "released_at"),
+    )
+
+class JobFile(Base):
+    """분석 작업별 업로드 파일 매니페스트 (표시 이름 -> blob)"""
+    __tablename__ = "job_files"
+
+    id = Column(Integer, primary_key=True)
+    job_id = Column(Integer, ForeignKey("analysis_jobs.id"), nullable=False)
+    name = Column(String(500), nullable=False)     # ZIP 안의 경로 또는 업로드 파일명
+    sha256 = Column(String(64), ForeignKey("blobs.sha256"), nullable=False)
+    size = Column(BigInteger, nullable=False)
+    kind = Column(String(20), nullable=False)      # archive(업로드 ZIP) / resume(이력서)
+
+    __table_args__ = (
+        Index("ix_job_files_job_id_kind", "job_id", "kind"),
+    )
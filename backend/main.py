@@ -3,16 +3,26 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 import os
-from routers import auth, analysis
+from routers import auth, analysis, files
 import dbmodels
+import worker
+import ai_client
+import security
 from database import engine
 
 
 # DB에 테이블 생성
 dbmodels.Base.metadata.create_all(bind=engine)
+# create_all 은 이미 있는 테이블에 인덱스를 추가하지 않으므로, 기존 테이블에 새로 정의한 인덱스는 따로 생성
+# (MySQL DDL: CREATE INDEX ix_analysis_jobs_owner_id_id ON analysis_jobs (owner_id, id);
+#             CREATE INDEX ix_applicants_job_id_rank ON applicants (job_id, `Rank`, id);)
+for _table in (dbmodels.AnalysisJob.__table__, dbmodels.Applicant.__table__):
+    for _index in _table.indexes:
+        _index.create(bind=engine, checkfirst=True)
 
 app = FastAPI()
 
+# 예전 작업의 pdf_url(static/resumes/{job_id}/...) 용. 새 업로드는 /files (blob 저장소)로 제공
 os.makedirs("static", exist_ok=True)
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
@@ -32,11 +42,27 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # 목록 API의 다음 페이지 커서 헤더, PDF 뷰어의 부분 요청(Range) 응답 헤더를 브라우저에서 읽을 수 있도록 노출
+    expose_headers=["X-Next-Cursor", "Content-Range", "Accept-Ranges", "ETag", "Content-Length"],
 )
 
+# --- 분석 워커 시작/종료 ---
+@app.on_event("startup")
+async def start_analysis_workers():
+    # 큐는 메모리에만 있으므로 재시작 전에 남은 작업은 먼저 정리
+    await worker.recover_interrupted_jobs()
+    worker.start_workers()
+
+@app.on_event("shutdown")
+async def stop_analysis_workers():
+    await worker.stop_workers()
+    await ai_client.close_client()
+    security.shutdown_hash_executor()
+
 # --- 3. 라우터 등록 ---
 app.include_router(auth.router, prefix="/auth", tags=["auth"])
 app.include_router(analysis.router, prefix="/api/analysis")
+app.include_router(files.router, prefix="/files")
 
 
 @app.get("/")
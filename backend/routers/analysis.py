@@ -1,26 +1,34 @@
 # backend/routers/analysis.py
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Request
-from sqlalchemy.orm import Session
-from typing import List
-import httpx 
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Request, Query, Response
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+import os
 import traceback
 # auth.py에서 get_current_user 함수 가져오기
 from routers.auth import get_current_user 
 import crud, schemas, dbmodels, database
-from database import get_db
-import zipfile
-import os
-import shutil
-
-# --- AI 서버 설정 ---
-AI_SERVER_URL = "http://34.168.7.102:5000/api/v1/screen"
-# ------------------
+from database import get_async_db
+import worker
+import ai_client
+import blob_store
 
 router = APIRouter(
     tags=["analysis"]
 )
 
+# 목록 API는 본문은 배열 그대로, 다음 페이지 커서는 응답 헤더로 전달
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+# 지원자 검색 시 AI 서버에 요청하는 후보 수 배율 (DB 에 없는 후보를 건너뛰고도 top_k 를 채우기 위함)
+SEARCH_OVERFETCH = int(os.getenv("SEARCH_OVERFETCH", "2"))
+
+
+def _set_next_cursor(response: Response, next_cursor: Optional[str]):
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+
 @router.post("/", response_model=schemas.AnalysisJob)
 async def create_analysis(
     files: List[UploadFile] = File(...),
@@ -28,11 +36,17 @@ async def create_analysis(
     job: str = Form(""),
     degree: str = Form(""),
     license: str = Form(""),
-    db: Session = Depends(get_db),
+    # 선택 입력: 필수 조건 (명시한 경우에만 AI 서버에서 인코딩 전 사전 필터로 사용, 미달 지원자는 저장되지 않음)
+    required_degree: str = Form(""),
+    required_certifications: str = Form(""),
+    required_skills: str = Form(""),
+    # 선택 입력: 키워드 일치율 가중치 (주면 Score = (1 - w) * 코사인 유사도 + w * 키워드 일치율)
+    lexical_weight: Optional[float] = Form(None, ge=0, le=1, allow_inf_nan=False),
+    db: AsyncSession = Depends(get_async_db),
     current_user: schemas.User = Depends(get_current_user)
 ):
     # 1) DB 저장
-    db_job = crud.create_analysis_job(
+    db_job = await crud.create_analysis_job(
         db, 
         owner_id=current_user.id,
         title=job,
@@ -41,30 +55,26 @@ async def create_analysis(
         criteria=criteria
     )
 
-    # 2) 파일 저장 & 압축 풀기
-    upload_dir = f"static/resumes/{db_job.id}"
-    os.makedirs(upload_dir, exist_ok=True)
-
-    ai_files = []
-    saved_filenames = []
-
-    for f in files:
-        file_content = await f.read()
-        ai_files.append(('file', (f.filename, file_content, f.content_type)))
+    # 2) 파일 저장: 내용 해시(blob) 저장소에 한 벌만 저장하고 작업 매니페스트에 기록
+    #    (청크 단위 복사라 요청당 메모리 사용량 일정, 이벤트 루프 블로킹 방지. 이미 있는 이력서는 다시 쓰지 않음)
+    #    실패하면 작업을 FAILED 로 두고 (매니페스트/참조 수는 롤백), 이미 쓴 blob 파일은 GC 가 유예 시간 뒤 정리
+    upload_files = []
+    manifest = []
 
-        zip_path = os.path.join(upload_dir, f.filename)
-        with open(zip_path, "wb") as buffer:
-            buffer.write(file_content)
-
-        try:
-            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                zip_ref.extractall(upload_dir)
-                saved_filenames = [
-                    name for name in zip_ref.namelist()
-                    if not name.startswith('__') and not name.startswith('.')
-                ]
-        except:
-            saved_filenames.append(f.filename)
+    try:
+        for f in files:
+            entries = await run_in_threadpool(blob_store.ingest_upload, f.file, f.filename)
+            archive = entries[0]
+            upload_files.append((blob_store.store.path(archive["sha256"]), f.filename, f.content_type))
+            manifest.extend(entries)
+        await crud.add_job_files(db, db_job.id, manifest)
+        await db.commit()
+    except Exception as e:
+        traceback.print_exc()
+        await db.rollback()
+        await crud.update_analysis_job(db, db_job, status="FAILED")
+        raise HTTPException(status_code=500, detail=f"업로드 파일 저장 실패: {e}")
+    resume_files = {e["name"]: e["sha256"] for e in manifest if e["kind"] == blob_store.KIND_RESUME}
 
     # 3) 프롬프트 생성
     combined_prompt = f"""
@@ -74,89 +84,164 @@ IMPORTANT REQUIREMENTS:
 - Certification: {license}
 - Criteria: {criteria}
 """
+    # 필수 조건은 명시적으로 입력한 값만 사전 필터로 사용.
+    # 학위/자격증 선택값과 채용 기준의 키워드는 우대 용어로만 쓰이고, lexical_weight 를 줄 때만 점수에 반영
+    requirements = {
+        "required_degree": required_degree,
+        "required_certifications": required_certifications,
+        "required_skills": required_skills,
+        "preferred_terms": "\n".join(term for term in (degree, license, criteria) if term),
+        "lexical_weight": lexical_weight,
+    }
+
+    # 4) 백그라운드 워커에 작업 등록 후 즉시 반환 (PENDING)
+    #    진행 상황은 GET /api/analysis/{job_id} 로 폴링
+    try:
+        worker.enqueue(worker.AnalysisTask(
+            job_id=db_job.id,
+            upload_files=upload_files,
+            resume_files=resume_files,
+            prompt=combined_prompt,
+            requirements=requirements,
+        ))
+    except Exception as e:
+        traceback.print_exc()
+        # 한 번도 실행되지 않은 작업이므로 이력서 파일까지 모든 참조를 해제
+        await crud.release_job_files(db, db_job.id)
+        await crud.update_analysis_job(db, db_job, status="FAILED")
+        raise HTTPException(status_code=503, detail=f"분석 작업 등록 실패: {e}")
+
+    return db_job
 
-    data = {"job_description": combined_prompt}
 
-    # 4) AI 서버 요청
+# 내 분석 작업 히스토리 (최신순). /{job_id} 보다 먼저 선언해야 경로가 겹치지 않음
+@router.get("/history/all", response_model=List[schemas.AnalysisJob])
+async def read_analysis_history(
+    response: Response,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: schemas.User = Depends(get_current_user)
+):
     try:
-        async with httpx.AsyncClient(timeout=300.0) as client:
-            response = await client.post(AI_SERVER_URL, files=ai_files, data=data)
-
-            if response.status_code != 200:
-                raise HTTPException(status_code=500, detail=f"AI Error: {response.text}")
-
-            ai_json = response.json()
-            print("AI JSON 원본:", ai_json)
-
-            # AI가 list 또는 dict(data/results)로 줄 수 있음 → 그대로 추출
-            if isinstance(ai_json, list):
-                ai_results = ai_json
-            elif isinstance(ai_json, dict):
-                ai_results = (
-                    ai_json.get("data")
-                    or ai_json.get("results")
-                    or []
-                )
-            else:
-                ai_results = []
-
-            
-            final_results = ai_results
-
-            total_applicants_count = len(final_results)
-
-            # 5) DB 저장 (AI JSON 그대로 사용!)
-            for index, item in enumerate(final_results, 1):
-                if not isinstance(item, dict):
-                    continue
-
-                # key 이름: AI가 주는 그대로 사용
-                name = item.get("Name") or item.get("name") or "Unknown"
-                job_role = item.get("Job Role") or item.get("Job Roles") or item.get("job_role")
-                degree_val = item.get("Degree") or item.get("degree")
-                certification_val = item.get("Certification") or item.get("certification")
-                score_val = item.get("Score") or item.get("score") or 0
-                keywords_val = item.get("Keywords") or item.get("keywords") or ""
-                resume_val = item.get("Resume") or item.get("resume") or ""
-
-                # 너무 길면 요약 (DB 오류 방지)
-                safe_resume = resume_val[:5000]
-
-                # 파일 매칭
-                matched_filename = f"{name}.pdf"
-                for local_file in saved_filenames:
-                    if name.lower().replace(" ", "") in local_file.lower().replace(" ", ""):
-                        matched_filename = local_file
-                        break
-
-                pdf_link = f"http://136.117.27.55:8000/{upload_dir}/{matched_filename}"
-
-                db_applicant = dbmodels.Applicant(
-                    job_id=db_job.id,
-                    rank=index,
-                    name=name,
-                    score=score_val,          
-                    job_role=job_role,
-                    education=degree_val,
-                    certification=certification_val,
-                    resume_summary=safe_resume,
-                    pdf_url=pdf_link,
-                    keywords=keywords_val     
-                )
-
-                db.add(db_applicant)
-
-            db_job.status = "COMPLETED"
-            db_job.progress = 100
-            db_job.total_count = total_applicants_count
-            db.add(db_job)
-            db.commit()
-            db.refresh(db_job)
-            return db_job
+        jobs, next_cursor = await crud.get_analysis_jobs_page(db, current_user.id, limit=limit, cursor=cursor)
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="잘못된 커서입니다.")
+    _set_next_cursor(response, next_cursor)
+    return jobs
+
 
+@router.get("/applicants/{applicant_id}", response_model=schemas.ApplicantResponse)
+async def read_applicant(
+    applicant_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: schemas.User = Depends(get_current_user)
+):
+    applicant = await crud.get_applicant_detail(db, applicant_id)
+    if applicant is None:
+        raise HTTPException(status_code=404, detail="Applicant not found")
+    db_job = await crud.get_analysis_job(db, applicant.job_id)
+    if db_job is None or db_job.owner_id != current_user.id:
+        raise HTTPException(status_code=404, detail="Applicant not found")
+    return applicant
+
+
+# 작업별 지원자 목록 (커서 페이지네이션, sort=rank|score)
+@router.get("/{job_id}/applicants", response_model=List[schemas.ApplicantResponse])
+async def read_job_applicants(
+    job_id: int,
+    response: Response,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    sort: str = Query("rank", pattern="^(rank|score)$"),
+    min_score: Optional[float] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: schemas.User = Depends(get_current_user)
+):
+    db_job = await crud.get_analysis_job(db, job_id)
+    if db_job is None or db_job.owner_id != current_user.id:
+        raise HTTPException(status_code=404, detail="Analysis job not found")
+    try:
+        applicants, next_cursor = await crud.get_applicants_page(
+            db, job_id, limit=limit, cursor=cursor, sort=sort, min_score=min_score
+        )
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="잘못된 커서입니다.")
+    _set_next_cursor(response, next_cursor)
+    return applicants
+
+
+# 작업별 통계 (완료된 작업은 저장된 스냅샷을 그대로 반환)
+@router.get("/{job_id}/stats", response_model=schemas.AnalysisStats)
+async def read_analysis_stats(
+    job_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: schemas.User = Depends(get_current_user)
+):
+    db_job = await crud.get_analysis_job(db, job_id)
+    if db_job is None or db_job.owner_id != current_user.id:
+        raise HTTPException(status_code=404, detail="Analysis job not found")
+    return await crud.get_analysis_stats(db, job_id)
+
+
+@router.get("/{job_id}", response_model=schemas.AnalysisJob)
+async def read_analysis_job(
+    job_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: schemas.User = Depends(get_current_user)
+):
+    db_job = await crud.get_analysis_job(db, job_id)
+    if db_job is None or db_job.owner_id != current_user.id:
+        raise HTTPException(status_code=404, detail="Analysis job not found")
+    return db_job
+
+
+# 분석 작업 삭제 (지원자/통계/파일 매니페스트). 업로드 파일은 다른 작업이 참조하지 않으면 GC 에서 삭제
+@router.delete("/{job_id}", status_code=204)
+async def delete_analysis_job(
+    job_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: schemas.User = Depends(get_current_user)
+):
+    db_job = await crud.get_analysis_job(db, job_id)
+    if db_job is None or db_job.owner_id != current_user.id:
+        raise HTTPException(status_code=404, detail="Analysis job not found")
+    if db_job.status in ("PENDING", "PROCESSING"):
+        raise HTTPException(status_code=409, detail="진행 중인 분석 작업은 삭제할 수 없습니다.")
+    await crud.delete_analysis_job(db, job_id)
+    await db.commit()
+    # AI 서버 벡터 인덱스에서도 제외 (실패해도 삭제는 유지, 검색은 DB 에 없는 지원자를 건너뜀)
+    try:
+        await ai_client.delete_job_vectors(job_id)
+    except Exception:
+        traceback.print_exc()
+    return Response(status_code=204)
+
+
+# 과거 분석 작업 전체에서 새 인재상과 비슷한 지원자 검색 (재업로드/재인코딩 없음)
+@router.post("/search", response_model=List[schemas.CandidateSearchResult])
+async def search_candidates(
+    search_request: schemas.CandidateSearchRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: schemas.User = Depends(get_current_user)
+):
+    job_ids = await crud.get_job_ids_by_owner(db, current_user.id)
+    if not job_ids:
+        return []
+
+    # 인덱스에만 남은 지원자(저장에 실패한 작업 등)는 결과에서 빠지므로 여유 있게 받아 top_k 개를 채움
+    try:
+        hits = await ai_client.search(search_request.query, search_request.top_k * SEARCH_OVERFETCH, job_ids=job_ids)
     except Exception as e:
         traceback.print_exc()
-        db_job.status = "FAILED"
-        db.add(db_job)
-        db.commit()
-        raise HTTPException(status_code=500, detail=str(e))
+        raise HTTPException(status_code=502, detail=str(e))
+
+    applicants = await crud.get_applicants_by_job_rank(db, [(h["job_id"], h["rank"]) for h in hits])
+    by_key = {(a.job_id, a.rank): a for a in applicants}
+
+    results = []
+    for hit in hits:
+        applicant = by_key.get((hit["job_id"], hit["rank"]))
+        if applicant is not None:
+            results.append({"job_id": hit["job_id"], "similarity": hit["score"], "applicant": applicant})
+    return results[:search_request.top_k]
@@ -1,11 +1,11 @@
 # /api/auth 경로 담당. 인증API
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from jose import JWTError, jwt
 from datetime import timedelta
 import crud, schemas, dbmodels
-from database import get_db
+from database import get_async_db
 import security
 
 router = APIRouter(
@@ -15,7 +15,19 @@ router = APIRouter(
 # 토큰을 추출할 경로 (로그인 URL)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+def _hash_busy_exception(e: security.HashBusy) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=str(e),
+        headers={"Retry-After": str(security.AUTH_HASH_RETRY_AFTER)},
+    )
+
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)):
+    # 최근에 확인한 토큰이면 JWT 디코드/DB 조회 없이 바로 반환 (security.token_user_cache)
+    cached = security.token_user_cache.get(token)
+    if cached is not None:
+        return cached
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -32,25 +44,35 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
         raise credentials_exception
     
     # DB에서 유저 찾기
-    user = crud.get_user_by_email(db, email=token_data.username)
+    user = await crud.get_user_by_email(db, email=token_data.username)
     if user is None:
         raise credentials_exception
-    return user
+    # 세션에 묶인 ORM 객체 대신 읽기 전용 스키마로 캐시 (다른 요청의 세션과 공유하지 않음)
+    current_user = schemas.User.model_validate(user)
+    security.token_user_cache.put(token, user.email, current_user, payload.get("exp"))
+    return current_user
 
 @router.post("/register", response_model=schemas.User)
-def create_user(user: schemas.UserCreate, db: Session = Depends(get_db)):
-    db_user = crud.get_user_by_email(db, email=user.email)
+async def create_user(user: schemas.UserCreate, db: AsyncSession = Depends(get_async_db)):
+    db_user = await crud.get_user_by_email(db, email=user.email)
     if db_user:
         raise HTTPException(status_code=400, detail="Email already registered")
-    hashed_password = security.get_password_hash(user.password)
-    return crud.create_user(db=db, user=user, hashed_password=hashed_password)
+    # bcrypt 는 일부러 느린 연산이므로 이벤트 루프 밖(전용 스레드 풀)에서 실행
+    try:
+        hashed_password = await security.get_password_hash_async(user.password)
+    except security.HashBusy as e:
+        raise _hash_busy_exception(e)
+    db_user = await crud.create_user(db=db, user=user, hashed_password=hashed_password)
+    # 같은 이메일로 예전에 발급된 토큰이 캐시에 남아 있으면 이전 사용자로 인증되지 않도록 제거
+    security.token_user_cache.invalidate_user(db_user.email)
+    return db_user
 
 
 @router.post("/login", response_model=schemas.Token)
-def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), 
-    db: Session = Depends(get_db)):
+async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), 
+    db: AsyncSession = Depends(get_async_db)):
     # 1. form_data.username이 실제로는 email임 (OAuth2 스펙)
-    user = crud.get_user_by_email(db, email=form_data.username)
+    user = await crud.get_user_by_email(db, email=form_data.username)
     
     if not user:
         raise HTTPException(
@@ -60,7 +82,11 @@ def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(),
         )
     
     # 비밀번호 검증
-    if not security.verify_password(form_data.password, user.hashed_password):
+    try:
+        password_ok = await security.verify_password_async(form_data.password, user.hashed_password)
+    except security.HashBusy as e:
+        raise _hash_busy_exception(e)
+    if not password_ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect password",
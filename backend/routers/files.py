@@ -0,0 +1,44 @@
+# /files 경로 담당. 업로드 이력서(blob) 제공 (PDF 뷰어용)
+# URL 의 해시가 곧 내용이므로 ETag 는 sha256 (강한 ETag), 브라우저/프록시 캐시는 영구(immutable).
+# Range 요청(부분 전송, 206)과 If-Range 는 FileResponse 가 처리한다.
+import mimetypes
+import os
+
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import FileResponse
+
+import blob_store
+
+router = APIRouter(
+    tags=["files"]
+)
+
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # 약한 비교 (W/ 접두사 무시)
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+@router.api_route("/{digest}/{filename:path}", methods=["GET", "HEAD"])
+async def read_blob(digest: str, filename: str, request: Request):
+    if not blob_store.is_digest(digest) or not blob_store.store.exists(digest):
+        raise HTTPException(status_code=404, detail="File not found")
+
+    etag = f'"{digest}"'
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    name = os.path.basename(filename) or digest
+    return FileResponse(
+        blob_store.store.path(digest),
+        headers=headers,
+        media_type=mimetypes.guess_type(name)[0] or "application/octet-stream",
+        filename=name,
+        content_disposition_type="inline",   # 새 탭/iframe 에서 바로 열리도록
+    )
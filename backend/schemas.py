@@ -1,6 +1,7 @@
 # Pydantic을 사용해 API가 받을 요청(Request)과 보낼 응답(Response)의 형식을 검증
 from pydantic import BaseModel, Field, ConfigDict
-from typing import List, Optional
+from typing import Dict, List, Optional
+from datetime import datetime
 
 # --- Token 관련 스키마 ---
 class Token(BaseModel):
@@ -29,7 +30,7 @@ class UserCreate(BaseModel):
 class User(BaseModel):
     id: int
     email: str
-    username: str
+    username: Optional[str] = None  # DB 컬럼이 NULL 허용 (예전 가입자는 username 이 없을 수 있음)
     is_active: bool = True
     model_config = ConfigDict(from_attributes=True)
 
@@ -52,16 +53,51 @@ class ApplicantResponse(BaseModel):
 
     model_config = ConfigDict(from_attributes=True, populate_by_name=True)
 
+# --- 과거 지원자 통합 검색 (벡터 인덱스) ---
+class CandidateSearchRequest(BaseModel):
+    query: str
+    top_k: int = Field(20, ge=1, le=500)
+
+class CandidateSearchResult(BaseModel):
+    job_id: int
+    similarity: float
+    applicant: ApplicantResponse
+
 class AnalysisJob(BaseModel):
     id: int
     status: str
     progress: int
     total_count: Optional[int] = 0
+    title: Optional[str] = None
+    created_at: Optional[datetime] = None
     # applicants: List[ApplicantResponse] = [] # 리스트 포함 시
 
     model_config = ConfigDict(from_attributes=True)
 
 
+# --- 분석 작업 통계 (대시보드 차트용) ---
+class ScoreBucket(BaseModel):
+    start: float
+    end: float
+    count: int
+
+class LabelCount(BaseModel):
+    label: str
+    count: int
+
+class AnalysisStats(BaseModel):
+    job_id: int
+    total: int
+    passed: int
+    avg_score: float
+    min_score: Optional[float] = None
+    max_score: Optional[float] = None
+    percentiles: Dict[str, float] = {}
+    histogram: List[ScoreBucket] = []
+    degrees: List[LabelCount] = []
+    certifications: List[LabelCount] = []
+
+
 class Applicant(BaseModel):
     id: int
     rank: Optional[int] = None
@@ -1,8 +1,17 @@
 # 인증/보안 로직
+import asyncio
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from passlib.context import CryptContext
 from jose import JWTError, jwt
 from datetime import datetime, timedelta
 from typing import Optional
+from sqlalchemy import event, inspect
+
+import dbmodels
 
 
 # --- .env 파일에서 읽어와야 함 ---
@@ -19,6 +28,38 @@ def verify_password(plain_password, hashed_password):
 def get_password_hash(password):
     return pwd_context.hash(password)
 
+# --- bcrypt 전용 스레드 풀 ---
+# bcrypt 는 일부러 느린 연산이라, 공용 스레드 풀에서 돌리면 로그인이 몰릴 때 다른 요청의 스레드 작업까지 밀린다.
+# 전용 풀(AUTH_HASH_WORKERS 개)에서만 실행하고, 대기 중인 해시가 AUTH_HASH_MAX_PENDING 을 넘으면 바로 거절(503).
+AUTH_HASH_WORKERS = int(os.getenv("AUTH_HASH_WORKERS", "2"))          # 동시에 실행하는 해시 수
+AUTH_HASH_MAX_PENDING = int(os.getenv("AUTH_HASH_MAX_PENDING", "32"))  # 실행 중 + 대기 중 해시 상한 (0 이면 무제한)
+AUTH_HASH_RETRY_AFTER = int(os.getenv("AUTH_HASH_RETRY_AFTER", "2"))
+
+_hash_executor = ThreadPoolExecutor(max_workers=max(1, AUTH_HASH_WORKERS), thread_name_prefix="bcrypt")
+_hash_pending = 0   # 이벤트 루프 스레드에서만 변경
+
+class HashBusy(Exception):
+    """비밀번호 해시 대기열이 가득 참 (503 + Retry-After)"""
+
+async def _run_hash(fn, *args):
+    global _hash_pending
+    if AUTH_HASH_MAX_PENDING > 0 and _hash_pending >= AUTH_HASH_MAX_PENDING:
+        raise HashBusy("로그인 요청이 많아 잠시 후 다시 시도해 주세요.")
+    _hash_pending += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_hash_executor, fn, *args)
+    finally:
+        _hash_pending -= 1
+
+async def verify_password_async(plain_password, hashed_password) -> bool:
+    return await _run_hash(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password) -> str:
+    return await _run_hash(get_password_hash, password)
+
+def shutdown_hash_executor():
+    _hash_executor.shutdown(wait=False)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -27,4 +68,86 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
         expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
\ No newline at end of file
+    return encoded_jwt
+
+# --- 토큰 -> 사용자 캐시 ---
+# 인증이 필요한 요청(프론트엔드의 진행률 폴링 포함)마다 JWT 디코드 + 사용자 조회를 하지 않도록
+# 토큰 문자열 -> 사용자 정보(schemas.User)를 짧은 시간 동안 프로세스 메모리에 보관한다.
+# - 항목 유효 시간: min(AUTH_CACHE_TTL, 토큰 만료까지 남은 시간)
+# - 최대 AUTH_CACHE_MAX_ITEMS 개, 넘으면 가장 오래 사용하지 않은 항목부터 삭제
+# - 사용자 행이 ORM 으로 수정/삭제되면 자동으로 invalidate_user(email) (아래 이벤트 리스너),
+#   토큰을 폐기하면 invalidate_token(token) 호출
+#   (벌크 UPDATE/DELETE 문이나 다른 워커 프로세스의 변경은 TTL 이 지나야 반영되므로 TTL 은 짧게 유지)
+AUTH_CACHE_TTL = float(os.getenv("AUTH_CACHE_TTL", "30"))              # 초 (0 이면 캐시 안 함)
+AUTH_CACHE_MAX_ITEMS = int(os.getenv("AUTH_CACHE_MAX_ITEMS", "10000"))
+
+class TokenUserCache:
+    def __init__(self, ttl: float = AUTH_CACHE_TTL, max_items: int = AUTH_CACHE_MAX_ITEMS):
+        self.ttl = ttl
+        self.max_items = max_items
+        self._items = OrderedDict()   # token -> (만료 시각, email, user)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_items > 0
+
+    def get(self, token: str):
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._items.get(token)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._items[token]
+                self.misses += 1
+                return None
+            self._items.move_to_end(token)
+            self.hits += 1
+            return entry[2]
+
+    def put(self, token: str, email: str, user, token_expires_at: Optional[float] = None):
+        """token_expires_at: 토큰의 exp (유닉스 시각). 캐시 항목이 토큰보다 오래 살지 않도록 함"""
+        if not self.enabled:
+            return
+        ttl = self.ttl
+        if token_expires_at is not None:
+            ttl = min(ttl, token_expires_at - time.time())
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._items[token] = (time.monotonic() + ttl, email, user)
+            self._items.move_to_end(token)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+
+    def invalidate_token(self, token: str):
+        with self._lock:
+            self._items.pop(token, None)
+
+    def invalidate_user(self, email: str):
+        with self._lock:
+            for token in [t for t, entry in self._items.items() if entry[1] == email]:
+                del self._items[token]
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"items": len(self._items), "hits": self.hits, "misses": self.misses}
+
+token_user_cache = TokenUserCache()
+
+
+@event.listens_for(dbmodels.User, "after_update")
+@event.listens_for(dbmodels.User, "after_delete")
+def _invalidate_cached_user(mapper, connection, target):
+    # 이메일이 바뀐 경우 이전 이메일로 캐시된 항목도 제거
+    history = inspect(target).attrs.email.history
+    for email in {target.email, *(history.deleted or ())}:
+        if email:
+            token_user_cache.invalidate_user(email)
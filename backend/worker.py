@@ -0,0 +1,303 @@
+# 분석 작업 백그라운드 워커
+# 업로드 요청은 Job을 PENDING 상태로 저장한 뒤 바로 반환하고,
+# 실제 AI 서버 호출 및 지원자 저장은 여기 워커 풀에서 처리한다.
+# 상태 흐름: PENDING -> PROCESSING -> COMPLETED / FAILED
+import asyncio
+import os
+import traceback
+from typing import List, Optional
+
+import ai_client
+import blob_store
+import crud
+from database import AsyncSessionLocal
+
+# --- 워커 설정 ---
+WORKER_COUNT = int(os.getenv("ANALYSIS_WORKERS", "2"))
+QUEUE_MAXSIZE = int(os.getenv("ANALYSIS_QUEUE_SIZE", "100"))
+PDF_BASE_URL = os.getenv("PDF_BASE_URL", "http://136.117.27.55:8000")
+BLOB_GC_INTERVAL = int(os.getenv("BLOB_GC_INTERVAL", "600"))   # 참조 없는 업로드 파일 정리 주기(초), 0 이면 끔
+# ------------------
+
+# 진행률 구간 (프론트엔드 폴링용)
+PROGRESS_STARTED = 5
+PROGRESS_AI_DONE = 80
+
+_queue: Optional[asyncio.Queue] = None
+_workers: List[asyncio.Task] = []
+
+
+class AnalysisTask:
+    """워커에 전달되는 작업 단위 (업로드 파일은 이미 blob 저장소에 저장된 상태)"""
+
+    def __init__(self, job_id: int, upload_files: list, resume_files: dict, prompt: str,
+                 requirements: dict = None):
+        self.job_id = job_id
+        # (blob 경로, 원본 파일명, content_type) 목록
+        self.upload_files = upload_files
+        # 이력서 표시 이름(ZIP 안 경로) -> blob sha256 (작업 매니페스트)
+        self.resume_files = resume_files
+        self.prompt = prompt
+        # AI 서버 사전 필터 조건 (ai_client._screen_form 참고)
+        self.requirements = requirements or {}
+
+
+# --------------------------------------------------------------------------
+# 워커 풀 관리
+
+def start_workers(count: int = WORKER_COUNT):
+    """앱 시작 시 워커 태스크를 띄운다 (main.py startup 이벤트)"""
+    global _queue
+    if _queue is None:
+        _queue = asyncio.Queue(maxsize=QUEUE_MAXSIZE)
+    for i in range(count):
+        _workers.append(asyncio.create_task(_worker_loop(i)))
+    if BLOB_GC_INTERVAL > 0:
+        _workers.append(asyncio.create_task(_blob_gc_loop()))
+    print(f"✅ 분석 워커 {count}개 시작")
+
+
+async def recover_interrupted_jobs() -> int:
+    """
+    앱 시작 시 이전 프로세스에서 끝나지 못한(PENDING/PROCESSING) 작업을 FAILED 로 정리하고 업로드 ZIP 참조를 해제.
+    작업 큐는 프로세스 메모리에만 있어 재시작하면 사라지고, 필수 조건 등 요청 값은 DB 에 남지 않으므로 다시 실행하지 않는다.
+    (main.py startup 이벤트에서 start_workers 전에 호출, 정리한 작업 수 반환)
+    """
+    async with AsyncSessionLocal() as db:
+        job_ids = await crud.get_unfinished_job_ids(db)
+        for job_id in job_ids:
+            await crud.update_analysis_job_by_id(db, job_id, status="FAILED")
+            await crud.release_job_files(db, job_id, kind=blob_store.KIND_ARCHIVE)
+        await db.commit()
+    if job_ids:
+        print(f"재시작 전에 끝나지 않은 분석 작업 {len(job_ids)}개를 FAILED 로 처리: {job_ids}")
+    return len(job_ids)
+
+
+async def stop_workers():
+    """앱 종료 시 워커 태스크 정리"""
+    for task in _workers:
+        task.cancel()
+    await asyncio.gather(*_workers, return_exceptions=True)
+    _workers.clear()
+
+
+def enqueue(task: AnalysisTask):
+    """작업을 큐에 넣는다. 큐가 가득 차면 asyncio.QueueFull 발생"""
+    if _queue is None:
+        raise RuntimeError("분석 워커가 시작되지 않았습니다.")
+    _queue.put_nowait(task)
+
+
+async def _worker_loop(worker_id: int):
+    while True:
+        task = await _queue.get()
+        try:
+            await run_analysis_job(task)
+        except Exception:
+            traceback.print_exc()
+        finally:
+            _queue.task_done()
+
+
+async def _blob_gc_loop():
+    """참조 수가 0 인 업로드 파일(blob)을 주기적으로 삭제"""
+    while True:
+        await asyncio.sleep(BLOB_GC_INTERVAL)
+        try:
+            async with AsyncSessionLocal() as db:
+                removed = await blob_store.collect_garbage(db)
+            if removed:
+                print(f"업로드 파일 정리: blob {removed}개 삭제")
+        except Exception:
+            traceback.print_exc()
+
+
+# --------------------------------------------------------------------------
+# DB 헬퍼
+
+async def _update_job(job_id: int, status: Optional[str] = None, progress: Optional[int] = None,
+                      total_count: Optional[int] = None):
+    async with AsyncSessionLocal() as db:
+        await crud.update_analysis_job_by_id(db, job_id, status=status, progress=progress, total_count=total_count)
+        await db.commit()
+
+
+async def _release_archives(job_id: int):
+    # 업로드 원본 ZIP 은 AI 서버 호출에만 필요하므로 작업이 끝나면 참조 해제 (이력서 파일은 유지)
+    async with AsyncSessionLocal() as db:
+        await crud.release_job_files(db, job_id, kind=blob_store.KIND_ARCHIVE)
+        await db.commit()
+
+
+def _normalize_name(value: str) -> str:
+    return value.lower().replace(" ", "")
+
+
+class PdfMatcher:
+    """
+    지원자 이름 -> 업로드된 이력서 파일 매칭.
+    AI 서버가 결과에 File_Name 을 주면 그 파일명으로 바로 찾는다 (ZIP 안의 경로는 파일명만 비교).
+    File_Name 이 없는 이전 결과는 파일명(확장자 제외)을 정규화한 딕셔너리로 먼저 찾고,
+    없을 때만 기존처럼 '이름이 파일명에 포함'되는 첫 파일을 찾는다.
+    """
+
+    def __init__(self, filenames: list):
+        self._by_basename = {}
+        self._by_stem = {}
+        self._normalized = []
+        for filename in filenames:
+            self._by_basename.setdefault(os.path.basename(filename), filename)
+            normalized = _normalize_name(filename)
+            self._normalized.append((normalized, filename))
+            stem = _normalize_name(os.path.splitext(os.path.basename(filename))[0])
+            self._by_stem.setdefault(stem, filename)
+
+    def match(self, name: str, file_name: Optional[str] = None) -> str:
+        if file_name:
+            found = self._by_basename.get(os.path.basename(file_name))
+            if found is not None:
+                return found
+        key = _normalize_name(name)
+        found = self._by_stem.get(key)
+        if found is not None:
+            return found
+        for normalized, filename in self._normalized:
+            if key in normalized:
+                return filename
+        return f"{name}.pdf"
+
+
+def _pdf_url(task: AnalysisTask, filename: str) -> Optional[str]:
+    """이력서 blob 주소 (내용 해시 기반이라 URL 이 바뀌지 않음). 매칭되는 파일이 없으면 None"""
+    digest = task.resume_files.get(filename)
+    if digest is None:
+        return None
+    return f"{PDF_BASE_URL}/files/{digest}/{os.path.basename(filename)}"
+
+
+def _build_applicant_rows(task: AnalysisTask, results: list) -> list:
+    """AI 결과 -> applicants 테이블 insert 용 dict 목록"""
+    matcher = PdfMatcher(list(task.resume_files))
+    rows = []
+    for index, item in enumerate(results, 1):
+        if not isinstance(item, dict):
+            continue
+
+        # key 이름: AI가 주는 그대로 사용
+        name = item.get("Name") or item.get("name") or "Unknown"
+        resume_val = item.get("Resume") or item.get("resume") or ""
+
+        rows.append({
+            "job_id": task.job_id,
+            "rank": item.get("Rank") or index,   # AI 서버 벡터 인덱스의 (작업 id, 순위)와 일치
+            "name": name,
+            "score": item.get("Score") or item.get("score") or 0,
+            "job_role": item.get("Job Role") or item.get("Job Roles") or item.get("job_role"),
+            "education": item.get("Degree") or item.get("degree"),
+            "certification": item.get("Certification") or item.get("certification"),
+            "resume_summary": resume_val[:5000],   # 너무 길면 자름 (DB 오류 방지)
+            "pdf_url": _pdf_url(task, matcher.match(name, item.get("File_Name"))),
+            "keywords": item.get("Keywords") or item.get("keywords") or "",
+        })
+    return rows
+
+
+async def _save_applicants(task: AnalysisTask, results: list, total_candidates: int):
+    """
+    AI 결과를 한 트랜잭션으로 저장: 지원자 bulk insert(청크) + 작업 COMPLETED 처리 + 통계 스냅샷 + 업로드 ZIP 참조 해제.
+    (지원자 insert 중에는 FK 때문에 작업 행이 잠기므로 중간 진행률은 따로 커밋하지 않음)
+    """
+    rows = _build_applicant_rows(task, results)
+    async with AsyncSessionLocal() as db:
+        try:
+            await crud.bulk_create_applicants(db, rows)
+            await crud.update_analysis_job_by_id(db, task.job_id, status="COMPLETED", progress=100,
+                                                 total_count=total_candidates)
+            # 완료 후에는 지원자 데이터가 바뀌지 않으므로 통계 스냅샷도 같은 트랜잭션에 저장
+            await crud.save_analysis_stats_snapshot(db, task.job_id)
+            await crud.release_job_files(db, task.job_id, kind=blob_store.KIND_ARCHIVE)
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+
+
+# --------------------------------------------------------------------------
+# AI 서버 호출
+
+def _extract_results(ai_json) -> list:
+    # AI가 list 또는 dict(data/results)로 줄 수 있음 → 그대로 추출
+    if isinstance(ai_json, list):
+        return ai_json
+    if isinstance(ai_json, dict):
+        return ai_json.get("data") or ai_json.get("results") or []
+    return []
+
+
+def _log_duplicates(job_id: int, duplicates):
+    # AI 서버가 한 명으로 합친 중복 이력서 (바이트 동일 exact / 텍스트 거의 동일 near)
+    if not duplicates:
+        return
+    merged = sum(len(group.get("merged", [])) for group in duplicates)
+    print(f"작업 {job_id}: 중복 이력서 {merged}개를 {len(duplicates)}명으로 합침")
+    for group in duplicates:
+        names = ", ".join(f"{m['file']}({m['reason']})" for m in group.get("merged", []))
+        print(f"  {group.get('kept')} <- {names}")
+
+
+async def _screen_streaming(task: AnalysisTask):
+    """
+    NDJSON 스트리밍으로 AI 결과를 받으며 배치가 도착할 때마다 진행률 갱신.
+    (최종 순위 목록, 전체 지원자 수) 반환
+    """
+    candidates = {}
+    last_progress = PROGRESS_STARTED
+    async for message in ai_client.screen_stream(task.upload_files, task.prompt, task.job_id, task.requirements):
+        kind = message.get("type")
+        if kind == "batch":
+            for item in message.get("candidates", []):
+                candidates[item.pop("id")] = item
+            total_files = message.get("total_files") or 0
+            if total_files:
+                progress = PROGRESS_STARTED + (PROGRESS_AI_DONE - PROGRESS_STARTED) * message["processed"] // total_files
+                if progress > last_progress:
+                    await _update_job(task.job_id, progress=progress)
+                    last_progress = progress
+        elif kind == "result":
+            # 최종 순위는 id 로 배치에서 받은 지원자 상세를 참조
+            results = []
+            for entry in message.get("ranking", []):
+                item = candidates.get(entry["id"])
+                if item is not None:
+                    results.append({**item, "Rank": entry["Rank"], "Score": entry["Score"]})
+            _log_duplicates(task.job_id, message.get("duplicates"))
+            return results, message.get("total_candidates") or len(candidates)
+        elif kind == "error":
+            raise ai_client.AIServerError(f"AI Error: {message.get('message')}")
+    raise ai_client.AIServerError("AI 서버 스트림이 최종 결과 없이 종료되었습니다.")
+
+
+async def run_analysis_job(task: AnalysisTask):
+    """단일 분석 작업 실행: AI 서버 호출 -> 지원자 저장 -> 상태 갱신"""
+    await _update_job(task.job_id, "PROCESSING", PROGRESS_STARTED)
+
+    try:
+        if ai_client.AI_STREAM:
+            results, total_candidates = await _screen_streaming(task)
+        else:
+            ai_json = await ai_client.screen(task.upload_files, task.prompt, task.job_id, task.requirements)
+            results = _extract_results(ai_json)
+            # top_k 사용 시 전체 지원자 수는 AI 서버가 따로 알려줌
+            total_candidates = len(results)
+            if isinstance(ai_json, dict) and ai_json.get("total_candidates"):
+                total_candidates = ai_json["total_candidates"]
+            if isinstance(ai_json, dict):
+                _log_duplicates(task.job_id, ai_json.get("duplicates"))
+        await _update_job(task.job_id, progress=PROGRESS_AI_DONE)
+        await _save_applicants(task, results, total_candidates)
+
+    except Exception:
+        traceback.print_exc()
+        await _update_job(task.job_id, "FAILED")
+        await _release_archives(task.job_id)
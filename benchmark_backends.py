@@ -0,0 +1,149 @@
+# 추론 백엔드 비교 벤치마크
+# 고정 이력서 세트(parser_regression_corpus.json)의 요약 문장을 각 백엔드로 인코딩해
+# fp32(torch) 대비 코사인 점수 오차, 순위 일치도, 처리량, 메모리(RSS)를 JSON으로 출력한다.
+#   python benchmark_backends.py                              # torch, torch_int8, onnx 모두
+#   python benchmark_backends.py --backends torch torch_int8 --repeat 20 --output bench.json
+# 각 백엔드는 별도 프로세스에서 실행해 RSS가 서로 섞이지 않도록 한다.
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import time
+
+import numpy as np
+
+from encoding_engine import EncodingEngine, INFERENCE_BACKENDS, configure_torch_threads, load_model
+from profile_summary import create_natural_language_summary
+
+MODEL_NAME = 'paraphrase-multilingual-MiniLM-L12-v2'
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "parser_regression_corpus.json")
+
+JOB_DESCRIPTIONS = [
+    "IMPORTANT REQUIREMENTS:\n- Job Role: Data Analyst\n- Required Degree: Bachelor\n- Certification: SQLD\n- Criteria: Python, SQL",
+    "IMPORTANT REQUIREMENTS:\n- Job Role: Backend Developer\n- Required Degree: Bachelor\n- Certification: 정보처리기사\n- Criteria: Java, Spring",
+    "IMPORTANT REQUIREMENTS:\n- Job Role: Security Analyst\n- Required Degree: Master\n- Certification: CISSP\n- Criteria: Network, Linux",
+]
+
+
+def load_profiles():
+    """회귀 코퍼스의 파싱 결과로 요약 문장(모델 입력)을 만든다"""
+    with open(CORPUS_PATH, "r", encoding="utf-8") as f:
+        corpus = json.load(f)
+    profiles = []
+    for case in corpus:
+        row = dict(case["expected"])
+        skills = row.pop("Skills")
+        for i in range(5):
+            row[f"Skill_{i+1}"] = skills[i] if i < len(skills) else ""
+        profiles.append(create_natural_language_summary(row))
+    return profiles
+
+
+def _run_backend_safe(backend, profiles, repeat, batch_size, queue):
+    # 로드/인코딩 실패도 결과로 돌려줌 (부모 프로세스가 queue 를 시간 초과까지 기다리지 않도록)
+    try:
+        _run_backend(backend, profiles, repeat, batch_size, queue)
+    except Exception as e:
+        queue.put({"backend": backend, "error": f"{type(e).__name__}: {e}"})
+
+
+def _run_backend(backend, profiles, repeat, batch_size, queue):
+    configure_torch_threads()
+    started = time.perf_counter()
+    model, device = load_model(MODEL_NAME, backend)
+    load_seconds = time.perf_counter() - started
+    engine = EncodingEngine(model, device=device, batch_size=batch_size)
+
+    # 워밍업 1회 후 반복 측정
+    engine.encode(profiles[:2])
+    texts = JOB_DESCRIPTIONS + profiles
+    timings = []
+    for _ in range(repeat):
+        vectors = engine.encode(texts)
+        timings.append(engine.last_stats["seconds"])
+
+    queue.put({
+        "backend": backend,
+        "load_seconds": round(load_seconds, 3),
+        "encode_seconds_median": round(float(np.median(timings)), 4),
+        "sentences_per_sec": round(len(texts) / float(np.median(timings)), 1),
+        "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "vectors": vectors.tolist(),
+    })
+
+
+def _scores(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    jobs, profiles = vectors[:len(JOB_DESCRIPTIONS)], vectors[len(JOB_DESCRIPTIONS):]
+    return jobs @ profiles.T
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--backends", nargs="+", default=list(INFERENCE_BACKENDS), choices=INFERENCE_BACKENDS)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--output", default="")
+    args = parser.parse_args()
+
+    profiles = load_profiles()
+    backends = ["torch"] + [b for b in args.backends if b != "torch"]  # fp32 기준값은 항상 측정
+
+    ctx = multiprocessing.get_context("spawn")
+    results = {}
+    for backend in backends:
+        queue = ctx.Queue()
+        proc = ctx.Process(target=_run_backend_safe, args=(backend, profiles, args.repeat, args.batch_size, queue))
+        proc.start()
+        try:
+            results[backend] = queue.get(timeout=1800)
+        except Exception as e:
+            results[backend] = {"backend": backend, "error": str(e)}
+        proc.join()
+        if proc.exitcode and "error" not in results[backend]:
+            results[backend]["error"] = f"exit code {proc.exitcode}"
+
+    # fp32 대비 점수 오차 / 상위 K 일치도 (fp32 측정이 실패했으면 비교 항목은 "n/a")
+    baseline = results["torch"]
+    base_scores = None if "error" in baseline else _scores(baseline["vectors"])
+    top_k = args.top_k if base_scores is None else min(args.top_k, base_scores.shape[1])
+    report = []
+    for backend in backends:
+        entry = results[backend]
+        vectors = entry.pop("vectors", None)
+        if "error" in entry:
+            report.append(entry)
+            continue
+        if base_scores is None:
+            entry.update({"score_drift_max": "n/a", "score_drift_mean": "n/a",
+                          f"top{top_k}_overlap": "n/a", "speedup_vs_fp32": "n/a"})
+        else:
+            scores = _scores(vectors)
+            drift = np.abs(scores - base_scores)
+            overlaps = [
+                len(set(np.argsort(-b)[:top_k]) & set(np.argsort(-s)[:top_k])) / top_k
+                for b, s in zip(base_scores, scores)
+            ]
+            entry.update({
+                "score_drift_max": round(float(drift.max()), 6),
+                "score_drift_mean": round(float(drift.mean()), 6),
+                f"top{top_k}_overlap": round(float(np.mean(overlaps)), 3),
+                "speedup_vs_fp32": round(baseline["encode_seconds_median"] / entry["encode_seconds_median"], 2),
+            })
+        report.append(entry)
+
+    output = json.dumps({"model": MODEL_NAME, "profiles": len(profiles), "repeat": args.repeat, "results": report},
+                        ensure_ascii=False, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,249 @@
+# 이력서 분석 파이프라인 종단 간 벤치마크
+# 합성 이력서 ZIP(synthetic_resumes.py)을 크기별로 만들어
+#  1) run_integrated_parsing 의 단계별 시간 (unzip / dedup_exact / extract / regex / dedup_near / summary / encode / rank / serialize)
+#  2) run_integrated_parsing 전체 시간 (병렬 파싱 포함), 스트리밍 응답의 첫 배치까지 시간
+#  3) --api: 백엔드 POST /api/analysis/ 부터 COMPLETED 까지 (MySQL 대신 로컬 SQLite, AI 서버는 로컬 스레드)
+# 를 측정해 JSON 으로 출력한다. 실행마다 결과 파일을 남겨 최적화 전후를 비교할 것.
+#   python benchmark_pipeline.py --sizes 10 100 1000 --output bench_pipeline.json
+#   python benchmark_pipeline.py --sizes 100 --docx-ratio 0.3 --api
+#   python benchmark_pipeline.py --sizes 1000 --duplicate-ratio 0.2   (중복 제거 효과 측정)
+# 캐시(파싱/임베딩)는 측정값이 섞이지 않도록 모두 끈 상태로 실행한다.
+# (DOCX -> PDF 변환 단계는 python-docx 직접 추출로 대체되어 더 이상 없음)
+import argparse
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import threading
+import time
+
+import synthetic_resumes
+from ranking import rank_top_k
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+JOB_DESCRIPTION = """
+IMPORTANT REQUIREMENTS:
+- Job Role: Data Analyst
+- Required Degree: Bachelor
+- Certification: SQLD
+- Criteria: Python, SQL, Tableau
+"""
+
+
+def _configure_ai_server_env(work_dir: str):
+    """final_ai_server import 전에 캐시를 끄고 인덱스는 임시 폴더로"""
+    os.environ["PARSE_CACHE_PATH"] = ""
+    os.environ["EMBED_CACHE_DIR"] = ""
+    os.environ["EMBED_CACHE_MEMORY_ITEMS"] = "0"
+    os.environ["VECTOR_INDEX_DIR"] = os.path.join(work_dir, "candidate_index")
+    os.environ.setdefault("MODEL_LOAD_MODE", "eager")
+
+
+class StageTimer:
+    def __init__(self):
+        self.seconds = {}
+
+    def run(self, stage, fn, *args, **kwargs):
+        started = time.perf_counter()
+        result = fn(*args, **kwargs)
+        self.seconds[stage] = round(time.perf_counter() - started, 4)
+        return result
+
+
+def bench_stages(server, zip_bytes: bytes) -> dict:
+    """run_integrated_parsing 과 같은 순서로 단계별 실행 (단일 프로세스, 캐시 없음)"""
+    timer = StageTimer()
+    documents = timer.run("unzip", server.process_and_convert_resumes, io.BytesIO(zip_bytes))
+    duplicates = server.resume_dedup.DuplicateReport()
+    documents = timer.run("dedup_exact", server.resume_dedup.unique_documents, documents, duplicates)
+
+    def extract_all():
+        return [(name, server.extract_docx_text(io.BytesIO(data)) if name.lower().endswith(".docx")
+                 else server.extract_pdf_text(io.BytesIO(data))) for name, data in documents]
+
+    texts = timer.run("extract", extract_all)
+    parsed = timer.run("regex", lambda: [server.parse_resume_text(text, name) for name, text in texts])
+    parsed = timer.run("dedup_near", lambda: server.resume_dedup.drop_near_duplicates(
+        parsed, server.resume_dedup.new_near_index(), duplicates))
+    candidates = timer.run("summary", server.prepare_candidates, parsed)
+
+    engine = server.model_loader.get()
+    vectors = timer.run("encode", engine.encode, [JOB_DESCRIPTION] + candidates.column("combined_profile"))
+    top_indices, top_scores = timer.run("rank", rank_top_k, vectors[:1], vectors[1:])
+
+    def serialize():
+        records = [{"Rank": rank, "Score": float(score), **record}
+                   for rank, (score, record) in enumerate(zip(top_scores, candidates.records(top_indices)), 1)]
+        return json.dumps({"status": "SUCCESS", "count": len(records), "data": records}, ensure_ascii=False)
+
+    body = timer.run("serialize", serialize)
+    stages = timer.seconds
+    total = sum(stages.values())
+    return {
+        "stages": stages,
+        "stage_share": {k: round(v / total, 3) for k, v in stages.items()} if total else {},
+        "parse_failures": sum(1 for p in parsed if p.get("Parsing_Status") != "SUCCESS"),
+        "response_bytes": len(body.encode("utf-8")),
+    }
+
+
+def bench_end_to_end(server, zip_bytes: bytes) -> dict:
+    started = time.perf_counter()
+    result = server.run_integrated_parsing(io.BytesIO(zip_bytes), JOB_DESCRIPTION)
+    total = time.perf_counter() - started
+
+    # 스트리밍: 첫 batch 줄까지 / 마지막 result 줄까지
+    documents = server.process_and_convert_resumes(io.BytesIO(zip_bytes))
+    started = time.perf_counter()
+    first_batch = None
+    for line in server.stream_integrated_parsing(documents, JOB_DESCRIPTION):
+        if first_batch is None and '"type": "batch"' in line:
+            first_batch = time.perf_counter() - started
+    stream_total = time.perf_counter() - started
+    return {
+        "status": result["status"],
+        "seconds": round(total, 4),
+        "files_per_sec": round(result.get("total_files", 0) / total, 1) if total > 0 else 0.0,
+        "candidates": result.get("total", 0),
+        "duplicates_merged": sum(len(group["merged"]) for group in result.get("duplicates", [])),
+        "stream_first_batch_seconds": round(first_batch, 4) if first_batch is not None else None,
+        "stream_total_seconds": round(stream_total, 4),
+    }
+
+
+# --------------------------------------------------------------------------
+# 백엔드 API 경로 (/api/analysis/)
+
+class ApiBench:
+    """로컬 AI 서버(스레드) + SQLite 백엔드(FastAPI TestClient)로 업로드~완료까지 측정"""
+
+    def __init__(self, server, work_dir: str):
+        from werkzeug.serving import make_server
+
+        self._ai_server = make_server("127.0.0.1", 0, server.app, threaded=True)
+        threading.Thread(target=self._ai_server.serve_forever, daemon=True).start()
+        ai_url = f"http://127.0.0.1:{self._ai_server.server_port}/api/v1/screen"
+
+        # backend/database.py, ai_client.py 는 import 시 환경변수를 읽음
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(work_dir, 'bench.db')}"
+        os.environ["AI_SERVER_URL"] = ai_url
+        self._cwd = os.getcwd()
+        os.chdir(work_dir)  # 업로드 파일은 blob 저장소(상대 경로 storage/blobs)에 저장되므로 임시 폴더 아래에 생성됨
+        sys.path.insert(0, os.path.join(BASE_DIR, "backend"))
+
+        import main
+        from fastapi.testclient import TestClient
+
+        self.client = TestClient(main.app)
+        self.client.__enter__()  # startup 이벤트 (분석 워커 시작)
+        self.client.post("/auth/register", json={"email": "bench@example.com", "username": "bench", "password": "bench"})
+        token = self.client.post("/auth/login", data={"username": "bench@example.com", "password": "bench"}).json()["access_token"]
+        self.headers = {"Authorization": f"Bearer {token}"}
+
+    def run(self, zip_bytes: bytes, poll_interval: float = 0.05, timeout: float = 3600) -> dict:
+        started = time.perf_counter()
+        response = self.client.post(
+            "/api/analysis/", headers=self.headers,
+            files=[("files", ("bench.zip", zip_bytes, "application/zip"))],
+            data={"criteria": "Python, SQL, Tableau", "job": "Data Analyst", "degree": "Bachelor", "license": "SQLD"},
+        )
+        accepted = time.perf_counter() - started
+        job_id = response.json()["id"]
+
+        status, progress_updates, last_progress = None, 0, None
+        while time.perf_counter() - started < timeout:
+            job = self.client.get(f"/api/analysis/{job_id}", headers=self.headers).json()
+            status = job["status"]
+            if job["progress"] != last_progress:
+                progress_updates += 1
+                last_progress = job["progress"]
+            if status in ("COMPLETED", "FAILED"):
+                break
+            time.sleep(poll_interval)
+        completed = time.perf_counter() - started
+
+        timings = {}
+        for name, path in (("applicants_page", f"/api/analysis/{job_id}/applicants?limit=100"),
+                           ("stats", f"/api/analysis/{job_id}/stats")):
+            t = time.perf_counter()
+            self.client.get(path, headers=self.headers)
+            timings[f"{name}_seconds"] = round(time.perf_counter() - t, 4)
+
+        return {"status": status, "accepted_seconds": round(accepted, 4), "completed_seconds": round(completed, 4),
+                "observed_progress_steps": progress_updates, **timings}
+
+    def close(self):
+        self.client.__exit__(None, None, None)
+        self._ai_server.shutdown()
+        os.chdir(self._cwd)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", nargs="+", type=int, default=[10, 100, 1000])
+    parser.add_argument("--docx-ratio", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--duplicate-ratio", type=float, default=0.0, help="같은 지원자 사본 비율 (synthetic_resumes)")
+    parser.add_argument("--api", action="store_true", help="백엔드 /api/analysis/ 경로까지 측정")
+    parser.add_argument("--output", default="")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="bench_pipeline_")
+    _configure_ai_server_env(work_dir)
+    started = time.perf_counter()
+    import final_ai_server as server
+    server.model_loader.start()  # lazy/background 모드여도 여기서 준비될 때까지 대기
+    server.model_loader.get(timeout=None)
+    import_seconds = time.perf_counter() - started
+
+    api = ApiBench(server, work_dir) if args.api else None
+    runs = []
+    try:
+        for size in args.sizes:
+            started = time.perf_counter()
+            documents = synthetic_resumes.generate_corpus(size, seed=args.seed, docx_ratio=args.docx_ratio,
+                                                          duplicate_ratio=args.duplicate_ratio)
+            zip_bytes = synthetic_resumes.build_zip(documents)
+            entry = {
+                "files": len(documents),
+                "zip_bytes": len(zip_bytes),
+                "generate_seconds": round(time.perf_counter() - started, 3),
+                **bench_stages(server, zip_bytes),
+                "end_to_end": bench_end_to_end(server, zip_bytes),
+            }
+            if api is not None:
+                entry["api"] = api.run(zip_bytes)
+            runs.append(entry)
+            print(f"[{size} files] stages={entry['stages']} end_to_end={entry['end_to_end']['seconds']}s", file=sys.stderr)
+    finally:
+        if api is not None:
+            api.close()
+
+    report = {
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "inference_backend": server.INFERENCE_BACKEND,
+            "parse_workers": server.PARSE_WORKERS,
+            "encode_batch_size": server.model_loader.get().batch_size,
+            "micro_batch": server.ENCODE_MICRO_BATCH,
+        },
+        "startup": {**server.STARTUP_TIMINGS, **server.model_loader.status(), "harness_import_seconds": round(import_seconds, 3)},
+        "docx_ratio": args.docx_ratio,
+        "duplicate_ratio": args.duplicate_ratio,
+        "seed": args.seed,
+        "runs": runs,
+    }
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
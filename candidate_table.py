@@ -0,0 +1,60 @@
+# 파싱 결과 후처리용 컬럼 테이블 (pandas DataFrame 대신 사용)
+# 파싱 결과 dict 목록에서 랭킹/응답에 쓰는 필드만 컬럼(list)으로 옮겨 담는다 (나이/성별/서명 등은 담지 않음).
+# - 빈 값 정리, 학위 표 헤더 제거, combined_profile(요약 문장) 생성을 컬럼 단위로 한 번에 처리
+# - 필수 조건 필터는 take(행 번호) 로 컬럼을 다시 뽑고, 응답 레코드는 선택된 행만 dict 로 만든다
+import re
+from typing import Dict, List, Sequence
+
+from profile_summary import SKILL_FIELDS, create_summaries
+
+PROFILE_COLUMNS = ['Name', 'Job Roles', 'Level', 'Degree', 'Certification'] + SKILL_FIELDS + ['File_Name']
+# 최종 결과 필드: 'combined_profile' 컬럼을 'Resume'로 이름을 변경하여 포함
+# File_Name(ZIP 안의 이력서 파일명)은 백엔드가 지원자와 업로드 파일을 연결하는 데 사용
+OUTPUT_COLUMNS = ['Name', 'Job Roles', 'Degree', 'Certification', 'Skill_1', 'Skill_2', 'combined_profile', 'File_Name']
+OUTPUT_KEYS = ['Resume' if column == 'combined_profile' else column for column in OUTPUT_COLUMNS]
+DEGREE_HEADER_PATTERN = re.compile(r'Name of University Major Degree GPA')
+
+
+def _text(value) -> str:
+    # 파싱 실패 항목처럼 필드가 없으면 빈 문자열
+    return '' if value is None else value
+
+
+class CandidateTable:
+    """컬럼 이름 -> 값 목록. 모든 컬럼의 길이(행 수)는 같다"""
+
+    __slots__ = ('columns', 'size')
+
+    def __init__(self, columns: Dict[str, list]):
+        self.columns = columns
+        self.size = len(columns['Name'])
+
+    @classmethod
+    def from_parsed(cls, parsed_results: List[Dict[str, str]]) -> "CandidateTable":
+        """파싱 결과 -> 테이블 (빈 값 정리, 학위 표 헤더 제거, combined_profile 생성)"""
+        columns = {column: [_text(parsed.get(column)) for parsed in parsed_results] for column in PROFILE_COLUMNS}
+        columns['Degree'] = [DEGREE_HEADER_PATTERN.sub('', degree).strip() for degree in columns['Degree']]
+        table = cls(columns)
+        # AI 모델의 입력 포맷에 맞게 요약 문장을 combined_profile 컬럼에 저장
+        columns['combined_profile'] = create_summaries(table.skills_rows(), columns['Level'], columns['Degree'],
+                                                       columns['Certification'])
+        return table
+
+    def __len__(self):
+        return self.size
+
+    def column(self, name: str) -> list:
+        return self.columns[name]
+
+    def skills_rows(self) -> List[List[str]]:
+        """행별 [Skill_1, ..., Skill_5]"""
+        return [list(skills) for skills in zip(*(self.columns[field] for field in SKILL_FIELDS))]
+
+    def take(self, rows: Sequence[int]) -> "CandidateTable":
+        """지정한 행만 (순서대로) 담은 새 테이블"""
+        return CandidateTable({name: [values[i] for i in rows] for name, values in self.columns.items()})
+
+    def records(self, rows: Sequence[int]) -> List[Dict[str, str]]:
+        """지정한 행의 응답 레코드 (OUTPUT_KEYS 순서)"""
+        columns = [self.columns[column] for column in OUTPUT_COLUMNS]
+        return [dict(zip(OUTPUT_KEYS, [values[i] for values in columns])) for i in rows]
@@ -0,0 +1,200 @@
+# 임베딩 캐시 (모델명 + 입력 텍스트 해시 기반)
+# - 1단계: 프로세스 메모리 LRU (항목 수 제한)
+# - 2단계: 디스크 (float32 벡터 파일을 memmap으로 읽음 + 키 -> 행 번호 인덱스)
+# 캐시에 없는 텍스트만 model.encode 로 넘긴다.
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+try:
+    import fcntl  # 여러 워커 프로세스가 같은 디스크 캐시에 쓰는 경우 파일 잠금
+except ImportError:  # Windows
+    fcntl = None
+
+
+def make_key(model_name: str, text: str) -> str:
+    """캐시 키: sha256(모델명 + 텍스트)"""
+    return hashlib.sha256(f"{model_name}\x00{text}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """메모리 LRU + 디스크 memmap 2단계 임베딩 캐시"""
+
+    def __init__(self, model_name: str, cache_dir: Optional[str] = None, max_memory_items: int = 50000):
+        self.model_name = model_name
+        self.max_memory_items = max_memory_items
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        # 디스크 단계 (cache_dir 이 없으면 메모리만 사용)
+        self._dir = None
+        self._index: Dict[str, int] = {}
+        self._index_offset = 0
+        self._dim = None
+        self._vectors = None  # np.memmap (읽기 전용)
+        if cache_dir:
+            safe_name = re.sub(r"[^A-Za-z0-9_.-]", "_", model_name)
+            self._dir = os.path.join(cache_dir, safe_name)
+            os.makedirs(self._dir, exist_ok=True)
+            self._load_meta()
+            self._refresh_index()
+
+    # ------------------------------------------------------------------
+    # 디스크 파일 경로
+
+    @property
+    def _meta_path(self):
+        return os.path.join(self._dir, "meta.json")
+
+    @property
+    def _index_path(self):
+        return os.path.join(self._dir, "index.tsv")
+
+    @property
+    def _vectors_path(self):
+        return os.path.join(self._dir, "vectors.f32")
+
+    def _load_meta(self):
+        if os.path.exists(self._meta_path):
+            with open(self._meta_path, "r", encoding="utf-8") as f:
+                self._dim = json.load(f)["dim"]
+
+    def _refresh_index(self):
+        """다른 프로세스가 추가한 인덱스 줄을 이어서 읽음"""
+        if not os.path.exists(self._index_path):
+            return
+        with open(self._index_path, "r", encoding="utf-8") as f:
+            f.seek(self._index_offset)
+            for line in f:
+                if not line.endswith("\n"):
+                    break  # 쓰는 중인 줄은 다음에 읽음
+                key, row = line.rstrip("\n").split("\t")
+                self._index[key] = int(row)
+                self._index_offset += len(line.encode("utf-8"))
+        self._vectors = None  # 파일 크기가 바뀌었을 수 있으므로 memmap 다시 열기
+
+    def _disk_vectors(self):
+        if self._vectors is None and self._dim and os.path.exists(self._vectors_path):
+            size = os.path.getsize(self._vectors_path)
+            rows = size // (4 * self._dim)
+            if rows:
+                self._vectors = np.memmap(self._vectors_path, dtype=np.float32, mode="r", shape=(rows, self._dim))
+        return self._vectors
+
+    def _read_disk(self, key: str) -> Optional[np.ndarray]:
+        row = self._index.get(key)
+        if row is None:
+            return None
+        vectors = self._disk_vectors()
+        if vectors is None or row >= vectors.shape[0]:
+            return None
+        return np.array(vectors[row])
+
+    def _write_disk(self, keys: List[str], vectors: np.ndarray):
+        dim = vectors.shape[1]
+        with open(self._index_path, "a", encoding="utf-8") as index_file:
+            if fcntl:
+                fcntl.flock(index_file, fcntl.LOCK_EX)
+            try:
+                if self._dim is None:
+                    self._load_meta()
+                if self._dim is None:
+                    with open(self._meta_path, "w", encoding="utf-8") as f:
+                        json.dump({"model_name": self.model_name, "dim": dim}, f)
+                    self._dim = dim
+                if self._dim != dim:
+                    return
+
+                with open(self._vectors_path, "ab") as vf:
+                    start_row = vf.tell() // (4 * dim)
+                    vf.write(np.ascontiguousarray(vectors, dtype=np.float32).tobytes())
+                index_file.write("".join(f"{k}\t{start_row + i}\n" for i, k in enumerate(keys)))
+                index_file.flush()
+            finally:
+                if fcntl:
+                    fcntl.flock(index_file, fcntl.LOCK_UN)
+        self._refresh_index()
+
+    # ------------------------------------------------------------------
+    # 메모리 LRU
+
+    def _remember(self, key: str, vector: np.ndarray):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+
+    # ------------------------------------------------------------------
+    # 공개 API
+
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        found = {}
+        with self._lock:
+            missing = []
+            for key in keys:
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    found[key] = vector
+                else:
+                    missing.append(key)
+
+            if missing and self._dir:
+                if any(k not in self._index for k in missing):
+                    self._refresh_index()
+                for key in missing:
+                    vector = self._read_disk(key)
+                    if vector is not None:
+                        self._remember(key, vector)
+                        found[key] = vector
+
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, keys: List[str], vectors: np.ndarray):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        with self._lock:
+            for key, vector in zip(keys, vectors):
+                self._remember(key, vector)
+            if self._dir and len(keys):
+                self._write_disk(keys, vectors)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "memory_items": len(self._memory),
+            "disk_items": len(self._index),
+        }
+
+
+def encode_cached(model, texts: List[str], cache: Optional[EmbeddingCache], **encode_kwargs) -> np.ndarray:
+    """캐시를 거쳐 인코딩. 캐시 미스(중복 제거)만 model.encode 호출, 입력 순서대로 반환"""
+    if cache is None:
+        return np.asarray(model.encode(texts, **encode_kwargs), dtype=np.float32)
+
+    keys = [make_key(cache.model_name, t) for t in texts]
+    found = cache.get_many(list(dict.fromkeys(keys)))
+
+    miss_keys, miss_texts, seen = [], [], set()
+    for key, text in zip(keys, texts):
+        if key not in found and key not in seen:
+            seen.add(key)
+            miss_keys.append(key)
+            miss_texts.append(text)
+
+    if miss_texts:
+        new_vectors = np.asarray(model.encode(miss_texts, **encode_kwargs), dtype=np.float32)
+        cache.put_many(miss_keys, new_vectors)
+        found.update(zip(miss_keys, new_vectors))
+
+    return np.stack([found[k] for k in keys]) if keys else np.zeros((0, 0), dtype=np.float32)
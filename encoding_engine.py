@@ -0,0 +1,394 @@
+# 문장 인코딩 엔진 (CPU 추론 최적화)
+# - 입력을 토큰 길이 순으로 정렬해 비슷한 길이끼리 배치 (패딩 낭비 감소)
+# - 배치 크기 / torch 스레드 수 설정 가능
+# - 처리량(sentences/sec) 기록
+# - 추론 백엔드 선택: torch(fp32, 기본) / torch_int8(동적 양자화) / onnx(ONNX Runtime)
+# - ModelLoader: 백그라운드 로드 + 워밍업 + 준비 상태 (서버가 모델 로드 전에 먼저 뜰 수 있도록, 실패하면 재시도)
+# - MicroBatchEncoder: 동시 요청의 encode 호출을 모아 한 번의 forward 로 처리
+#   (큰 입력은 청크로 나눠 요청별로 번갈아 담으므로 짧은 검색 쿼리가 대량 인코딩 뒤에 오래 밀리지 않음)
+# torch 는 import 비용이 커서 실제로 모델을 로드할 때 import 한다.
+import gc
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+ENCODE_BATCH_SIZE = int(os.getenv("ENCODE_BATCH_SIZE", "64"))
+TORCH_THREADS = int(os.getenv("TORCH_THREADS", "0"))            # 0 이면 torch 기본값 사용
+TORCH_INTEROP_THREADS = int(os.getenv("TORCH_INTEROP_THREADS", "0"))
+INFERENCE_BACKEND = os.getenv("INFERENCE_BACKEND", "torch")
+ONNX_MODEL_FILE = os.getenv("ONNX_MODEL_FILE", "")                 # 예: onnx/model_qint8_avx512.onnx
+MICRO_BATCH_MAX = int(os.getenv("ENCODE_MICRO_BATCH_MAX", "256"))          # 한 번에 모을 최대 문장 수
+MICRO_BATCH_WAIT_MS = float(os.getenv("ENCODE_MICRO_BATCH_WAIT_MS", "5"))   # 다른 요청을 기다리는 최대 시간
+MICRO_BATCH_CHUNK = int(os.getenv("ENCODE_MICRO_BATCH_CHUNK", str(ENCODE_BATCH_SIZE)))  # 요청 하나가 한 번에 차지하는 문장 수
+MODEL_LOAD_RETRY_SECONDS = float(os.getenv("MODEL_LOAD_RETRY_SECONDS", "30"))  # 로드 실패 후 다시 시도하기까지 최소 간격
+
+INFERENCE_BACKENDS = ("torch", "torch_int8", "onnx")
+
+# 워밍업용 더미 문장 (길이가 다른 문장으로 첫 요청의 지연을 미리 소모)
+WARMUP_TEXTS = [
+    "warm up",
+    "Proficient in Python, SQL, with senior-level experience in the field.",
+    "IMPORTANT REQUIREMENTS:\n- Job Role: Data Analyst\n- Required Degree: Bachelor\n- Certification: SQLD\n- Criteria: Python, SQL",
+]
+
+
+def configure_torch_threads(num_threads: int = TORCH_THREADS, interop_threads: int = TORCH_INTEROP_THREADS):
+    """torch 연산 스레드 수 설정 (다른 작업과 CPU를 나눠 쓰는 VM용)"""
+    import torch
+
+    if num_threads > 0:
+        torch.set_num_threads(num_threads)
+    if interop_threads > 0:
+        try:
+            # 병렬 작업이 한 번이라도 실행된 뒤에는 변경할 수 없음
+            torch.set_num_interop_threads(interop_threads)
+        except RuntimeError as e:
+            print(f"경고: torch interop 스레드 수 설정 실패 - {e}")
+    return {"num_threads": torch.get_num_threads(), "interop_threads": torch.get_num_interop_threads()}
+
+
+def load_model(model_name: str, backend: str = INFERENCE_BACKEND, device=None):
+    """
+    설정된 추론 백엔드로 SentenceTransformer 로드. (모델, 실제 사용 장치) 반환
+    - torch      : fp32 PyTorch (기존 방식, GPU 사용 가능)
+    - torch_int8 : Linear 레이어 동적 int8 양자화 (CPU 전용)
+    - onnx       : ONNX Runtime 세션 (CPU 전용, sentence-transformers>=3.2 + optimum[onnxruntime] 필요)
+    """
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    if backend not in INFERENCE_BACKENDS:
+        raise ValueError(f"지원하지 않는 INFERENCE_BACKEND: {backend} (가능: {', '.join(INFERENCE_BACKENDS)})")
+
+    if backend == "torch":
+        device = device or torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        model = SentenceTransformer(model_name)
+        model.to(device)
+        return model, device
+
+    device = torch.device("cpu")
+    if backend == "torch_int8":
+        model = SentenceTransformer(model_name, device="cpu")
+        model.eval()
+        model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        return model, device
+
+    # onnx: 처음 로드 시 모델을 ONNX로 내보내고 ONNX Runtime 세션으로 추론
+    model_kwargs = {"file_name": ONNX_MODEL_FILE} if ONNX_MODEL_FILE else None
+    try:
+        model = SentenceTransformer(model_name, device="cpu", backend="onnx", model_kwargs=model_kwargs)
+    except TypeError as e:
+        raise RuntimeError("ONNX 백엔드는 sentence-transformers>=3.2 가 필요합니다.") from e
+    return model, device
+
+
+class EncodingEngine:
+    """SentenceTransformer 래퍼: 길이 정렬 배치 인코딩 + 처리량 측정"""
+
+    def __init__(self, model, device=None, batch_size: int = ENCODE_BATCH_SIZE):
+        self.model = model
+        self.device = device
+        self.batch_size = batch_size
+        self.last_stats: Dict[str, float] = {}
+
+    def _token_lengths(self, texts: List[str]) -> List[int]:
+        tokenizer = getattr(self.model, "tokenizer", None)
+        if tokenizer is None:
+            return [len(t) for t in texts]
+        try:
+            return [len(ids) for ids in tokenizer(texts, add_special_tokens=False)["input_ids"]]
+        except Exception:
+            return [len(t) for t in texts]
+
+    def encode(self, texts: List[str], batch_size: Optional[int] = None, timeout: Optional[float] = None,
+               **encode_kwargs) -> np.ndarray:
+        """입력 순서대로 float32 임베딩 행렬을 반환 (timeout 은 MicroBatchEncoder 와 같은 호출 형태용, 여기서는 무시)"""
+        batch_size = batch_size or self.batch_size
+        encode_kwargs.setdefault("show_progress_bar", False)
+        if self.device is not None:
+            encode_kwargs.setdefault("device", self.device)
+
+        if not texts:
+            return np.zeros((0, self.model.get_sentence_embedding_dimension()), dtype=np.float32)
+
+        started = time.perf_counter()
+        # 토큰 길이 순으로 정렬 후 batch_size 단위로 잘라 인코딩 (길이 버킷)
+        lengths = self._token_lengths(texts)
+        order = np.argsort(lengths, kind="stable")
+        outputs = None
+        for start in range(0, len(texts), batch_size):
+            idx = order[start:start + batch_size]
+            vectors = self.model.encode([texts[i] for i in idx], batch_size=len(idx),
+                                        convert_to_numpy=True, **encode_kwargs)
+            if outputs is None:
+                outputs = np.empty((len(texts), vectors.shape[1]), dtype=np.float32)
+            outputs[idx] = vectors
+
+        elapsed = time.perf_counter() - started
+        self.last_stats = {
+            "sentences": len(texts),
+            "batch_size": batch_size,
+            "seconds": round(elapsed, 4),
+            "sentences_per_sec": round(len(texts) / elapsed, 1) if elapsed > 0 else 0.0,
+        }
+        return outputs
+
+
+class ModelNotReady(Exception):
+    """모델이 아직 로드 중이거나 로드에 실패한 경우"""
+
+
+class ModelLoader:
+    """
+    모델 로드를 요청 처리와 분리. (MODEL_LOAD_MODE, final_ai_server.py 참고)
+    - start(): 백그라운드 스레드에서 로드 + 워밍업 (HTTP 서버는 먼저 응답 가능)
+    - load() : 현재 스레드에서 바로 로드 (pre-fork 서버의 마스터에서 호출하면 워커들이
+               fork 후 모델 가중치 메모리를 copy-on-write 로 공유)
+    - get()  : 준비된 EncodingEngine 반환, 준비 전이면 ModelNotReady
+    로드에 실패하면 오류를 남기고, retry_interval 이 지난 뒤의 start() 호출에서 다시 로드한다.
+    """
+
+    def __init__(self, model_name: str, backend: str = INFERENCE_BACKEND, device=None,
+                 warmup_texts: Optional[List[str]] = None, on_ready: Optional[Callable[[], None]] = None,
+                 retry_interval: float = MODEL_LOAD_RETRY_SECONDS):
+        self.model_name = model_name
+        self.backend = backend
+        self.device = device
+        self.warmup_texts = WARMUP_TEXTS if warmup_texts is None else warmup_texts
+        self.on_ready = on_ready
+        self.retry_interval = retry_interval
+        self.engine: Optional[EncodingEngine] = None
+        self.error: Optional[str] = None
+        self.timings: Dict[str, float] = {}
+        self.torch_threads: Dict[str, int] = {}
+        self._lock = threading.Lock()         # 로드 (로드하는 동안 잡고 있음)
+        self._start_lock = threading.Lock()   # 로드 스레드 시작
+        self._ready = threading.Event()     # 로드 성공
+        self._settled = threading.Event()   # 마지막 로드 시도가 끝남 (성공/실패)
+        self._failed_at: Optional[float] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set() and self.engine is not None
+
+    @property
+    def loading(self) -> bool:
+        return self._thread is not None and self._thread.is_alive() and not self._settled.is_set()
+
+    def start(self):
+        with self._start_lock:
+            if self.engine is not None or self.loading:
+                return self
+            if self._failed_at is not None and time.monotonic() - self._failed_at < self.retry_interval:
+                return self
+            self._settled.clear()
+            self._thread = threading.Thread(target=self._load_quietly, name="model-loader", daemon=True)
+            self._thread.start()
+        return self
+
+    def _load_quietly(self):
+        try:
+            self.load()
+        except Exception as e:
+            # 오류는 self.error 로 준비 상태 API 에서도 확인 가능
+            print(f"오류: AI 모델 로드 실패. CUDA/Torch/Transformers 설치를 확인하세요. - {e}")
+
+    def load(self, freeze: bool = False, warmup: bool = True) -> EncodingEngine:
+        """
+        모델 로드 + 워밍업. freeze=True 면 로드된 객체를 gc 대상에서 제외 (fork 후 COW 페이지 보존).
+        fork 전에 로드하는 경우 warmup=False 로 두고 워커에서 warmup() 호출
+        (fork 전에 torch 연산 스레드 풀을 띄우면 자식 프로세스에서 멈출 수 있음)
+        """
+        with self._lock:
+            if self.engine is not None:
+                return self.engine
+            self.error = None
+            try:
+                started = time.perf_counter()
+                self.torch_threads = configure_torch_threads()
+                model, device = load_model(self.model_name, self.backend, self.device)
+                self.timings["model_load_seconds"] = round(time.perf_counter() - started, 3)
+
+                engine = EncodingEngine(model, device=device)
+                if warmup:
+                    self._warmup(engine)
+            except Exception as e:
+                # 준비 상태로 두지 않음: 다음 start() 에서 다시 로드하고, 그 전까지 get() 은 오류를 알림
+                self.error = f"{type(e).__name__}: {e}"
+                self._failed_at = time.monotonic()
+                self._settled.set()
+                raise
+
+            if freeze:
+                # fork 된 워커에서 gc 가 모델 객체 헤더를 건드려 공유 페이지가 복사되는 것을 방지
+                gc.collect()
+                gc.freeze()
+            self.engine = engine
+            self.device = device
+            self._failed_at = None
+            self._ready.set()
+            self._settled.set()
+        if self.on_ready is not None:
+            self.on_ready()
+        return engine
+
+    def _warmup(self, engine: EncodingEngine):
+        started = time.perf_counter()
+        if self.warmup_texts:
+            engine.encode(self.warmup_texts)
+        self.timings["warmup_seconds"] = round(time.perf_counter() - started, 3)
+
+    def warmup(self):
+        """로드된 모델로 더미 인코딩 1회 (pre-fork 서버의 워커 시작 시)"""
+        self._warmup(self.get())
+
+    def get(self, timeout: Optional[float] = None) -> EncodingEngine:
+        """준비된 인코더 반환. timeout 동안 기다려도 준비되지 않거나 로드에 실패했으면 ModelNotReady"""
+        if self.engine is None:
+            self._settled.wait(timeout)
+        if self.engine is not None:
+            return self.engine
+        if self.error and not self.loading:
+            raise ModelNotReady(f"모델 로드 실패: {self.error}")
+        raise ModelNotReady("모델 로드 중입니다.")
+
+    def status(self) -> Dict:
+        if self.engine is not None:
+            state = "ready"
+        elif self.loading:
+            state = "loading"
+        else:
+            state = "failed" if self.error else "not_loaded"
+        info = {"status": state, "model": self.model_name, "backend": self.backend,
+                "device": str(self.device) if self.device is not None else None, **self.timings}
+        if self.engine is not None:
+            info["batch_size"] = self.engine.batch_size
+        if self.error:
+            info["error"] = self.error
+        return info
+
+
+class MicroBatchEncoder:
+    """
+    여러 요청 스레드의 encode 호출을 전용 스레드 하나에서 모아 처리.
+    첫 요청이 도착하면 max_wait_ms 동안(또는 max_batch 문장이 찰 때까지) 다른 요청을 더 모은 뒤
+    한 번의 EncodingEngine.encode 로 인코딩하고 요청별로 잘라 돌려준다.
+    (모델 forward 가 한 번에 하나만 돌기 때문에 동시 요청끼리 CPU 스레드를 다투지 않음)
+    각 요청은 chunk_size 문장씩 나눠 요청별로 번갈아 배치에 담는다.
+    (이력서 수천 건 인코딩 중에 들어온 검색 쿼리도 다음 배치에 바로 포함됨)
+    """
+
+    def __init__(self, engine: EncodingEngine, max_batch: int = MICRO_BATCH_MAX,
+                 max_wait_ms: float = MICRO_BATCH_WAIT_MS, chunk_size: int = MICRO_BATCH_CHUNK):
+        self.engine = engine
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self.chunk_size = max(1, min(chunk_size, max_batch))
+        self._cond = threading.Condition()
+        self._pending: List[Dict] = []
+        self._thread: Optional[threading.Thread] = None
+        self.batches = 0
+        self.requests = 0
+
+    @property
+    def batch_size(self) -> int:
+        return self.engine.batch_size
+
+    @property
+    def last_stats(self) -> Dict[str, float]:
+        return self.engine.last_stats
+
+    def encode(self, texts: List[str], timeout: Optional[float] = None, **encode_kwargs) -> np.ndarray:
+        """EncodingEngine.encode 와 같은 결과. timeout 안에 끝나지 않으면 TimeoutError"""
+        if not texts or encode_kwargs:
+            # 별도 인코딩 옵션이 있는 호출은 다른 요청과 합치지 않음
+            return self.engine.encode(texts, **encode_kwargs)
+
+        texts = list(texts)
+        chunks = [(start, min(start + self.chunk_size, len(texts))) for start in range(0, len(texts), self.chunk_size)]
+        item = {"texts": texts, "chunks": chunks, "left": len(chunks),
+                "done": threading.Event(), "result": None, "error": None}
+        with self._cond:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="micro-batch-encoder", daemon=True)
+                self._thread.start()
+            self._pending.append(item)
+            self._cond.notify()
+
+        if not item["done"].wait(timeout):
+            with self._cond:
+                # 아직 배치에 담기지 않은 청크는 인코딩하지 않음
+                item["chunks"] = []
+                if item in self._pending:
+                    self._pending.remove(item)
+            raise TimeoutError("인코딩 대기 시간 초과")
+        if item["error"] is not None:
+            raise item["error"]
+        return item["result"]
+
+    def _pending_texts(self) -> int:
+        return sum(end - start for item in self._pending for start, end in item["chunks"])
+
+    def _take_batch(self) -> List[tuple]:
+        """(요청, 시작, 끝) 목록. 요청마다 청크를 하나씩 번갈아 담아 max_batch 문장까지 채움"""
+        with self._cond:
+            while not self._pending:
+                self._cond.wait()
+            # 첫 요청 도착 후 잠깐 더 기다리며 다른 요청을 모음
+            deadline = time.monotonic() + self.max_wait
+            while self._pending_texts() < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+
+            batch, count = [], 0
+            added = True
+            while added:
+                added = False
+                for item in self._pending:
+                    if not item["chunks"]:
+                        continue
+                    start, end = item["chunks"][0]
+                    if batch and count + end - start > self.max_batch:
+                        continue
+                    item["chunks"].pop(0)
+                    batch.append((item, start, end))
+                    count += end - start
+                    added = True
+            self._pending = [item for item in self._pending if item["chunks"]]
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._take_batch()
+            try:
+                vectors = self.engine.encode([text for item, start, end in batch for text in item["texts"][start:end]])
+                offset = 0
+                for item, start, end in batch:
+                    if item["result"] is None:
+                        item["result"] = np.empty((len(item["texts"]), vectors.shape[1]), dtype=np.float32)
+                    item["result"][start:end] = vectors[offset:offset + end - start]
+                    offset += end - start
+            except Exception as e:
+                with self._cond:
+                    for item, _, _ in batch:
+                        item["error"] = e
+                        item["chunks"] = []
+                    self._pending = [item for item in self._pending if item["chunks"]]
+            self.batches += 1
+            for item, _, _ in batch:
+                item["left"] -= 1
+                if item["error"] is not None or item["left"] == 0:
+                    if not item["done"].is_set():
+                        self.requests += 1
+                    item["done"].set()
+
+    def stats(self) -> Dict[str, float]:
+        return {"batches": self.batches, "requests": self.requests,
+                "requests_per_batch": round(self.requests / self.batches, 2) if self.batches else 0.0}
+
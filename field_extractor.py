@@ -0,0 +1,116 @@
+# 이력서 텍스트 필드 추출기 (정규식은 import 시 1회만 컴파일)
+# 기존 parse_single_resume 의 필드별 re.search / 오타별 re.sub 를 대체한다.
+# - 제어 문자 제거: str.translate 1회
+# - 오타/동의어 정규화: 통합 패턴 1회
+# - 라벨(Name, Age, ...) 위치: 전체 텍스트 1회 스캔 후 위치 목록에서 각 필드 계산
+# 결과는 기존 순차 정규식 방식과 동일하다 (parser_regression.py 로 검증).
+import re
+from bisect import bisect_left
+from typing import Dict, List, Optional
+
+# (1) 0x00~0x1F, 0x7F 제어 문자 제거 테이블
+_CONTROL_CHARS = dict.fromkeys(list(range(0x20)) + [0x7F])
+
+# (2) 오타/동의어 정규화 (자주 발생하는 오타나 동의어를 표준화)
+TYPO_MAP = {
+    'Pyhon': 'Python',
+    'Cybersecuruty': 'Cybersecurity',
+    'Analystt': 'Analyst',
+    'Bachlor': 'Bachelor',
+    'Masteer': 'Master',
+    'Certificaton': 'Certification',
+}
+# 오타끼리 겹치는 접두/접미가 없으므로 한 번의 교대(|) 치환이 순차 치환과 같은 결과
+_TYPO_PATTERN = re.compile('|'.join(map(re.escape, TYPO_MAP)), re.IGNORECASE)
+_TYPO_LOOKUP = {typo.lower(): correct for typo, correct in TYPO_MAP.items()}
+
+# (3) 연속 공백 정리
+_MULTI_SPACE = re.compile(r'\s{2,}')
+_WHITESPACE_RUN = re.compile(r'\s*')
+
+# 라벨 -> 다음 라벨 (기존 safe_extract_sequential 호출 순서와 동일)
+FIELD_LABELS = [
+    ("Name", "name", "age"),
+    ("Age", "age", "gender"),
+    ("Gender", "gender", "job_roles"),
+    ("Job Roles", "job_roles", "level"),
+    ("Level", "level", "degree"),
+    ("Degree", "degree", "skills"),
+]
+_LABEL_TEXT = {
+    "name": "Name", "age": "Age", "gender": "Gender", "job_roles": "Job roles",
+    "level": "Level", "degree": "Degree", "skills": "Skills", "certification": "Certification",
+}
+_LABEL_LENGTH = {key: len(text) for key, text in _LABEL_TEXT.items()}
+# 모든 위치에서 라벨 시작 여부를 확인 (lookahead라 겹치는 등장도 모두 잡힘)
+_LABEL_SCAN = re.compile(
+    '(?=(?:' + '|'.join(f'(?P<{key}>{re.escape(text)})' for key, text in _LABEL_TEXT.items()) + '))',
+    re.IGNORECASE,
+)
+
+_SKILL_STOPWORDS = {'Institution', 'Date', 'Roel', 'Skills'}
+_CERT_HEADER = re.compile(r'Name\s*Date\s*Institution\s*', re.IGNORECASE)
+
+
+def clean_text(extracted_text: str) -> str:
+    """제어 문자 제거 -> 오타 정규화 -> 연속 공백 정리"""
+    text = extracted_text.translate(_CONTROL_CHARS)
+    text = _TYPO_PATTERN.sub(lambda m: _TYPO_LOOKUP[m.group(0).lower()], text)
+    return _MULTI_SPACE.sub(' ', text).strip()
+
+
+def _scan_labels(text: str) -> Dict[str, List[int]]:
+    positions = {key: [] for key in _LABEL_TEXT}
+    for match in _LABEL_SCAN.finditer(text):
+        positions[match.lastgroup].append(match.start())
+    return positions
+
+
+def _section(text: str, positions: Dict[str, List[int]], start_key: str, stop_key: str) -> Optional[str]:
+    """
+    re.search(rf'{start}\\s*(.+?)\\s*{stop}', DOTALL | IGNORECASE) 와 같은 결과.
+    시작 라벨 등장 위치를 앞에서부터 보며, 라벨 뒤 공백을 건너뛴 지점보다
+    최소 1글자 뒤에 나오는 첫 종료 라벨까지를 값으로 사용한다.
+    """
+    stops = positions[stop_key]
+    for start in positions[start_key]:
+        value_start = start + _LABEL_LENGTH[start_key]
+        content_start = _WHITESPACE_RUN.match(text, value_start).end()
+        idx = bisect_left(stops, content_start + 1)
+        if idx < len(stops):
+            return text[value_start:stops[idx]].strip()
+        # 공백만 있고 바로 종료 라벨이 오는 경우 (정규식 역추적 시 빈 값)
+        if content_start > value_start and stops and stops[-1] == content_start:
+            return ""
+    return None
+
+
+def _certification_section(text: str, positions: Dict[str, List[int]]) -> Optional[str]:
+    """re.search(r'Certification\\s*(.+)', DOTALL | IGNORECASE) 와 같은 결과"""
+    for start in positions["certification"]:
+        value_start = start + _LABEL_LENGTH["certification"]
+        if value_start < len(text):
+            return text[value_start:].strip()
+    return None
+
+
+def extract_fields(cleaned_text: str) -> Dict[str, object]:
+    """정리된 텍스트에서 라벨 구간을 한 번에 추출. Skills 는 최대 5개 리스트"""
+    positions = _scan_labels(cleaned_text)
+    fields = {}
+    for field, start_key, stop_key in FIELD_LABELS:
+        value = _section(cleaned_text, positions, start_key, stop_key)
+        fields[field] = "N/A" if value is None else value
+
+    # Skills 5개 항목 리스트
+    raw_skills = _section(cleaned_text, positions, "skills", "certification")
+    if raw_skills is None:
+        fields["Skills"] = []
+    else:
+        skills = [s.strip() for s in raw_skills.split() if s.strip() and s.strip() not in _SKILL_STOPWORDS]
+        fields["Skills"] = skills[:5]
+
+    # Certification 항목
+    raw_cert = _certification_section(cleaned_text, positions)
+    fields["Certification"] = "N/A" if raw_cert is None else _CERT_HEADER.sub('', raw_cert).strip()
+    return fields
@@ -1,290 +1,422 @@
-import pandas as pd
-from docx import Document
-from docx2pdf import convert 
-from docx.shared import Inches
+import time
+_IMPORT_STARTED = time.perf_counter()
 from typing import Dict, List
 import os
-import pypdf
 import sys
-import re
 import zipfile
-import shutil
-import time
+import math
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 import numpy as np
-import torch
-from sklearn.metrics.pairwise import cosine_similarity
-from sentence_transformers import SentenceTransformer
-from flask import Flask, request, jsonify 
+from flask import Flask, request, jsonify, Response
 from werkzeug.utils import secure_filename
 from flask_cors import CORS
 import json 
+from embedding_cache import EmbeddingCache, encode_cached
+from resume_parser import (PARSER_VERSION, extract_docx_text, extract_pdf_text, parse_resume_text,
+                           parse_single_resume, parsed_resume_cache)
+from candidate_table import CandidateTable
+from ranking import normalize_rows, rank_scores
+from vector_index import CandidateVectorIndex
+from encoding_engine import MicroBatchEncoder, ModelLoader, ModelNotReady, INFERENCE_BACKEND
+from admission import AdmissionController, Deadline, Overloaded, RequestTimeout
+import resume_dedup
+from requirement_filter import RequirementIndex, Requirements, hybrid_scores
+
+# import 시간 측정 (torch/sentence_transformers 는 모델 로드 시점에 import 됨)
+# 모듈별 상세 시간은 `python -X importtime final_ai_server.py` 로 확인
+STARTUP_TIMINGS = {"import_seconds": round(time.perf_counter() - _IMPORT_STARTED, 3)}
 
 # --------------------------------------------------------------------------
 # --- 0. 환경 설정 및 AI 모델 초기화 (서버 시작 시 1회 실행) ---
 base_dir = os.getcwd() 
-device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
 model_name = 'paraphrase-multilingual-MiniLM-L12-v2'
 
-# AI 모델 로드
-try:
-    model = SentenceTransformer(model_name)
-    model.to(device)
-    print(f"✅ AI Sentence Model '{model_name}' 로드 완료. (장치: {device})")
-except Exception as e:
-    print(f"오류: AI 모델 로드 실패. CUDA/Torch/Transformers 설치를 확인하세요. - {e}")
-    raise
+# 모델 로드 방식 (MODEL_LOAD_MODE)
+# - background : HTTP 서버를 먼저 띄우고 모델은 백그라운드 스레드에서 로드 + 워밍업 (기본)
+#                준비 전 요청은 503 + Retry-After, 준비 여부는 /api/v1/ready 로 확인
+# - eager      : import 시점에 바로 로드. pre-fork 서버(gunicorn --preload)의 마스터에서 로드하면
+#                fork 된 워커들이 모델 가중치를 copy-on-write 로 공유 (워커마다 모델 메모리를 다시 쓰지 않음)
+# - lazy       : 첫 요청이 들어올 때 로드 시작
+MODEL_LOAD_MODE = os.getenv("MODEL_LOAD_MODE", "background")
+MODEL_WAIT_SECONDS = float(os.getenv("MODEL_WAIT_SECONDS", "0"))   # 요청이 모델 준비를 기다리는 최대 시간
+MODEL_RETRY_AFTER = int(os.getenv("MODEL_RETRY_AFTER", "5"))
+MODEL_EAGER_WARMUP = os.getenv("MODEL_EAGER_WARMUP", "true").lower() == "true"  # eager 로드 직후 워밍업 여부
+
+def _log_model_ready():
+    STARTUP_TIMINGS["ready_after_seconds"] = round(time.perf_counter() - _IMPORT_STARTED, 3)
+    status = model_loader.status()
+    print(f"✅ AI Sentence Model '{model_name}' 로드 완료. (백엔드: {INFERENCE_BACKEND}, 장치: {status['device']}, "
+          f"torch 스레드: {model_loader.torch_threads}, 배치: {status['batch_size']}, "
+          f"로드 {status['model_load_seconds']}s / 워밍업 {status.get('warmup_seconds', '-')}s)")
+
+# INFERENCE_BACKEND 환경변수로 torch / torch_int8 / onnx 선택 (비교는 benchmark_backends.py)
+model_loader = ModelLoader(model_name, INFERENCE_BACKEND, on_ready=_log_model_ready)
+
+# 파싱 프로세스 풀(forkserver/spawn)의 자식은 이 파일을 실행한 경우 `__mp_main__` 으로 다시 import 하므로 모델을 로드하지 않음
+if __name__ == "__mp_main__":
+    pass
+elif MODEL_LOAD_MODE == "eager":
+    try:
+        model_loader.load(freeze=True, warmup=MODEL_EAGER_WARMUP)
+    except Exception as e:
+        print(f"오류: AI 모델 로드 실패. CUDA/Torch/Transformers 설치를 확인하세요. - {e}")
+        raise
+elif MODEL_LOAD_MODE == "background":
+    model_loader.start()
+
+# 동시 요청의 인코딩을 한 번의 forward 로 묶음 (ENCODE_MICRO_BATCH=false 면 요청별로 바로 인코딩)
+ENCODE_MICRO_BATCH = os.getenv("ENCODE_MICRO_BATCH", "true").lower() == "true"
+_batch_encoder = None
+_batch_encoder_lock = threading.Lock()
+
+def get_encoder():
+    """준비된 인코더 반환 (lazy 모드면 첫 호출에서 로드 시작). 준비 전이면 ModelNotReady"""
+    global _batch_encoder
+    model_loader.start()
+    engine = model_loader.get(timeout=MODEL_WAIT_SECONDS)
+    if not ENCODE_MICRO_BATCH:
+        return engine
+    # fork 이후 워커 프로세스에서 처음 호출될 때 생성 (스레드는 fork 로 복제되지 않음)
+    with _batch_encoder_lock:
+        if _batch_encoder is None:
+            _batch_encoder = MicroBatchEncoder(engine)
+    return _batch_encoder
+
+def overloaded_response(e: Overloaded):
+    response = jsonify({"status": "OVERLOADED", "message": str(e), "admission": admission.stats()})
+    response.headers["Retry-After"] = str(e.retry_after)
+    return response, e.status_code
+
+def model_not_ready_response(e: ModelNotReady):
+    response = jsonify({"status": "NOT_READY", "message": str(e), "model": model_loader.status()})
+    response.headers["Retry-After"] = str(MODEL_RETRY_AFTER)
+    return response, 503
+
+# 임베딩 캐시 (EMBED_CACHE_DIR 를 빈 값으로 두면 메모리 캐시만 사용)
+EMBED_CACHE_DIR = os.getenv("EMBED_CACHE_DIR", os.path.join(base_dir, "cache", "embeddings"))
+EMBED_CACHE_MEMORY_ITEMS = int(os.getenv("EMBED_CACHE_MEMORY_ITEMS", "50000"))
+# 백엔드마다 벡터 값이 조금씩 다르므로 fp32 외 백엔드는 캐시 키를 분리
+cache_model_key = model_name if INFERENCE_BACKEND == "torch" else f"{model_name}@{INFERENCE_BACKEND}"
+embedding_cache = EmbeddingCache(cache_model_key, EMBED_CACHE_DIR or None, EMBED_CACHE_MEMORY_ITEMS)
+
+# 지원자 벡터 인덱스 (분석 작업 간 인재 검색용, /api/v1/search)
+VECTOR_INDEX_DIR = os.getenv("VECTOR_INDEX_DIR", os.path.join(base_dir, "cache", "candidate_index", cache_model_key.replace("/", "_")))
+candidate_index = CandidateVectorIndex(VECTOR_INDEX_DIR)
 
 # Flask 애플리케이션 초기화
 app = Flask(__name__)
 CORS(app, origins=["http://localhost:3000"])
 
-# 임시 파일 저장을 위한 폴더 설정
-UPLOAD_FOLDER = 'uploads'
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+# 병렬 파싱 설정 (CPU 바운드 작업이므로 프로세스 풀 사용)
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", os.cpu_count() or 1))
+PARSE_CHUNKSIZE = int(os.getenv("PARSE_CHUNKSIZE", "16"))          # 워커 1회 전달 최대 파일 수
+PARSE_PARALLEL_MIN_FILES = int(os.getenv("PARSE_PARALLEL_MIN_FILES", "8"))  # 이보다 적으면 순차 처리
+
+# 요청 수 제한 (프로세스 단위). 포화 시 429(대기열 가득) / 503(대기 시간 초과) + Retry-After
+AI_MAX_CONCURRENT = int(os.getenv("AI_MAX_CONCURRENT", "2"))           # 동시에 파싱/인코딩하는 요청 수
+AI_MAX_QUEUE = int(os.getenv("AI_MAX_QUEUE", "8"))                     # 자리를 기다릴 수 있는 요청 수
+AI_QUEUE_TIMEOUT = float(os.getenv("AI_QUEUE_TIMEOUT", "30"))          # 자리 대기 최대 시간(초)
+AI_MAX_INFLIGHT_FILES = int(os.getenv("AI_MAX_INFLIGHT_FILES", "5000"))  # 처리 중 이력서 파일 수 합계 상한
+AI_REQUEST_TIMEOUT = float(os.getenv("AI_REQUEST_TIMEOUT", "600"))     # 요청당 처리 시간 제한(초), 초과 시 504
+AI_RETRY_AFTER = int(os.getenv("AI_RETRY_AFTER", "10"))
+admission = AdmissionController(AI_MAX_CONCURRENT, AI_MAX_QUEUE, AI_QUEUE_TIMEOUT, AI_MAX_INFLIGHT_FILES, AI_RETRY_AFTER)
+
+# 스트리밍 응답(NDJSON) 설정: 파싱/점수 계산이 끝난 지원자를 이 개수 단위로 내보냄
+STREAM_BATCH_SIZE = int(os.getenv("STREAM_BATCH_SIZE", "32"))
 
 
 # --------------------------------------------------------------------------
 # --- [1] 파싱 헬퍼 함수 정의 ---
 
-# (A-1) 텍스트 추출 함수
-def extract_pdf_text(file_path):
-    """PDF 파일의 텍스트를 추출하는 함수"""
-    try:
-        reader = pypdf.PdfReader(file_path)
-        text = ""
-        for page in reader.pages:
-            text += page.extract_text(extraction_mode="layout") + "\n\n"
-        return text.strip()
-    except Exception as e:
-        return f"EXTRACTION_ERROR: {e}"
-
-# (A-2) ZIP 파일 처리 및 PDF 변환 함수
-def process_and_convert_resumes(zip_file_path, temp_extract_dir="temp_resumes"):
+# (A) ZIP 파일 처리 함수
+def process_and_convert_resumes(zip_source):
     """
-    ZIP 파일을 열어 DOCX/PDF를 처리하고 PDF 파일 경로 목록을 반환
+    ZIP 파일(경로 또는 바이너리 스트림)을 열어 DOCX/PDF 이력서의
+    (파일명, 파일 바이트) 목록을 반환.
+    ZIP 멤버에서 바로 메모리로 읽고, 공유 임시 폴더를 쓰지 않으므로
+    동시 요청끼리 서로의 파일을 덮어쓰지 않는다.
     """
-    converted_pdf_paths = []
-    
-    if os.path.exists(temp_extract_dir):
-        shutil.rmtree(temp_extract_dir)
-    os.makedirs(temp_extract_dir)
+    documents = []
     
     try:
-        with zipfile.ZipFile(zip_file_path, 'r') as zip_ref:
+        with zipfile.ZipFile(zip_source, 'r') as zip_ref:
             for member in zip_ref.namelist():
                 base_name = os.path.basename(member)
                 if not base_name: continue
                 
-                name, ext = os.path.splitext(base_name)
-                ext = ext.lower()
-                zip_ref.extract(member, temp_extract_dir)
-                original_path = os.path.join(temp_extract_dir, member)
-                
-                if ext == '.docx':
-                    pdf_path = os.path.join(temp_extract_dir, f"{name}.pdf")
-                    try:
-                        convert(original_path, pdf_path)
-                        converted_pdf_paths.append(pdf_path)
-                    except Exception: pass
-                elif ext == '.pdf':
-                    converted_pdf_paths.append(original_path)
+                ext = os.path.splitext(base_name)[1].lower()
+                if ext in ('.pdf', '.docx'):
+                    with zip_ref.open(member) as member_file:
+                        documents.append((base_name, member_file.read()))
     except Exception as e:
         print(f"오류 처리 중 문제가 발생했습니다: {e}")
     
-    return converted_pdf_paths
-
-# (B-1) 순차적 필드 추출을 위한 범용 함수 (Regex)
-def safe_extract_sequential(text, start_label, stop_label=r'[A-Za-z]+:\s*|\s*degree|\s*Skills|\s*Certification|\s*$'):
-    """순차적 필드 추출을 위한 범용 함수"""
-    pattern = rf'{start_label}\s*(.+?)\s*{stop_label}'
-    match = re.search(pattern, text, re.DOTALL | re.IGNORECASE)
-    if match:
-        return match.group(1).strip()
-    return "N/A"
-
-# (B-2) Skills 5개 항목 리스트 추출
-def extract_skills(text):
-    """Skills 5개 항목 리스트 추출"""
-    pattern = r'Skills\s*(.+?)\s*Certification'
-    match = re.search(pattern, text, re.DOTALL | re.IGNORECASE)
-    if match:
-        raw_skills_text = match.group(1).strip()
-        skills_list = [
-            s.strip() for s in raw_skills_text.split() 
-            if s.strip() and 
-            s.strip() not in ['Institution', 'Date', 'Roel', 'Skills']
-        ]
-        return skills_list[:5]
-    return []
-
-# (B-3) Certification 항목 추출
-def extract_certification(text):
-    """Certification 항목 추출"""
-    pattern = r'Certification\s*(.+)'
-    match = re.search(pattern, text, re.DOTALL | re.IGNORECASE)
-    if match:
-        raw_cert_text = match.group(1).strip()
-        cert = re.sub(r'Name\s*Date\s*Institution\s*', '', raw_cert_text, flags=re.IGNORECASE).strip()
-        return cert
-    return "N/A"
-
-
-# (C) 단일 PDF 파싱 함수
-def parse_single_resume(file_path: str) -> Dict[str, str]:
-    """단일 PDF 파일에서 8가지 필수 정보를 추출하는 메인 파싱 함수"""
-    
-    extracted_text = extract_pdf_text(file_path)
-    if extracted_text.startswith("EXTRACTION_ERROR"):
-        return {"File_Name": os.path.basename(file_path), "Parsing_Status": extracted_text}
-
-    # [노이즈 처리 로직]
-    # (1) 흰 글씨 및 제어 문자 제거
-    # 0x00~0x1F 사이의 제어 문자를 제거 (비인쇄 문자)
-    cleaned_text = re.sub(r'[\x00-\x1F\x7F]', '', extracted_text) 
-
-    # (2) 오타/동의어 정규화 (자주 발생하는 오타나 동의어를 표준화)
-    typo_map = {
-        'Pyhon': 'Python',
-        'Cybersecuruty': 'Cybersecurity',
-        'Analystt': 'Analyst',
-        'Bachlor': 'Bachelor',
-        'Masteer': 'Master',
-        'Certificaton': 'Certification',
-    }
-
-    for typo, correct in typo_map.items():
-        # 대소문자 무시하고 치환
-        cleaned_text = re.sub(typo, correct, cleaned_text, flags=re.IGNORECASE) 
-
-    # (3) 연속된 공백 및 줄바꿈 정리 (기존 로직 유지)
-    cleaned_text = re.sub(r'\s{2,}', ' ', cleaned_text).strip()
-    
-    
-    # 3. 핵심 정보 추출 (정규 표현식 적용)
-    name = safe_extract_sequential(cleaned_text, r'Name', r'Age')
-    age = safe_extract_sequential(cleaned_text, r'Age', r'Gender')
-    gender = safe_extract_sequential(cleaned_text, r'Gender', r'Job roles')
-    job_roles = safe_extract_sequential(cleaned_text, r'Job roles', r'Level')
-    level = safe_extract_sequential(cleaned_text, r'Level', r'Degree')
-    degree = safe_extract_sequential(cleaned_text, r'Degree', r'Skills')
-    
-    skills_list = extract_skills(cleaned_text)
-    certification = extract_certification(cleaned_text)
-    
-    # 4. 최종 데이터 구조화
-    parsed_data = {
-        "File_Name": os.path.basename(file_path), "Parsing_Status": "SUCCESS",
-        "Name": name, "Age": age, "Gender": gender, "Job Roles": job_roles, 
-        "Level": level, "Degree": degree, "Certification": certification,
-        "Raw_Text": extracted_text 
-    }
-    
-    # 5. Skills 5개 항목 분리 추가
-    for i in range(5):
-        parsed_data[f'Skill_{i+1}'] = skills_list[i] if i < len(skills_list) else ""
-        
-    return parsed_data
+    return documents
 
-# --------------------------------------------------------------------------
-# --- [2] 통합 실행 함수: 파싱 결과를 AI 모델의 입력으로 연결 ---
+def count_resume_files(zip_source) -> int:
+    """ZIP 중앙 디렉터리만 읽어 PDF/DOCX 개수 확인 (admission 용, 파일 내용은 읽지 않음)"""
+    try:
+        with zipfile.ZipFile(zip_source, 'r') as zip_ref:
+            count = sum(1 for member in zip_ref.namelist()
+                        if os.path.basename(member) and os.path.splitext(member)[1].lower() in ('.pdf', '.docx'))
+    except Exception:
+        count = 0
+    if hasattr(zip_source, 'seek'):
+        zip_source.seek(0)
+    return count
+
+# (B) 파싱 함수 (텍스트 추출 / 필드 추출 / 파싱 캐시)는 resume_parser 모듈 사용
 
-# 요약 문장 생성 헬퍼 함수
+# (C) 다중 프로세스 배치 파싱
+_parse_pool = None
+
+def _parse_pool_context():
     """
-    각 지원자의 파싱된 정보를 기반으로 'Proficient in...' 형태의 자연어 요약 문장을 생성
+    서버 프로세스에는 모델 로드 / 마이크로 배치 / 요청 스레드가 있어 fork 하면 자식이 잠긴 락을 물려받아 멈출 수 있음.
+    forkserver(단일 스레드 프로세스, 실행 스크립트와 resume_parser 를 미리 import)에서 워커를 fork 하고, 없으면(Windows) spawn
     """
-def _create_natural_language_summary(row):
-    # 1. Skills 조합
-    skills = [row[f'Skill_{i+1}'] for i in range(5) if row[f'Skill_{i+1}']]
-    skills_str = ', '.join(skills)
-    
-    # 2. Level, Degree, Certification
-    level = row['Level']
-    degree = row['Degree']
-    certification = row['Certification']
-    
-    # 3. 문장 구성
-    
-    # 3.1. Main Phrase (Skills + Level)
-    main_phrase = f"Proficient in {skills_str}" if skills_str else "Proficient in unspecified skills"
-    
-    if level and level != 'N/A':
-        main_phrase += f", with {level}-level experience in the field"
-    else:
-        main_phrase += ", with unspecified experience in the field"
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        ctx = multiprocessing.get_context("forkserver")
+        ctx.set_forkserver_preload(["__main__", "resume_parser"])
+        return ctx
+    return multiprocessing.get_context("spawn")
+
+def _get_parse_pool():
+    """파싱 전용 프로세스 풀 (최초 호출 시 생성 후 재사용)"""
+    global _parse_pool
+    if _parse_pool is None:
+        _parse_pool = ProcessPoolExecutor(max_workers=PARSE_WORKERS, mp_context=_parse_pool_context())
+    return _parse_pool
+
+def iter_parsed_resumes(documents: List[tuple], deadline: Deadline = None):
+    """
+    (파일명, 파일 바이트) 목록을 프로세스 풀에서 병렬 파싱하며 입력 순서대로 하나씩 반환.
+    전체가 끝나기를 기다리지 않으므로 스트리밍 응답에서 앞쪽 결과를 바로 쓸 수 있다.
+    deadline 을 넘기면 남은 파싱 작업을 취소하고 RequestTimeout
+    """
+    global _parse_pool
+    deadline = deadline or Deadline(None)
+    if PARSE_WORKERS <= 1 or len(documents) < PARSE_PARALLEL_MIN_FILES:
+        for name, data in documents:
+            deadline.check("파싱")
+            yield parse_single_resume(name, data)
+        return
+
+    # 워커당 최소 4번은 나눠 받도록 청크 크기 결정 (부하 분산)
+    chunksize = max(1, min(PARSE_CHUNKSIZE, math.ceil(len(documents) / (PARSE_WORKERS * 4))))
+    names = [name for name, _ in documents]
+    contents = [data for _, data in documents]
+    done = 0
+    try:
+        # map 의 timeout 은 호출 시점 기준 전체 제한 (초과 시 남은 작업은 취소됨)
+        for parsed in _get_parse_pool().map(parse_single_resume, names, contents, chunksize=chunksize,
+                                            timeout=deadline.remaining()):
+            done += 1
+            yield parsed
+    except TimeoutError:
+        raise RequestTimeout("요청 처리 시간 초과 (파싱)")
+    except BrokenProcessPool as e:
+        print(f"경고: 파싱 프로세스 풀 오류, 남은 {len(documents) - done}개는 순차 처리로 전환합니다. - {e}")
+        _parse_pool = None
+        for name, data in documents[done:]:
+            deadline.check("파싱")
+            yield parse_single_resume(name, data)
+
+def parse_resumes_parallel(documents: List[tuple], deadline: Deadline = None) -> List[Dict[str, str]]:
+    """(파일명, 파일 바이트) 목록을 프로세스 풀에서 병렬 파싱. 결과 순서는 입력 순서와 동일"""
+    return list(iter_parsed_resumes(documents, deadline))
 
-    # 3.2. Secondary Phrases (Degree, Cert)
-    summary = main_phrase.capitalize()
-    
-    if degree and degree != 'N/A':
-        summary += f". Holds a {degree} degree"
-    
-    if certification and certification != 'N/A':
-        summary += f". Holds certifications such as {certification}"
-        
-    # 3.3. Standard Closing
-    summary += ". Skilled in delivering results and adapting to dynamic environments."
+# --------------------------------------------------------------------------
+# --- [2] 통합 실행 함수: 파싱 결과를 AI 모델의 입력으로 연결 ---
 
-    return summary
+# 파싱 결과는 candidate_table.CandidateTable(컬럼 목록)로 정리 (요약 문장은 profile_summary 모듈과 공유)
 
+def prepare_candidates(parsed_results: List[Dict[str, str]]) -> CandidateTable:
+    """파싱 결과 -> 지원자 테이블 (빈 값 정리, 학위 표 헤더 제거, combined_profile 생성)"""
+    return CandidateTable.from_parsed(parsed_results)
+
+def apply_requirements(candidates: CandidateTable, requirements: Requirements):
+    """
+    필수 조건(학위/자격증/기술) 역색인 필터. (조건을 만족하는 행만 남긴 테이블, 행별 키워드 일치율 또는 None) 반환.
+    인코딩 전에 호출해 걸러진 지원자는 인코딩하지 않는다.
+    """
+    if requirements is None or requirements.is_empty() or not len(candidates):
+        return candidates, None
+    index = RequirementIndex(candidates.column('Degree'), candidates.column('Certification'), candidates.skills_rows())
+    rows = index.match(requirements)
+    lexical = index.lexical_scores(requirements.preferred)[rows] if requirements.effective_weight else None
+    return candidates.take(rows), lexical
+
+def score_candidates(job_vector: np.ndarray, vectors: np.ndarray, lexical, requirements: Requirements):
+    """(최종 점수, 의미 유사도) — 키워드 가중치가 있으면 혼합 점수"""
+    semantic = normalize_rows(vectors) @ normalize_rows(job_vector).reshape(-1)
+    weight = requirements.effective_weight if requirements is not None else 0.0
+    return hybrid_scores(semantic, lexical, weight), semantic
+
+def output_records(candidates: CandidateTable, scores, semantic, lexical, rows) -> List[Dict]:
+    """선택된 행 -> API 레코드 (Score 는 최종 점수, 혼합 점수일 때는 구성 점수도 포함)"""
+    records = []
+    for record, row in zip(candidates.records(rows), rows):
+        record = {'Score': float(scores[row]), **record}
+        if lexical is not None:
+            record['Semantic_Score'] = float(semantic[row])
+            record['Lexical_Score'] = float(lexical[row])
+        records.append(record)
+    return records
 
 ## API 요청을 받아 ZIP 파일을 처리하고 파싱, 벡터화, 랭킹까지 통합 실행하는 함수
-def run_integrated_parsing(zip_file_path, new_job_description: str):
-    
-    # 1. ZIP 파일 처리 및 PDF 변환 -> PDF 경로 리스트 획득
-    prepared_files = process_and_convert_resumes(zip_file_path, temp_extract_dir="temp_resumes") 
+def run_integrated_parsing(zip_source, new_job_description: str, top_k: int = None, min_score: float = None,
+                           index_job_id: int = None, deadline: Deadline = None, requirements: Requirements = None):
+    """
+    ZIP 이력서를 파싱/인코딩/랭킹. top_k 가 주어지면 상위 K명만, min_score 가 주어지면
+    해당 점수 이상만 결과에 포함. {"status", "total", "total_files", "duplicates", "data"} 형태로 반환.
+    중복 이력서(바이트 동일 / 텍스트 거의 동일)는 한 번만 파싱/인코딩하고 duplicates 에 합친 파일을 기록.
+    requirements 의 필수 조건을 만족하지 않는 지원자는 인코딩 전에 제외 (filtered_out), 우대 용어가 있으면 혼합 점수.
+    index_job_id(백엔드 AnalysisJob id)가 주어지면 반환된 지원자 벡터를 인덱스에 저장.
+    deadline 을 넘기면 RequestTimeout
+    """
+    deadline = deadline or Deadline(None)
+    encoder = get_encoder()
+
+    # 1. ZIP 파일 처리 -> (파일명, 파일 바이트) 리스트 획득
+    prepared_files = process_and_convert_resumes(zip_source) 
 
     if not prepared_files:
-        return {"status": "ERROR", "message": "처리할 PDF 파일이 없거나 ZIP 파일 처리 실패"}
+        return {"status": "ERROR", "message": "처리할 이력서 파일(PDF/DOCX)이 없거나 ZIP 파일 처리 실패"}
         
-    all_parsed_results = []
-    print(f"\n--- 1. 배치 파싱 시작: 총 {len(prepared_files)}개 파일 ---")
+    # 1-1. 바이트가 같은 파일은 첫 파일만 파싱
+    duplicates = resume_dedup.DuplicateReport()
+    documents = resume_dedup.unique_documents(prepared_files, duplicates) if resume_dedup.DEDUP_ENABLED else prepared_files
+
+    print(f"\n--- 1. 배치 파싱 시작: 총 {len(prepared_files)}개 파일 중 {len(documents)}개 (워커 {PARSE_WORKERS}개) ---")
     
-    # 2. PDF 파일 목록을 순회하며 파싱 실행
-    for file_path in prepared_files:
-        result = parse_single_resume(file_path)
-        all_parsed_results.append(result)
+    # 2. PDF 파일 목록을 프로세스 풀에서 병렬 파싱 (입력 순서 유지)
+    all_parsed_results = parse_resumes_parallel(documents, deadline)
+    # 2-1. 텍스트가 거의 같은 이력서는 먼저 나온 것만 인코딩/랭킹
+    all_parsed_results = resume_dedup.drop_near_duplicates(all_parsed_results, resume_dedup.new_near_index(), duplicates)
+    if len(duplicates):
+        print(f"중복 이력서 {len(duplicates)}개 제외 (지원자 {len(all_parsed_results)}명)")
         
-    # 파싱 결과 DataFrame으로 변환
-    df_parsed = pd.DataFrame(all_parsed_results)
-    
-    df_parsed.fillna('', inplace=True)
-    
-    HEADER_PATTERN = r'Name of University Major Degree GPA'
-    df_parsed['Degree'] = df_parsed['Degree'].str.replace(HEADER_PATTERN, '', regex=True).str.strip()
-
-
-    # 3. AI 모델의 입력 포맷에 맞게 데이터 전처리 (combined_profile 생성)
-    # 요약 문장은 combined_profile 컬럼에 저장
-    df_parsed['combined_profile'] = df_parsed.apply(_create_natural_language_summary, axis=1)
+    # 3. 파싱 결과 정리 및 AI 모델 입력(combined_profile) 생성
+    candidates = prepare_candidates(all_parsed_results)
+    del all_parsed_results
+    total_candidates = len(candidates)
 
+    # 3-1. 필수 조건 역색인 필터 (걸러진 지원자는 인코딩하지 않음)
+    candidates, lexical = apply_requirements(candidates, requirements)
+    if len(candidates) < total_candidates:
+        print(f"필수 조건 필터: {total_candidates}명 중 {len(candidates)}명 통과")
 
     # 4. '새 인재상'과 '파싱된 이력서' 벡터화 및 랭킹    
-    parsed_profiles_list = df_parsed['combined_profile'].tolist()
-    parsed_vectors = model.encode(parsed_profiles_list, show_progress_bar=False, device=device)
-    
-    job_vector = model.encode([new_job_description], show_progress_bar=False, device=device)
-    
-    all_scores = cosine_similarity(job_vector, parsed_vectors)[0]
-    df_parsed['Score'] = all_scores
-    
-    # 5. 최종 정렬 및 JSON 반환
-    df_ranked = df_parsed.sort_values(by='Score', ascending=False).reset_index(drop=True)
-    df_ranked['Rank'] = np.arange(1, len(df_ranked) + 1)
-    
-    # 임시 폴더 삭제 (보안 및 정리)
-    shutil.rmtree("temp_resumes")
+    parsed_profiles_list = candidates.column('combined_profile')
+    # 인재상 + 이력서 요약을 한 번에 인코딩 (캐시에 없는 문장만 실제로 인코딩)
+    deadline.check("인코딩")
+    all_vectors = encode_cached(encoder, [new_job_description] + parsed_profiles_list, embedding_cache,
+                                timeout=deadline.remaining())
+    job_vector = all_vectors[:1]
+    parsed_vectors = all_vectors[1:]
+    print(f"임베딩 캐시 통계: {embedding_cache.stats()} / 인코딩 처리량: {encoder.last_stats}")
+    if parsed_resume_cache is not None:
+        print(f"파싱 캐시 통계: {parsed_resume_cache.stats()}")
     
-    # 최종 결과 필드 선택: 'combined_profile' 컬럼을 'Resume'로 이름을 변경하여 포함
-    final_output_columns = [
-        'Rank', 'Score', 'Name', 'Job Roles', 'Degree', 'Certification', 
-        'Skill_1', 'Skill_2', 'combined_profile' 
-    ]
+    # 5. 정규화 벡터 내적(+ 키워드 일치율)으로 점수 계산 후 상위 K명만 부분 선택/정렬
+    scores, semantic = score_candidates(job_vector, parsed_vectors, lexical, requirements)
+    top_indices, top_scores = rank_scores(scores, top_k=top_k, min_score=min_score)
     
-    # 컬럼 이름을 'combined_profile'에서 'Resume'로 최종 변경하여 백엔드에 반환
-    df_output = df_ranked[final_output_columns].rename(columns={'combined_profile': 'Resume'})
+    # 선택된 지원자 행만 JSON 레코드로 변환 (API 응답 형식)
+    records = output_records(candidates, scores, semantic, lexical, top_indices)
+    ranked_records = [{'Rank': rank, **record} for rank, record in enumerate(records, 1)]
 
-    # JSON 형식으로 변환하여 반환 (API 응답 형식)
-    return df_output.to_dict(orient='records')
+    # 6. 반환된 지원자 벡터를 (작업 id, 순위)와 함께 영구 인덱스에 저장
+    if index_job_id is not None:
+        candidate_index.add(index_job_id, [r['Rank'] for r in ranked_records],
+                            [r['Name'] for r in ranked_records], parsed_vectors[top_indices])
+
+    return {"status": "SUCCESS", "total": total_candidates, "total_files": len(prepared_files),
+            "filtered_out": total_candidates - len(candidates), "duplicates": duplicates.to_list(),
+            "data": ranked_records}
+
+
+def stream_integrated_parsing(documents: List[tuple], new_job_description: str, top_k: int = None,
+                              min_score: float = None, index_job_id: int = None, deadline: Deadline = None,
+                              requirements: Requirements = None):
+    """
+    run_integrated_parsing 의 스트리밍 버전 (NDJSON 한 줄씩 yield).
+      {"type": "start", "total_files": n, "unique_files": u}
+      {"type": "batch", "processed": k, "total_files": u, "candidates": [{"id", "Score", "Name", ...}]}
+      {"type": "result", "status": "SUCCESS", "count", "total_candidates", "filtered_out", "duplicates",
+       "ranking": [{"id", "Rank", "Score"}]}
+    processed 는 파싱이 끝난 (바이트 중복 제외) 파일 수. 유사 중복이나 필수 조건 필터로 빠진 이력서는 candidates 에 없다.
+    지원자 상세는 batch 에서 한 번만 보내고, 마지막 result 에는 최종 순위(id 참조)만 담는다.
+    서버는 벡터와 이름만 유지하므로 메모리가 전체 응답 크기만큼 늘지 않는다.
+    """
+    def line(message):
+        return json.dumps(message, ensure_ascii=False) + "\n"
+
+    deadline = deadline or Deadline(None)
+    duplicates = resume_dedup.DuplicateReport()
+    near_index = resume_dedup.new_near_index()
+    unique = resume_dedup.unique_documents(documents, duplicates) if resume_dedup.DEDUP_ENABLED else documents
+    total_files = len(unique)
+    yield line({"type": "start", "total_files": len(documents), "unique_files": total_files})
+    try:
+        encoder = get_encoder()
+        job_vector = normalize_rows(encode_cached(encoder, [new_job_description], embedding_cache,
+                                                  timeout=deadline.remaining()))
+        vector_batches, score_batches, names = [], [], []
+        processed = 0
+        total_candidates = 0
+
+        def score_batch(parsed_batch):
+            nonlocal processed, total_candidates
+            processed += len(parsed_batch)
+            parsed_batch = resume_dedup.drop_near_duplicates(parsed_batch, near_index, duplicates)
+            total_candidates += len(parsed_batch)
+            # 필수 조건을 만족하는 지원자만 인코딩
+            candidates, lexical = apply_requirements(prepare_candidates(parsed_batch), requirements)
+            if not len(candidates):
+                return line({"type": "batch", "processed": processed, "total_files": total_files, "candidates": []})
+            vectors = encode_cached(encoder, candidates.column('combined_profile'), embedding_cache,
+                                    timeout=deadline.remaining())
+            scores, semantic = score_candidates(job_vector, vectors, lexical, requirements)
+            start = len(names)
+            vector_batches.append(vectors)
+            score_batches.append(scores)
+            names.extend(candidates.column('Name'))
+            records = output_records(candidates, scores, semantic, lexical, range(len(candidates)))
+            candidates = [{'id': start + i, **record} for i, record in enumerate(records)]
+            return line({"type": "batch", "processed": processed, "total_files": total_files, "candidates": candidates})
+
+        batch = []
+        for parsed in iter_parsed_resumes(unique, deadline):
+            batch.append(parsed)
+            if len(batch) >= STREAM_BATCH_SIZE:
+                yield score_batch(batch)
+                batch = []
+        if batch:
+            yield score_batch(batch)
+
+        # 배치별 점수를 모아 최종 순위 결정 (run_integrated_parsing 과 같은 rank_scores)
+        all_vectors = np.concatenate(vector_batches) if vector_batches else np.zeros((0, job_vector.shape[1]), np.float32)
+        all_scores = np.concatenate(score_batches) if score_batches else np.zeros(0, np.float32)
+        top_indices, top_scores = rank_scores(all_scores, top_k=top_k, min_score=min_score)
+        ranking = [{'id': int(i), 'Rank': rank, 'Score': float(score)}
+                   for rank, (i, score) in enumerate(zip(top_indices, top_scores), 1)]
+
+        if index_job_id is not None:
+            candidate_index.add(index_job_id, [r['Rank'] for r in ranking],
+                                [names[r['id']] for r in ranking], all_vectors[top_indices])
+        print(f"임베딩 캐시 통계: {embedding_cache.stats()} / 인코딩 처리량: {encoder.last_stats}")
+
+        yield line({"type": "result", "status": "SUCCESS", "count": len(ranking),
+                    "total_candidates": total_candidates, "filtered_out": total_candidates - len(names),
+                    "duplicates": duplicates.to_list(), "ranking": ranking})
+    except Exception as e:
+        print(f"FATAL ERROR during streaming: {e}")
+        yield line({"type": "error", "status": "FATAL_ERROR", "message": str(e)})
 
 # --------------------------------------------------------------------------
 # --- [3] 백엔드 API 엔드포인트 구현 ---
@@ -293,7 +425,30 @@ def run_integrated_parsing(zip_file_path, new_job_description: str):
 @app.route('/api/v1/screen', methods=['POST'])
 
 def screen_resumes():
-    
+    # 모델 준비 전이면 업로드 본문을 읽기 전에 바로 503 (Retry-After)
+    try:
+        get_encoder()
+    except ModelNotReady as e:
+        return model_not_ready_response(e)
+
+    # 처리 자격 획득 (동시 요청 수 / 대기열). request.files / request.form 에 접근하면 업로드 전체를 받아
+    # 임시 파일에 쓰므로 그 전에 확인해, 포화 상태에서는 본문을 받지 않고 429 또는 503
+    try:
+        ticket = admission.admit()
+    except Overloaded as e:
+        return overloaded_response(e)
+    try:
+        response = _screen_admitted(ticket)
+    except BaseException:
+        ticket.release()
+        raise
+    # 스트리밍 응답(NDJSON)은 응답이 닫힐 때 반납 (call_on_close), 나머지는 여기서 반납 (중복 반납은 무시됨)
+    if not getattr(response, "is_streamed", False):
+        ticket.release()
+    return response
+
+def _screen_admitted(ticket):
+    """처리 자격을 얻은 뒤의 /api/v1/screen 처리 (스트리밍 응답이면 응답이 닫힐 때 자격 반납)"""
     if 'file' not in request.files or 'job_description' not in request.form:
         return jsonify({"status": "ERROR", "message": "필수 입력값(file, job_description)이 누락되었습니다."}), 400
 
@@ -303,16 +458,50 @@ def screen_resumes():
     if zip_file.filename == '':
         return jsonify({"status": "ERROR", "message": "파일 이름이 없습니다."}), 400
         
-    # 전송된 ZIP 파일을 VM의 UPLOAD_FOLDER에 임시 저장
+    # 업로드된 ZIP은 디스크에 따로 저장하지 않고 요청 스트림에서 바로 읽음 (요청별 격리)
     filename = secure_filename(zip_file.filename)
-    zip_file_path = os.path.join(UPLOAD_FOLDER, filename)
-    zip_file.save(zip_file_path)
     
     print(f"\n--- API 요청 수신: {filename} 처리 시작 ---")
     
+    # 선택 입력: 상위 K명만 반환 / 최소 점수
+    try:
+        top_k = int(request.form.get('top_k') or 0) or None
+        min_score = float(request.form['min_score']) if request.form.get('min_score') else None
+        index_job_id = int(request.form['job_id']) if request.form.get('job_id') else None
+        # 선택 입력: 필수 조건(required_degree / required_certifications / required_skills)과 우대 용어(preferred_terms)
+        requirements = Requirements.from_form(request.form)
+    except ValueError:
+        return jsonify({"status": "ERROR", "message": "top_k, min_score, job_id, lexical_weight 값이 올바르지 않습니다."}), 400
+    
+    # 처리 중 파일 수 제한 (ZIP 중앙 디렉터리로 개수만 확인). 초과 상태가 풀리지 않으면 503
+    try:
+        ticket.add_files(count_resume_files(zip_file.stream))
+    except Overloaded as e:
+        return overloaded_response(e)
+    deadline = Deadline(AI_REQUEST_TIMEOUT)
+
+    # stream=1 이면 NDJSON 으로 배치 단위 결과를 바로 내보냄 (첫 결과까지 대기 시간 단축)
+    if request.form.get('stream', '').lower() in ('1', 'true'):
+        documents = process_and_convert_resumes(zip_file.stream)
+        if not documents:
+            return jsonify({"status": "ERROR", "message": "처리할 이력서 파일(PDF/DOCX)이 없거나 ZIP 파일 처리 실패"}), 400
+
+        response = Response(stream_integrated_parsing(documents, new_job_description, top_k=top_k, min_score=min_score,
+                                                      index_job_id=index_job_id, deadline=deadline,
+                                                      requirements=requirements),
+                            mimetype='application/x-ndjson')
+        # 스트림이 끝나거나 클라이언트 연결이 끊겨 응답이 닫힐 때 자격 반납
+        response.call_on_close(ticket.release)
+        return response
+
     try:
         # 통합 파싱 및 선별 로직 실행
-        ranked_results = run_integrated_parsing(zip_file_path, new_job_description)
+        result = run_integrated_parsing(zip_file.stream, new_job_description, top_k=top_k, min_score=min_score,
+                                        index_job_id=index_job_id, deadline=deadline, requirements=requirements)
+        ticket.release()
+        if result["status"] != "SUCCESS":
+            return jsonify(result), 400
+        ranked_results = result["data"]
         
         # [JSON 출력 확인 코드]
         import json
@@ -327,22 +516,77 @@ def screen_resumes():
         return jsonify({
             "status": "SUCCESS",
             "count": len(ranked_results),
+            "total_candidates": result["total"],
+            "total_files": result["total_files"],
+            "filtered_out": result["filtered_out"],
+            "requirements": requirements.to_dict(),
+            "duplicates": result["duplicates"],
             "data": ranked_results
         }), 200
 
+    except RequestTimeout as e:
+        print(f"TIMEOUT during processing: {e}")
+        return jsonify({"status": "TIMEOUT", "message": str(e)}), 504
     except Exception as e:
-        if os.path.exists(zip_file_path):
-            os.remove(zip_file_path)
-        shutil.rmtree("temp_resumes", ignore_errors=True)
         print(f"FATAL ERROR during processing: {e}")
         return jsonify({"status": "FATAL_ERROR", "message": str(e)}), 500
 
-    finally:
-        # 처리 완료 후 임시 저장된 ZIP 파일 삭제
-        if os.path.exists(zip_file_path):
-            os.remove(zip_file_path)
+# 과거 분석 작업의 지원자를 새 인재상으로 검색 (재업로드/재인코딩 없음)
+@app.route('/api/v1/search', methods=['POST'])
+def search_candidates():
+    payload = request.get_json(silent=True) or request.form
+    query = payload.get('job_description')
+    if not query:
+        return jsonify({"status": "ERROR", "message": "필수 입력값(job_description)이 누락되었습니다."}), 400
+
+    try:
+        top_k = int(payload.get('top_k') or 20)
+        job_ids = payload.get('job_ids')
+        if isinstance(job_ids, str):
+            job_ids = [int(j) for j in job_ids.split(',') if j.strip()]
+        elif job_ids is not None:
+            job_ids = [int(j) for j in job_ids]
+    except (TypeError, ValueError):
+        return jsonify({"status": "ERROR", "message": "top_k, job_ids 값이 올바르지 않습니다."}), 400
+
+    try:
+        encoder = get_encoder()
+    except ModelNotReady as e:
+        return model_not_ready_response(e)
+
+    try:
+        query_vector = encode_cached(encoder, [query], embedding_cache, timeout=AI_REQUEST_TIMEOUT)
+    except TimeoutError as e:
+        return jsonify({"status": "TIMEOUT", "message": str(e)}), 504
+    hits = candidate_index.search(query_vector, top_k=top_k, job_ids=job_ids)
+    return jsonify({"status": "SUCCESS", "count": len(hits), "indexed": len(candidate_index), "data": hits}), 200
+
+# 백엔드에서 분석 작업을 삭제하면 해당 작업의 지원자 벡터를 검색 대상에서 제외
+@app.route('/api/v1/index/jobs/<int:job_id>', methods=['DELETE'])
+def delete_indexed_job(job_id):
+    removed = candidate_index.remove_job(job_id)
+    return jsonify({"status": "SUCCESS", "job_id": job_id, "removed": removed}), 200
+
+# 생존 확인 (모델 로드 여부와 무관하게 프로세스가 떠 있으면 200)
+@app.route('/api/v1/health', methods=['GET'])
+def health():
+    return jsonify({"status": "OK"}), 200
+
+# 준비 상태 확인 (모델 로드 + 워밍업 완료 시 200, 그 전에는 503). 로드 밸런서 readiness probe 용
+@app.route('/api/v1/ready', methods=['GET'])
+def ready():
+    body = {"status": "READY" if model_loader.ready else "NOT_READY", "model": model_loader.status(),
+            "startup": STARTUP_TIMINGS, "admission": admission.stats()}
+    if _batch_encoder is not None:
+        body["micro_batch"] = _batch_encoder.stats()
+    if model_loader.ready:
+        return jsonify(body), 200
+    response = jsonify(body)
+    response.headers["Retry-After"] = str(MODEL_RETRY_AFTER)
+    return response, 503
 
 # --------------------------------------------------------------------------
 # --- [4] 서버 실행 ---
+# 개발용 Flask 서버. 운영 환경에서는 serve_ai.py (gunicorn pre-fork + 스레드 워커) 로 실행
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=5000)
\ No newline at end of file
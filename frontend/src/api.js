@@ -78,10 +78,21 @@ export const registerUser = async (email, username, password) => {
   return response.data;
 };
 
+// 목록 API는 한 페이지씩 반환하고 다음 페이지 커서를 X-Next-Cursor 헤더로 줌 -> 커서가 없을 때까지 이어서 조회
+const fetchAllPages = async (url, params = {}) => {
+  const items = [];
+  let cursor = null;
+  do {
+    const response = await apiClient.get(url, { params: cursor ? { ...params, cursor } : params });
+    items.push(...response.data);
+    cursor = response.headers["x-next-cursor"];
+  } while (cursor);
+  return items;
+};
+
 // 4. 분석 결과 조회 등 나머지 함수는 그대로 유지
 export const fetchAnalysisResults = async (jobId) => {
-  const response = await apiClient.get(`api/analysis/${jobId}/applicants`);
-  return response.data; 
+  return fetchAllPages(`api/analysis/${jobId}/applicants`, { limit: 500 });
 };
 
 export const fetchApplicantDetail = async (applicantId) => {
@@ -90,8 +101,7 @@ export const fetchApplicantDetail = async (applicantId) => {
 };
 
 export const fetchHistoryList = async () => {
-  const response = await apiClient.get("/api/analysis/history/all");
-  return response.data;
+  return fetchAllPages("/api/analysis/history/all", { limit: 100 });
 };
 
 export const fetchAnalysisJob = async (jobId) => {
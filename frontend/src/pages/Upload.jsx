@@ -4,7 +4,7 @@ import { useDropzone } from "react-dropzone";
 import Header from "../components/Header";
 import { PlusIcon, FileIcon, XIcon } from "../components/IconSet";
 import { useNavigate } from "react-router-dom";
-import { predictAI } from "../api";
+import { predictAI, fetchAnalysisJob } from "../api";
 import certificationsData from "../assets/data/certification.json"; 
 
 const SelectBox = ({ label, value, onChange, options }) => (
@@ -61,16 +61,27 @@ const handleAnalysisStart = async () => {
 
   try {
     // 예: criteria(채용 기준) 텍스트를 AI 서버에 보내서 예측
-    const aiResult = await predictAI(uploadedFiles[0], criteria, job, degree, license, (percent) => setProgress(percent));
-    // --- 여기 오면 업로드 및 분석 완료 ---
-    setProgress(100); // 강제로 100% 채우기    
-    console.log("AI 결과:", aiResult.result);
+    // 업로드 진행률은 0~50%, 서버 분석 진행률은 50~100%로 표시
+    const aiResult = await predictAI(uploadedFiles[0], criteria, job, degree, license, (percent) => setProgress(Math.round(percent / 2)));
+    // --- 여기 오면 업로드 완료 (서버는 PENDING 작업을 바로 반환) ---
 
     // ★ [추가] 방금 만든 Job ID를 로컬 스토리지에 저장!
     if (aiResult && aiResult.id) {
         console.log("생성된 Job ID:", aiResult.id);
         localStorage.setItem("latestJobId", aiResult.id);
     }
+
+    // 백그라운드 분석이 끝날 때까지 작업 상태 폴링
+    let jobInfo = aiResult;
+    while (jobInfo && jobInfo.status !== "COMPLETED" && jobInfo.status !== "FAILED") {
+      await new Promise((resolve) => setTimeout(resolve, 2000));
+      jobInfo = await fetchAnalysisJob(aiResult.id);
+      setProgress(Math.min(99, 50 + Math.round((jobInfo.progress || 0) / 2)));
+    }
+    if (!jobInfo || jobInfo.status === "FAILED") {
+      throw new Error("분석 작업 실패");
+    }
+    setProgress(100); // 강제로 100% 채우기
     
     // 약간의 딜레이 후 이동 (100%를 눈으로 볼 시간을 줌)
     setTimeout(() => {
@@ -238,9 +249,9 @@ const handleAnalysisStart = async () => {
                         }`}
                         >
             {isAnalyzing
-              ? (progress < 99 
+              ? (progress < 50 
                   ? `파일 업로드 중입니다... ${progress}%` 
-                  : "AI가 열심히 이력서를 분석하고 있습니다...")
+                  : `AI가 열심히 이력서를 분석하고 있습니다... ${progress}%`)
               : "분석 시작하기"}
           </button>
         </div>
@@ -0,0 +1,148 @@
+# 파싱 결과 캐시 (파일 내용 SHA-256 + 파서 버전 기반)
+# 같은 이력서 PDF가 여러 ZIP에 반복 업로드되므로, 텍스트 추출/정규식 파싱 결과를
+# 로컬 SQLite 파일에 저장해 두고 재사용한다.
+# - 병렬 파싱 워커 프로세스들이 같은 파일을 공유 (프로세스/스레드별 연결)
+# - 전체 용량 상한을 넘으면 가장 오래 사용하지 않은 항목부터 삭제
+#   (전체 크기/항목 수는 counters 테이블에 누적해 두어 저장할 때 테이블을 훑지 않음)
+# - 적중/미스 횟수는 프로세스 안에서 모았다가 DB에 한꺼번에 누적 (워커 프로세스 합산, 조회 시마다 쓰지 않음)
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+COUNTER_FLUSH_OPS = 64        # 적중/미스 횟수를 DB에 반영하는 조회 횟수 단위
+COUNTER_FLUSH_SECONDS = 5.0   # 또는 마지막 반영 후 이 시간이 지나면 반영
+TOUCH_INTERVAL_SECONDS = 60.0  # 최근 사용 시각(last_access)은 이 시간보다 오래된 경우에만 갱신
+
+
+def make_key(data: bytes, parser_version: str) -> str:
+    """캐시 키: sha256(파일 바이트) + 파서 버전"""
+    return f"{hashlib.sha256(data).hexdigest()}:{parser_version}"
+
+
+class ParseCache:
+    """크기 제한이 있는 SQLite 기반 파싱 결과 캐시 (여러 스레드/프로세스에서 사용 가능)"""
+
+    def __init__(self, db_path: str, max_bytes: int = 512 * 1024 * 1024):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        # sqlite3 연결은 만든 스레드에서만 쓸 수 있으므로 스레드별로 연결 (fork 된 프로세스는 PID 로 구분)
+        self._local = threading.local()
+        self._counter_lock = threading.Lock()
+        self._pending = {"hits": 0, "misses": 0}
+        self._pending_pid = os.getpid()
+        self._last_flush = time.monotonic()
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._init_schema()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _init_schema(self):
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS parsed ("
+            " key TEXT PRIMARY KEY, data TEXT NOT NULL, size INTEGER NOT NULL, last_access REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_parsed_last_access ON parsed (last_access)")
+        conn.execute("CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        conn.execute("INSERT OR IGNORE INTO counters VALUES ('hits', 0), ('misses', 0)")
+        # 이전 버전 DB 는 크기/항목 수 누적값이 없으므로 한 번만 계산해 채움
+        conn.execute("INSERT OR IGNORE INTO counters SELECT 'bytes', COALESCE(SUM(size), 0) FROM parsed")
+        conn.execute("INSERT OR IGNORE INTO counters SELECT 'items', COUNT(*) FROM parsed")
+
+    def get(self, key: str) -> Optional[Dict[str, str]]:
+        conn = self._conn()
+        row = conn.execute("SELECT data, last_access FROM parsed WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self._count("misses")
+            return None
+        now = time.time()
+        if now - row[1] >= TOUCH_INTERVAL_SECONDS:
+            conn.execute("UPDATE parsed SET last_access = ? WHERE key = ?", (now, key))
+        self._count("hits")
+        return json.loads(row[0])
+
+    def put(self, key: str, parsed: Dict[str, str]):
+        data = json.dumps(parsed, ensure_ascii=False)
+        size = len(data.encode("utf-8"))
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            old = conn.execute("SELECT size FROM parsed WHERE key = ?", (key,)).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO parsed (key, data, size, last_access) VALUES (?, ?, ?, ?)",
+                (key, data, size, time.time()),
+            )
+            self._add_counter(conn, "bytes", size - (old[0] if old else 0))
+            if old is None:
+                self._add_counter(conn, "items", 1)
+            self._evict(conn)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    @staticmethod
+    def _add_counter(conn: sqlite3.Connection, name: str, delta: int):
+        if delta:
+            conn.execute("UPDATE counters SET value = value + ? WHERE name = ?", (delta, name))
+
+    def _evict(self, conn: sqlite3.Connection):
+        """용량 상한 초과 시 LRU 순서로 삭제 (put 의 트랜잭션 안에서 호출)"""
+        total = conn.execute("SELECT value FROM counters WHERE name = 'bytes'").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        excess = total - self.max_bytes
+        freed = 0
+        victims = []
+        for key, size in conn.execute("SELECT key, size FROM parsed ORDER BY last_access"):
+            victims.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        conn.executemany("DELETE FROM parsed WHERE key = ?", victims)
+        self._add_counter(conn, "bytes", -freed)
+        self._add_counter(conn, "items", -len(victims))
+
+    def _count(self, name: str):
+        with self._counter_lock:
+            if self._pending_pid != os.getpid():
+                # fork 직후: 부모 프로세스가 모아 둔 횟수는 부모가 반영하므로 버림
+                self._pending = {"hits": 0, "misses": 0}
+                self._pending_pid = os.getpid()
+            self._pending[name] += 1
+            due = (sum(self._pending.values()) >= COUNTER_FLUSH_OPS
+                   or time.monotonic() - self._last_flush >= COUNTER_FLUSH_SECONDS)
+        if due:
+            self.flush_counters()
+
+    def flush_counters(self):
+        """모아 둔 적중/미스 횟수를 DB에 반영"""
+        with self._counter_lock:
+            if self._pending_pid != os.getpid():
+                self._pending = {"hits": 0, "misses": 0}
+                self._pending_pid = os.getpid()
+            pending, self._pending = self._pending, {"hits": 0, "misses": 0}
+            self._last_flush = time.monotonic()
+        if not any(pending.values()):
+            return
+        conn = self._conn()
+        conn.executemany("UPDATE counters SET value = value + ? WHERE name = ?",
+                         [(count, name) for name, count in pending.items() if count])
+
+    def stats(self) -> Dict[str, int]:
+        self.flush_counters()
+        counters = dict(self._conn().execute("SELECT name, value FROM counters").fetchall())
+        return {"hits": counters.get("hits", 0), "misses": counters.get("misses", 0),
+                "items": counters.get("items", 0), "bytes": counters.get("bytes", 0)}
@@ -0,0 +1,143 @@
+# 필드 추출기 회귀 검증 스크립트
+# field_extractor (단일 스캔) 결과가 기존 순차 정규식 파서와 완전히 같은지 확인한다.
+#   python parser_regression.py                 # 고정 코퍼스 + 무작위 1000건
+#   python parser_regression.py --fuzz 20000    # 무작위 케이스 수 지정
+#   python parser_regression.py --regenerate    # 기존 파서 기준으로 코퍼스 기대값 재생성
+# 무거운 의존성(pypdf, torch 등) 없이 실행되도록 final_ai_server 는 import 하지 않는다.
+import argparse
+import json
+import os
+import random
+import re
+import sys
+
+import field_extractor
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "parser_regression_corpus.json")
+
+
+# --------------------------------------------------------------------------
+# --- 기존 파서 (기준 구현, 변경 금지) ---
+
+def legacy_safe_extract_sequential(text, start_label, stop_label=r'[A-Za-z]+:\s*|\s*degree|\s*Skills|\s*Certification|\s*$'):
+    pattern = rf'{start_label}\s*(.+?)\s*{stop_label}'
+    match = re.search(pattern, text, re.DOTALL | re.IGNORECASE)
+    if match:
+        return match.group(1).strip()
+    return "N/A"
+
+def legacy_extract_skills(text):
+    pattern = r'Skills\s*(.+?)\s*Certification'
+    match = re.search(pattern, text, re.DOTALL | re.IGNORECASE)
+    if match:
+        raw_skills_text = match.group(1).strip()
+        skills_list = [
+            s.strip() for s in raw_skills_text.split()
+            if s.strip() and
+            s.strip() not in ['Institution', 'Date', 'Roel', 'Skills']
+        ]
+        return skills_list[:5]
+    return []
+
+def legacy_extract_certification(text):
+    pattern = r'Certification\s*(.+)'
+    match = re.search(pattern, text, re.DOTALL | re.IGNORECASE)
+    if match:
+        raw_cert_text = match.group(1).strip()
+        cert = re.sub(r'Name\s*Date\s*Institution\s*', '', raw_cert_text, flags=re.IGNORECASE).strip()
+        return cert
+    return "N/A"
+
+def legacy_parse(extracted_text):
+    cleaned_text = re.sub(r'[\x00-\x1F\x7F]', '', extracted_text)
+    typo_map = {
+        'Pyhon': 'Python',
+        'Cybersecuruty': 'Cybersecurity',
+        'Analystt': 'Analyst',
+        'Bachlor': 'Bachelor',
+        'Masteer': 'Master',
+        'Certificaton': 'Certification',
+    }
+    for typo, correct in typo_map.items():
+        cleaned_text = re.sub(typo, correct, cleaned_text, flags=re.IGNORECASE)
+    cleaned_text = re.sub(r'\s{2,}', ' ', cleaned_text).strip()
+    return {
+        "Name": legacy_safe_extract_sequential(cleaned_text, r'Name', r'Age'),
+        "Age": legacy_safe_extract_sequential(cleaned_text, r'Age', r'Gender'),
+        "Gender": legacy_safe_extract_sequential(cleaned_text, r'Gender', r'Job roles'),
+        "Job Roles": legacy_safe_extract_sequential(cleaned_text, r'Job roles', r'Level'),
+        "Level": legacy_safe_extract_sequential(cleaned_text, r'Level', r'Degree'),
+        "Degree": legacy_safe_extract_sequential(cleaned_text, r'Degree', r'Skills'),
+        "Skills": legacy_extract_skills(cleaned_text),
+        "Certification": legacy_extract_certification(cleaned_text),
+    }
+
+
+def current_parse(extracted_text):
+    return field_extractor.extract_fields(field_extractor.clean_text(extracted_text))
+
+
+# --------------------------------------------------------------------------
+# --- 무작위 케이스 생성 ---
+
+_TOKENS = [
+    "Name", "name", "NAME", "Age", "age", "Gender", "Job roles", "job Roles", "Job", "roles",
+    "Level", "level", "levelevel", "Degree", "degree", "Skills", "skills", "Skillskills",
+    "Certification", "Certificaton", "certification", "Pyhon", "pYHON", "Analystt", "Bachlor",
+    "Masteer", "Cybersecuruty", "Institution", "Date", "Roel", "Language", "Page", "Username",
+    "Name of University Major Degree GPA", "Name Date Institution", "N/A", "Kim", "Lee", "27",
+    "Male", "Female", "Senior", "Junior", "Python", "SQL", "Java", "AWS", "정보처리기사", "홍길동",
+    "ſkills", "Kim", ":", "-", ".",
+]
+_SEPARATORS = [" ", "  ", "\n", "\n\n", "\t", "", "   \n  ", "\x0c", "\x00", "\x7f", " ", "　", "\x85"]
+
+
+def random_text(rng):
+    parts = []
+    for _ in range(rng.randint(0, 40)):
+        parts.append(rng.choice(_TOKENS))
+        parts.append(rng.choice(_SEPARATORS))
+    return "".join(parts)
+
+
+# --------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--fuzz", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--regenerate", action="store_true")
+    args = parser.parse_args()
+
+    with open(CORPUS_PATH, "r", encoding="utf-8") as f:
+        corpus = json.load(f)
+
+    if args.regenerate:
+        for case in corpus:
+            case["expected"] = legacy_parse(case["text"])
+        with open(CORPUS_PATH, "w", encoding="utf-8") as f:
+            json.dump(corpus, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(f"코퍼스 기대값 재생성: {len(corpus)}건")
+
+    failures = 0
+    for case in corpus:
+        for label, result in (("legacy", legacy_parse(case["text"])), ("current", current_parse(case["text"]))):
+            if result != case["expected"]:
+                failures += 1
+                print(f"[불일치] corpus:{case['id']} ({label})\n  expected={case['expected']}\n  actual  ={result}")
+
+    rng = random.Random(args.seed)
+    for i in range(args.fuzz):
+        text = random_text(rng)
+        expected, actual = legacy_parse(text), current_parse(text)
+        if expected != actual:
+            failures += 1
+            print(f"[불일치] fuzz:{i} text={text!r}\n  expected={expected}\n  actual  ={actual}")
+
+    print(f"코퍼스 {len(corpus)}건, 무작위 {args.fuzz}건 검사 - 불일치 {failures}건")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+# 지원자 요약 문장 생성 (AI 모델 입력용 combined_profile)
+from typing import List, Sequence
+
+SKILL_FIELDS = [f'Skill_{i+1}' for i in range(5)]
+CLOSING = ". Skilled in delivering results and adapting to dynamic environments."
+
+
+def create_natural_language_summary(row):
+    """
+    각 지원자의 파싱된 정보(dict)를 기반으로
+    'Proficient in...' 형태의 자연어 요약 문장을 생성
+    """
+    return _summary([row[field] for field in SKILL_FIELDS], row['Level'], row['Degree'], row['Certification'])
+
+
+def create_summaries(skills_rows: Sequence[Sequence[str]], levels: Sequence[str], degrees: Sequence[str],
+                     certifications: Sequence[str]) -> List[str]:
+    """컬럼 단위 입력으로 요약 문장 목록 생성 (행마다 dict/Series 를 만들지 않음, 결과는 create_natural_language_summary 와 동일)"""
+    return [_summary(skills, level, degree, certification)
+            for skills, level, degree, certification in zip(skills_rows, levels, degrees, certifications)]
+
+
+def _summary(skills, level, degree, certification) -> str:
+    # 1. Skills 조합
+    skills_str = ', '.join(skill for skill in skills if skill)
+    
+    # 2. 문장 구성
+    
+    # 2.1. Main Phrase (Skills + Level)
+    main_phrase = f"Proficient in {skills_str}" if skills_str else "Proficient in unspecified skills"
+    
+    if level and level != 'N/A':
+        main_phrase += f", with {level}-level experience in the field"
+    else:
+        main_phrase += ", with unspecified experience in the field"
+
+    # 2.2. Secondary Phrases (Degree, Cert)
+    summary = main_phrase.capitalize()
+    
+    if degree and degree != 'N/A':
+        summary += f". Holds a {degree} degree"
+    
+    if certification and certification != 'N/A':
+        summary += f". Holds certifications such as {certification}"
+        
+    # 2.3. Standard Closing
+    return summary + CLOSING
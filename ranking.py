@@ -0,0 +1,42 @@
+# 지원자 랭킹 (정규화 임베딩 내적 + 부분 선택)
+# 전체 코사인 행렬/전체 정렬 대신, 상위 K명만 argpartition 으로 골라 정렬한다.
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """L2 정규화 (내적 = 코사인 유사도). 0 벡터는 그대로 둔다"""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def rank_top_k(job_vector: np.ndarray, candidate_vectors: np.ndarray,
+               top_k: Optional[int] = None, min_score: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    인재상 벡터와 지원자 벡터들의 코사인 점수로 상위 K명 선택.
+    (점수 내림차순 인덱스, 해당 점수) 반환. top_k 가 없거나 0이면 전체.
+    """
+    scores = normalize_rows(candidate_vectors) @ normalize_rows(job_vector).reshape(-1)
+    return rank_scores(scores, top_k=top_k, min_score=min_score)
+
+
+def rank_scores(scores: np.ndarray, top_k: Optional[int] = None,
+                min_score: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """이미 계산된 점수(예: 키워드 + 의미 혼합 점수)로 상위 K명 선택. 반환 형식은 rank_top_k 와 같음"""
+    scores = np.asarray(scores, dtype=np.float32)
+    candidates = np.arange(len(scores))
+
+    # 최소 점수 미만은 먼저 제외
+    if min_score is not None:
+        candidates = candidates[scores >= min_score]
+
+    if top_k and top_k < len(candidates):
+        # 상위 K개만 부분 선택 (O(n)), 선택된 K개만 정렬
+        part = np.argpartition(-scores[candidates], top_k - 1)[:top_k]
+        candidates = candidates[part]
+
+    order = candidates[np.argsort(-scores[candidates], kind="stable")]
+    return order, scores[order]
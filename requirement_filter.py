@@ -0,0 +1,180 @@
+# 필수 조건 사전 필터 (학위 / 자격증 / 기술) + 키워드·의미 혼합 점수
+# 파싱된 지원자 필드(Degree, Certification, Skill_1..5)로 메모리 역색인(토큰 -> 지원자 번호 집합)을 만들고,
+# 필수 조건을 만족하지 않는 지원자는 인코딩 전에 제외한다 (필수 조건에 대부분 걸러지면 인코딩 자체를 생략).
+# 남은 지원자 점수:
+#   Score = (1 - w) * 의미 유사도(코사인) + w * 키워드 일치율(우대 용어 중 이력서에 있는 비율)
+# 우대 용어가 없거나 가중치가 0(기본값)이면 의미 유사도만 사용한다 (기존 점수와 동일).
+import math
+import os
+import re
+from typing import Dict, Iterable, List, Optional, Set
+
+import numpy as np
+
+# 키워드 일치율 기본 가중치 w. 0 이면 요청에서 lexical_weight 를 줄 때만 혼합 점수 (Score = 코사인 유사도 유지)
+HYBRID_LEXICAL_WEIGHT = float(os.getenv("HYBRID_LEXICAL_WEIGHT", "0"))
+MAX_TERM_TOKENS = 3   # 우대 용어로 인정할 최대 단어 수 (긴 문장은 키워드로 보지 않음)
+
+# 학위 수준: 요구 학위 이상이면 통과 (Bachelor 요구 -> Master, PhD 도 통과)
+DEGREE_LEVELS = {
+    "associate": 1, "전문학사": 1,
+    "bachelor": 2, "bachelors": 2, "학사": 2,
+    "master": 3, "masters": 3, "석사": 3,
+    "phd": 4, "doctor": 4, "doctorate": 4, "박사": 4,
+}
+# 조건 없음으로 취급하는 값
+_ANY_VALUES = {"", "n/a", "none", "any", "무관", "상관없음"}
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+_TERM_SEPARATORS = re.compile(r"[,\n/;|·]+")
+
+FIELDS = ("degree", "certification", "skills")
+
+
+def tokenize(text) -> List[str]:
+    return _TOKEN_PATTERN.findall(str(text or "").lower())
+
+
+def _degree_tokens(text) -> List[str]:
+    # "Ph.D." -> "phd"
+    return tokenize(str(text or "").replace(".", ""))
+
+
+def split_terms(text: str, max_tokens: Optional[int] = None) -> List[str]:
+    """쉼표/줄바꿈/슬래시로 나눈 용어 목록 (중복/빈 값 제거). max_tokens 보다 긴 항목은 제외"""
+    terms = []
+    for item in _TERM_SEPARATORS.split(text or ""):
+        item = item.strip()
+        if item.lower() in _ANY_VALUES or item in terms:
+            continue
+        if max_tokens is not None and len(tokenize(item)) > max_tokens:
+            continue
+        if tokenize(item):
+            terms.append(item)
+    return terms
+
+
+class Requirements:
+    """
+    요청별 조건.
+      degree         : 최소 학위 (DEGREE_LEVELS 에 없는 값이면 Degree 필드에 해당 단어가 모두 있어야 함)
+      certifications : 모두 보유해야 하는 자격증
+      skills         : 모두 보유해야 하는 기술 (Skill_1..5)
+      preferred      : 우대 용어 (학위/자격증/기술 어디든 있으면 일치), 키워드 점수에만 사용
+    """
+
+    def __init__(self, degree: str = "", certifications: Iterable[str] = (), skills: Iterable[str] = (),
+                 preferred: Iterable[str] = (), lexical_weight: float = HYBRID_LEXICAL_WEIGHT):
+        self.degree = "" if (degree or "").strip().lower() in _ANY_VALUES else degree.strip()
+        self.certifications = list(certifications)
+        self.skills = list(skills)
+        self.preferred = list(preferred)
+        if not math.isfinite(lexical_weight) or not 0.0 <= lexical_weight <= 1.0:
+            raise ValueError(f"lexical_weight 는 0~1 사이 값이어야 합니다: {lexical_weight}")
+        self.lexical_weight = lexical_weight
+
+    @classmethod
+    def from_form(cls, form) -> "Requirements":
+        """요청 폼(required_degree, required_certifications, required_skills, preferred_terms, lexical_weight)에서 생성"""
+        weight = form.get("lexical_weight")
+        return cls(
+            degree=form.get("required_degree", ""),
+            certifications=split_terms(form.get("required_certifications", "")),
+            skills=split_terms(form.get("required_skills", "")),
+            preferred=split_terms(form.get("preferred_terms", ""), max_tokens=MAX_TERM_TOKENS),
+            lexical_weight=float(weight) if weight not in (None, "") else HYBRID_LEXICAL_WEIGHT,
+        )
+
+    @property
+    def has_filters(self) -> bool:
+        return bool(self.degree or self.certifications or self.skills)
+
+    @property
+    def effective_weight(self) -> float:
+        return self.lexical_weight if self.preferred else 0.0
+
+    def is_empty(self) -> bool:
+        return not self.has_filters and not self.effective_weight
+
+    def to_dict(self) -> Dict:
+        return {"degree": self.degree, "certifications": self.certifications, "skills": self.skills,
+                "preferred": self.preferred, "lexical_weight": self.effective_weight}
+
+
+class RequirementIndex:
+    """지원자 목록(행 번호 0..n-1)에 대한 필드별 역색인: field -> token -> {행 번호}"""
+
+    def __init__(self, degrees: List[str], certifications: List[str], skills: List[List[str]]):
+        self.size = len(degrees)
+        self._postings: Dict[str, Dict[str, Set[int]]] = {field: {} for field in FIELDS}
+        for row, (degree, certification, row_skills) in enumerate(zip(degrees, certifications, skills)):
+            self._add("degree", row, _degree_tokens(degree))
+            self._add("certification", row, tokenize(certification))
+            self._add("skills", row, [token for skill in row_skills for token in tokenize(skill)])
+
+    def _add(self, field: str, row: int, tokens: List[str]):
+        postings = self._postings[field]
+        for token in tokens:
+            postings.setdefault(token, set()).add(row)
+
+    def _phrase(self, field: str, term: str, tokens: List[str] = None) -> Set[int]:
+        """용어의 단어가 모두 해당 필드에 있는 행"""
+        tokens = tokens if tokens is not None else tokenize(term)
+        postings = self._postings[field]
+        rows = None
+        for token in tokens:
+            rows = set(postings.get(token, ())) if rows is None else rows & postings.get(token, set())
+            if not rows:
+                return set()
+        return rows or set()
+
+    def _degree_rows(self, degree: str) -> Set[int]:
+        tokens = _degree_tokens(degree)
+        levels = [DEGREE_LEVELS[t] for t in tokens if t in DEGREE_LEVELS]
+        if not levels:
+            return self._phrase("degree", degree, tokens)
+        required = min(levels)
+        rows = set()
+        for token, level in DEGREE_LEVELS.items():
+            if level >= required:
+                rows |= self._postings["degree"].get(token, set())
+        return rows
+
+    def match(self, requirements: Requirements) -> np.ndarray:
+        """필수 조건을 모두 만족하는 행 번호 (오름차순). 조건이 없으면 전체"""
+        rows: Optional[Set[int]] = None
+
+        def narrow(found: Set[int]):
+            nonlocal rows
+            rows = found if rows is None else rows & found
+
+        if requirements.degree:
+            narrow(self._degree_rows(requirements.degree))
+        for certification in requirements.certifications:
+            narrow(self._phrase("certification", certification))
+        for skill in requirements.skills:
+            narrow(self._phrase("skills", skill))
+        if rows is None:
+            return np.arange(self.size)
+        return np.array(sorted(rows), dtype=np.int64)
+
+    def lexical_scores(self, terms: List[str]) -> np.ndarray:
+        """행별 우대 용어 일치율 (0~1)"""
+        counts = np.zeros(self.size, dtype=np.float32)
+        if not terms:
+            return counts
+        for term in terms:
+            tokens = tokenize(term)
+            found = set()
+            for field in FIELDS:
+                found |= self._phrase(field, term, _degree_tokens(term) if field == "degree" else tokens)
+            if found:
+                counts[list(found)] += 1
+        return counts / len(terms)
+
+
+def hybrid_scores(semantic: np.ndarray, lexical: Optional[np.ndarray], weight: float) -> np.ndarray:
+    """(1 - w) * 의미 유사도 + w * 키워드 일치율"""
+    if lexical is None or weight <= 0:
+        return semantic
+    return (1.0 - weight) * semantic + weight * lexical
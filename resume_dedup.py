@@ -0,0 +1,208 @@
+# 중복 이력서 제거 (파싱/인코딩 전)
+# 같은 ZIP 안에 같은 지원자가 여러 번 들어 있는 경우가 많다 (재내보내기, `이름 (1).pdf`, 같은 이력서의 DOCX + PDF).
+#  1) 완전 중복: 파일 바이트 SHA-256 이 같으면 첫 파일만 파싱
+#  2) 유사 중복: 추출 텍스트의 단어 n-gram(shingle) MinHash 서명(파싱 워커에서 계산, 원문은 보관하지 않음)을 LSH 밴드로 후보를 찾고,
+#     추정 Jaccard 유사도가 임계값 이상이고 파싱된 지원자 이름도 같으면 먼저 나온 이력서로 합침 (인코딩/랭킹 대상에서 제외)
+#     (같은 양식으로 만든 다른 지원자의 이력서는 텍스트가 거의 같아도 합치지 않음)
+# 어떤 파일이 어떤 파일로 합쳐졌는지는 DuplicateReport 로 응답에 포함한다.
+import hashlib
+import os
+import re
+import zlib
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+DEDUP_ENABLED = os.getenv("DEDUP_ENABLED", "true").lower() == "true"
+DEDUP_NEAR_THRESHOLD = float(os.getenv("DEDUP_NEAR_THRESHOLD", "0.9"))  # 추정 Jaccard 유사도 기준 (0 이하면 유사 중복 검사 안 함)
+DEDUP_NUM_PERM = int(os.getenv("DEDUP_NUM_PERM", "64"))                  # MinHash 서명 길이
+DEDUP_BANDS = int(os.getenv("DEDUP_BANDS", "16"))                        # LSH 밴드 수 (밴드당 행 = NUM_PERM / BANDS)
+DEDUP_SHINGLE_SIZE = int(os.getenv("DEDUP_SHINGLE_SIZE", "3"))           # 단어 n-gram 크기
+
+# 레이아웃(공백/줄바꿈/표 구분)이 달라도 같은 토큰열이 나오도록 영숫자 단어만 소문자로 사용
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class DuplicateReport:
+    """대표 파일명 -> 합쳐진 파일 목록 (사유: exact / near)"""
+
+    def __init__(self):
+        self._groups: Dict[str, List[Tuple[str, str]]] = {}
+
+    def add(self, kept: str, merged: str, reason: str):
+        self._groups.setdefault(kept, []).append((merged, reason))
+
+    def __len__(self):
+        return sum(len(v) for v in self._groups.values())
+
+    def to_list(self) -> List[Dict]:
+        return [{"kept": kept, "merged": [{"file": name, "reason": reason} for name, reason in merged]}
+                for kept, merged in self._groups.items()]
+
+
+def unique_documents(documents: List[tuple], report: DuplicateReport) -> List[tuple]:
+    """(파일명, 바이트) 목록에서 바이트가 같은 파일은 첫 파일만 남김 (입력 순서 유지)"""
+    seen: Dict[str, str] = {}
+    unique = []
+    for name, data in documents:
+        digest = content_hash(data)
+        if digest in seen:
+            report.add(seen[digest], name, "exact")
+            continue
+        seen[digest] = name
+        unique.append((name, data))
+    return unique
+
+
+def shingles(text: str, size: int = DEDUP_SHINGLE_SIZE) -> np.ndarray:
+    """단어 n-gram 의 32비트 해시 집합 (토큰이 size 개 미만이면 전체를 하나로)"""
+    tokens = _TOKEN_PATTERN.findall(text.lower())
+    if not tokens:
+        return np.zeros(0, dtype=np.uint64)
+    count = max(1, len(tokens) - size + 1)
+    hashes = {zlib.crc32(" ".join(tokens[i:i + size]).encode("utf-8")) for i in range(count)}
+    return np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+
+
+class MinHasher:
+    """단어 n-gram MinHash 서명 계산기 (seed 가 같으면 프로세스가 달라도 같은 해시 함수)"""
+
+    def __init__(self, num_perm: int = DEDUP_NUM_PERM, shingle_size: int = DEDUP_SHINGLE_SIZE, seed: int = 1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        # 해시 함수 h(x) = (a*x + b) mod p (a, b < 2^32 이므로 a*x 가 uint64 범위를 넘지 않음)
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, 1 << 32, size=num_perm, dtype=np.uint64)
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        values = shingles(text, self.shingle_size)
+        if values.size == 0:
+            return None
+        hashed = (np.outer(self._a, values) + self._b[:, None]) % _MERSENNE_PRIME & _MAX_HASH
+        return hashed.min(axis=1)
+
+
+_text_hasher: Optional[MinHasher] = None
+
+
+def near_dedup_enabled() -> bool:
+    return DEDUP_ENABLED and DEDUP_NEAR_THRESHOLD > 0
+
+
+# 서명 설정이 바뀌면 캐시된 서명을 쓰지 않도록 파싱 캐시 키에 포함 (final_ai_server.PARSE_CACHE_VERSION)
+SIGNATURE_VERSION = f"minhash-{DEDUP_NUM_PERM}-{DEDUP_SHINGLE_SIZE}" if near_dedup_enabled() else "off"
+
+
+def text_signature(text: str) -> str:
+    """
+    파싱 단계(워커 프로세스)에서 원문 대신 남길 MinHash 서명 (uint32 little-endian hex 문자열).
+    파싱 결과 dict / 파싱 캐시(JSON)에 그대로 담을 수 있다. 유사 중복 검사가 꺼져 있거나 단어가 없으면 빈 문자열
+    """
+    global _text_hasher
+    if not near_dedup_enabled():
+        return ""
+    if _text_hasher is None:
+        _text_hasher = MinHasher()
+    signature = _text_hasher.signature(text)
+    return "" if signature is None else signature.astype("<u4").tobytes().hex()
+
+
+def identity_key(name: str) -> str:
+    """유사 중복 비교용 지원자 식별값 (대소문자/공백 무시한 이름, 이름이 없으면 빈 문자열)"""
+    return "".join((name or "").lower().split())
+
+
+def decode_signature(value: str) -> Optional[np.ndarray]:
+    if not value:
+        return None
+    return np.frombuffer(bytes.fromhex(value), dtype="<u4").astype(np.uint64)
+
+
+class NearDuplicateIndex:
+    """
+    MinHash + LSH 기반 유사 중복 인덱스 (요청 1건 안에서만 사용).
+    find_or_add(key, text) / find_or_add_signature(key, signature) 는 이미 등록된 유사 문서의 key 를 반환하고,
+    없으면 등록 후 None. 배치 단위로 들어오는 스트리밍 응답에서도 같은 인스턴스를 계속 쓰면 된다.
+    identity 를 주면 identity 가 같은(빈 값 제외) 문서만 유사 문서로 본다.
+    """
+
+    def __init__(self, threshold: float = DEDUP_NEAR_THRESHOLD, num_perm: int = DEDUP_NUM_PERM,
+                 bands: int = DEDUP_BANDS, shingle_size: int = DEDUP_SHINGLE_SIZE, seed: int = 1):
+        self.threshold = threshold
+        self.bands = max(1, min(bands, num_perm))
+        self.rows = num_perm // self.bands
+        self.num_perm = self.rows * self.bands
+        # text_signature 와 같은 해시 함수 (서명 앞 num_perm 개만 사용)
+        self.hasher = MinHasher(num_perm, shingle_size, seed)
+        self._buckets: Dict[tuple, List[int]] = {}
+        self._keys: List[str] = []
+        self._identities: List[Optional[str]] = []
+        self._signatures: List[np.ndarray] = []
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        return self.hasher.signature(text)
+
+    def _band_keys(self, signature: np.ndarray) -> Iterable[tuple]:
+        for band in range(self.bands):
+            yield (band, signature[band * self.rows:(band + 1) * self.rows].tobytes())
+
+    def find_or_add(self, key: str, text: str, identity: Optional[str] = None) -> Optional[str]:
+        return self.find_or_add_signature(key, self.signature(text), identity)
+
+    def find_or_add_signature(self, key: str, signature: Optional[np.ndarray],
+                              identity: Optional[str] = None) -> Optional[str]:
+        if signature is None or signature.size < self.num_perm:
+            return None
+        signature = signature[:self.num_perm]
+        band_keys = list(self._band_keys(signature))
+        candidates = {i for band_key in band_keys for i in self._buckets.get(band_key, ())}
+        # 같은 밴드에 걸린 후보만 서명 일치율(= 추정 Jaccard)로 확인, 가장 먼저 등록된 문서 선택
+        # (식별값이 다른 후보는 건너뛰고 나머지 후보를 계속 확인)
+        for i in sorted(candidates):
+            if identity is not None and (not identity or self._identities[i] != identity):
+                continue
+            if float(np.mean(self._signatures[i] == signature)) >= self.threshold:
+                return self._keys[i]
+
+        position = len(self._keys)
+        self._keys.append(key)
+        self._identities.append(identity)
+        self._signatures.append(signature)
+        for band_key in band_keys:
+            self._buckets.setdefault(band_key, []).append(position)
+        return None
+
+
+def drop_near_duplicates(parsed_results: List[Dict[str, str]], index: Optional[NearDuplicateIndex],
+                         report: DuplicateReport) -> List[Dict[str, str]]:
+    """
+    파싱 결과 중 이미 본 이력서와 텍스트가 거의 같고 이름도 같은 항목을 제외 (파싱 실패 항목은 그대로 둠).
+    원문은 파싱 결과에 남기지 않으므로 파싱 단계에서 계산한 서명(Text_Signature)으로 비교
+    """
+    if index is None:
+        return parsed_results
+    kept = []
+    for parsed in parsed_results:
+        if parsed.get("Parsing_Status") == "SUCCESS":
+            name = parsed.get("File_Name", "")
+            original = index.find_or_add_signature(name, decode_signature(parsed.get("Text_Signature", "")),
+                                                   identity_key(parsed.get("Name", "")))
+            if original is not None:
+                report.add(original, name, "near")
+                continue
+        kept.append(parsed)
+    return kept
+
+
+def new_near_index() -> Optional[NearDuplicateIndex]:
+    """설정에 따라 요청별 유사 중복 인덱스 생성 (비활성이면 None)"""
+    if not near_dedup_enabled():
+        return None
+    return NearDuplicateIndex()
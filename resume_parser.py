@@ -0,0 +1,113 @@
+# 이력서 파일 1개 파싱 (텍스트 추출 -> 필드 추출 -> 파싱 캐시)
+# final_ai_server 의 파싱 프로세스 풀 워커가 이 모듈만 import 한다.
+# 모델/Flask 를 import 하지 않으므로 워커 프로세스(forkserver/spawn)가 가볍게 뜨고,
+# 모델 로드 스레드가 있는 서버 프로세스를 fork 하지 않아도 된다.
+import io
+import os
+from typing import Dict
+
+import pypdf
+from docx import Document
+from docx.table import Table
+from docx.text.paragraph import Paragraph
+
+import field_extractor
+import parse_cache
+import resume_dedup
+
+base_dir = os.getcwd()
+
+# 파싱 결과 캐시 (파일 SHA-256 + 파서 버전 키, PARSE_CACHE_PATH 를 빈 값으로 두면 비활성)
+# 파싱 로직(정규식/정규화)을 바꿔 결과가 달라지면 PARSER_VERSION 을 올릴 것
+# (유사 중복 서명 설정도 캐시된 결과에 들어 있으므로 키에 함께 포함)
+PARSER_VERSION = "2"
+PARSE_CACHE_VERSION = f"{PARSER_VERSION}/{resume_dedup.SIGNATURE_VERSION}"
+PARSE_CACHE_PATH = os.getenv("PARSE_CACHE_PATH", os.path.join(base_dir, "cache", "parsed.sqlite3"))
+PARSE_CACHE_MAX_MB = int(os.getenv("PARSE_CACHE_MAX_MB", "512"))
+parsed_resume_cache = parse_cache.ParseCache(PARSE_CACHE_PATH, PARSE_CACHE_MAX_MB * 1024 * 1024) if PARSE_CACHE_PATH else None
+
+
+# (A-1) 텍스트 추출 함수
+def extract_pdf_text(source):
+    """PDF 파일(경로 또는 바이너리 스트림)의 텍스트를 추출하는 함수"""
+    try:
+        reader = pypdf.PdfReader(source)
+        text = ""
+        for page in reader.pages:
+            text += page.extract_text(extraction_mode="layout") + "\n\n"
+        return text.strip()
+    except Exception as e:
+        return f"EXTRACTION_ERROR: {e}"
+
+def extract_docx_text(source):
+    """DOCX 파일(경로 또는 바이너리 스트림)의 본문 문단과 표 텍스트를 문서 순서대로 추출"""
+    try:
+        document = Document(source)
+        lines = []
+        for child in document.element.body.iterchildren():
+            if child.tag.endswith('}p'):
+                lines.append(Paragraph(child, document).text)
+            elif child.tag.endswith('}tbl'):
+                for row in Table(child, document).rows:
+                    # 병합된 셀은 같은 셀이 반복되므로 연속 중복 제거
+                    cells = []
+                    for cell in row.cells:
+                        cell_text = cell.text.strip()
+                        if not cells or cells[-1] != cell_text:
+                            cells.append(cell_text)
+                    lines.append("  ".join(cells))
+        return "\n".join(lines).strip()
+    except Exception as e:
+        return f"EXTRACTION_ERROR: {e}"
+
+# (B) 필드 추출 (정규식은 field_extractor 모듈에서 import 시 1회 컴파일, 단일 스캔)
+#     기존 순차 정규식 파서와 결과 동일 여부는 parser_regression.py 로 확인
+
+# (C) 단일 PDF 파싱 함수
+def parse_single_resume(file_name: str, data: bytes) -> Dict[str, str]:
+    """단일 PDF/DOCX(메모리 바이트)에서 8가지 필수 정보를 추출하는 메인 파싱 함수 (파싱 캐시 사용)"""
+    # 동일 내용 파일은 캐시된 파싱 결과 재사용 (파일명만 현재 값으로 교체)
+    cache_key = parse_cache.make_key(data, PARSE_CACHE_VERSION)
+    if parsed_resume_cache is not None:
+        cached = parsed_resume_cache.get(cache_key)
+        if cached is not None:
+            cached["File_Name"] = file_name
+            return cached
+
+    # DOCX는 PDF 변환 없이 python-docx로 직접 텍스트 추출
+    if file_name.lower().endswith('.docx'):
+        extracted_text = extract_docx_text(io.BytesIO(data))
+    else:
+        extracted_text = extract_pdf_text(io.BytesIO(data))
+    parsed_data = parse_resume_text(extracted_text, file_name)
+    if parsed_resume_cache is not None and parsed_data["Parsing_Status"] == "SUCCESS":
+        parsed_resume_cache.put(cache_key, parsed_data)
+    return parsed_data
+
+
+def parse_resume_text(extracted_text: str, file_name: str) -> Dict[str, str]:
+    """추출된 이력서 텍스트에서 8가지 필수 정보를 추출 (원문 대신 유사 중복 검사용 서명만 남김)"""
+    if extracted_text.startswith("EXTRACTION_ERROR"):
+        return {"File_Name": file_name, "Parsing_Status": extracted_text}
+
+    # [노이즈 처리 로직] 제어 문자 제거 -> 오타/동의어 정규화 -> 연속 공백 정리
+    cleaned_text = field_extractor.clean_text(extracted_text)
+    
+    # 3. 핵심 정보 추출 (라벨 위치 1회 스캔)
+    fields = field_extractor.extract_fields(cleaned_text)
+    skills_list = fields["Skills"]
+    
+    # 4. 최종 데이터 구조화
+    parsed_data = {
+        "File_Name": file_name, "Parsing_Status": "SUCCESS",
+        "Name": fields["Name"], "Age": fields["Age"], "Gender": fields["Gender"],
+        "Job Roles": fields["Job Roles"], "Level": fields["Level"], "Degree": fields["Degree"],
+        "Certification": fields["Certification"],
+        "Text_Signature": resume_dedup.text_signature(extracted_text)
+    }
+    
+    # 5. Skills 5개 항목 분리 추가
+    for i in range(5):
+        parsed_data[f'Skill_{i+1}'] = skills_list[i] if i < len(skills_list) else ""
+        
+    return parsed_data
@@ -0,0 +1,77 @@
+# AI 서버 운영 실행 (gunicorn pre-fork + 스레드 워커)
+#   pip install gunicorn
+#   python serve_ai.py
+# 개발용 `python final_ai_server.py`(Flask 개발 서버)와 달리
+# - 마스터 프로세스에서 모델을 한 번 로드한 뒤 워커를 fork (가중치 메모리 copy-on-write 공유)
+# - 워커 수 / 워커당 스레드 수 / 타임아웃 설정 가능
+# - 요청 수 제한(429/503 + Retry-After), 요청당 처리 시간 제한, 인코딩 마이크로 배치는
+#   final_ai_server.py 의 AI_MAX_CONCURRENT, AI_MAX_QUEUE, AI_REQUEST_TIMEOUT, ENCODE_MICRO_BATCH 설정 사용
+#
+# 환경변수
+#   AI_BIND            : 바인드 주소 (기본 0.0.0.0:5000)
+#   AI_WORKERS         : 워커 프로세스 수 (기본 2)
+#   AI_THREADS         : 워커당 요청 스레드 수 (기본 AI_MAX_CONCURRENT + AI_MAX_QUEUE + 4,
+#                        대기열을 넘는 요청이 gunicorn 안에서 줄서지 않고 429 를 받도록 여유를 둠)
+#   AI_BACKLOG         : 소켓 대기 연결 수 (기본 64)
+#   AI_WORKER_TIMEOUT  : 응답 없는 워커 재시작 기준(초) (기본 AI_REQUEST_TIMEOUT + 60)
+import os
+import sys
+
+# 모델은 마스터에서 fork 전에 로드 (워커마다 다시 로드하지 않음)
+# 워밍업(실제 forward)은 torch 스레드 풀이 fork 이후에 만들어지도록 각 워커 시작 시 실행
+os.environ.setdefault("MODEL_LOAD_MODE", "eager")
+os.environ.setdefault("MODEL_EAGER_WARMUP", "false")
+
+AI_BIND = os.getenv("AI_BIND", "0.0.0.0:5000")
+AI_WORKERS = int(os.getenv("AI_WORKERS", "2"))
+_max_concurrent = int(os.getenv("AI_MAX_CONCURRENT", "2"))
+_max_queue = int(os.getenv("AI_MAX_QUEUE", "8"))
+AI_THREADS = int(os.getenv("AI_THREADS", str(_max_concurrent + _max_queue + 4)))
+AI_BACKLOG = int(os.getenv("AI_BACKLOG", "64"))
+AI_WORKER_TIMEOUT = int(os.getenv("AI_WORKER_TIMEOUT", str(int(float(os.getenv("AI_REQUEST_TIMEOUT", "600"))) + 60)))
+
+# 워커마다 파싱 프로세스 풀을 만들므로 CPU 코어를 워커 수로 나눠 씀 (과도한 프로세스 생성 방지)
+os.environ.setdefault("PARSE_WORKERS", str(max(1, (os.cpu_count() or 1) // max(1, AI_WORKERS))))
+
+
+def main():
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        print("오류: gunicorn 이 설치되어 있지 않습니다. `pip install gunicorn` 후 다시 실행하세요.")
+        return 1
+
+    class AIServerApplication(BaseApplication):
+        def __init__(self, options):
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            # preload_app=True 이므로 마스터에서 한 번만 import (모델 로드 포함)
+            from final_ai_server import app
+            return app
+
+    def post_worker_init(worker):
+        from final_ai_server import model_loader
+        model_loader.warmup()
+
+    AIServerApplication({
+        "bind": AI_BIND,
+        "workers": AI_WORKERS,
+        "worker_class": "gthread",
+        "threads": AI_THREADS,
+        "backlog": AI_BACKLOG,
+        "timeout": AI_WORKER_TIMEOUT,
+        "graceful_timeout": 30,
+        "preload_app": True,
+        "post_worker_init": post_worker_init,
+    }).run()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
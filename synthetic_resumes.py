@@ -0,0 +1,188 @@
+# 벤치마크용 합성 이력서 생성기
+# parse_single_resume 가 기대하는 양식(Name/Age/Gender/Job roles/Level/Degree/Skills/Certification)으로
+# PDF / DOCX 이력서를 만들고 ZIP 으로 묶는다. 같은 seed 면 같은 코퍼스가 나온다.
+#   python synthetic_resumes.py --count 1000 --output resumes_1000.zip
+#   python synthetic_resumes.py --count 200 --docx-ratio 0.5 --seed 7 --output mixed.zip
+#   python synthetic_resumes.py --count 200 --duplicate-ratio 0.2 --output dup.zip   (중복 제거 측정용)
+# PDF 는 외부 라이브러리 없이 직접 작성 (Helvetica 텍스트 1페이지), DOCX 는 python-docx 사용.
+import argparse
+import io
+import random
+import sys
+import zipfile
+from typing import Dict, List, Tuple
+
+# 라벨(Name, Age, Gender, Level, Degree, Skills ...)과 겹치는 단어가 값에 들어가지 않도록 고른 목록
+FIRST_NAMES = ["Min-jun", "Seo-yeon", "Ji-ho", "Ha-eun", "Do-yun", "Ji-woo", "Si-woo", "Su-ah", "Ye-jun",
+               "Yu-na", "Hyun-woo", "Chae-won", "Jun-seo", "Da-in", "Eun-ho", "So-yul", "Tae-rim", "Gil-dong"]
+LAST_NAMES = ["Kim", "Lee", "Park", "Choi", "Jung", "Kang", "Cho", "Yoon", "Jang", "Lim", "Han", "Oh", "Seo", "Shin"]
+JOB_ROLES = ["Data Analyst", "Backend Developer", "Frontend Developer", "Security Analyst", "ML Engineer",
+             "DevOps Engineer", "Data Scientist", "Cloud Architect", "QA Engineer", "Mobile Developer"]
+LEVELS = ["Junior", "Mid", "Senior", "Lead"]
+UNIVERSITIES = ["Seoul National University", "Yonsei University", "Korea University", "KAIST", "POSTECH",
+                "Hanyang University", "Sungkyunkwan University", "Kyung Hee University"]
+MAJORS = ["Computer Science", "Statistics", "Electrical Engineering", "Mathematics", "Industrial Engineering"]
+DEGREES = ["Bachelor", "Master", "PhD"]
+SKILLS = ["Python", "SQL", "Java", "Spring", "React", "Docker", "Kubernetes", "AWS", "Tableau", "Spark",
+          "Airflow", "PyTorch", "TensorFlow", "Linux", "Network", "Go", "Kotlin", "Swift", "Redis", "Kafka"]
+CERTIFICATIONS = [("SQLD", "Korea Data Agency"), ("ADsP", "Korea Data Agency"), ("CISSP", "ISC2"),
+                  ("AWS SAA", "Amazon"), ("CKA", "CNCF"), ("OCJP", "Oracle"), ("TOEIC 900", "ETS")]
+# 실제 업로드에서 자주 보이는 오타 (clean_text 의 정규화 경로도 측정되도록 일부 섞음)
+TYPOS = {"Python": "Pyhon", "Analyst": "Analystt", "Bachelor": "Bachlor", "Master": "Masteer"}
+
+PAGE_WIDTH, PAGE_HEIGHT = 595, 842
+
+
+def make_profile(rng: random.Random, typo_rate: float = 0.1) -> Dict:
+    def typo(word):
+        return TYPOS.get(word, word) if rng.random() < typo_rate else word
+
+    cert, institution = rng.choice(CERTIFICATIONS)
+    return {
+        "name": f"{rng.choice(LAST_NAMES)} {rng.choice(FIRST_NAMES)}",
+        "age": str(rng.randint(23, 55)),
+        "gender": rng.choice(["Male", "Female"]),
+        "job_roles": " / ".join(" ".join(typo(w) for w in role.split()) for role in rng.sample(JOB_ROLES, rng.randint(1, 2))),
+        "level": rng.choice(LEVELS),
+        "university": rng.choice(UNIVERSITIES),
+        "major": rng.choice(MAJORS),
+        "degree": typo(rng.choice(DEGREES)),
+        "gpa": f"{rng.uniform(3.0, 4.5):.1f}/4.5",
+        "skills": [typo(s) for s in rng.sample(SKILLS, rng.randint(3, 7))],
+        "certification": f"{cert}   {rng.randint(2015, 2024)}.{rng.randint(1, 12):02d}   {institution}",
+    }
+
+
+def render_lines(profile: Dict) -> List[str]:
+    """이력서 본문 줄 목록 (PDF 레이아웃 추출 결과와 같은 모양)"""
+    return [
+        "RESUME",
+        "",
+        f"Name        {profile['name']}                 Age     {profile['age']}",
+        f"Gender      {profile['gender']}",
+        f"Job roles   {profile['job_roles']}",
+        f"Level       {profile['level']}",
+        "Degree",
+        "  Name of University Major Degree GPA",
+        f"  {profile['university']}   {profile['major']}   {profile['degree']}   {profile['gpa']}",
+        "Skills",
+        "  " + "   ".join(profile["skills"]),
+        "Certification",
+        "  Name Date Institution",
+        f"  {profile['certification']}",
+    ]
+
+
+def _pdf_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def build_pdf(lines: List[str]) -> bytes:
+    """텍스트 줄을 Helvetica 로 배치한 1페이지 PDF (ASCII 전용)"""
+    content = ["BT", "/F1 11 Tf", "14 TL", f"50 {PAGE_HEIGHT - 60} Td"]
+    for line in lines:
+        content.append(f"({_pdf_escape(line)}) Tj T*")
+    content.append("ET")
+    stream = "\n".join(content).encode("latin-1", "replace")
+
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+        f"/Resources << /Font << /F1 4 0 R >> >> /Contents 5 0 R >>".encode(),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+        b"<< /Length " + str(len(stream)).encode() + b" >>\nstream\n" + stream + b"\nendstream",
+    ]
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(out.tell())
+        out.write(f"{number} 0 obj\n".encode() + body + b"\nendobj\n")
+    xref = out.tell()
+    out.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode())
+    for offset in offsets:
+        out.write(f"{offset:010d} 00000 n \n".encode())
+    out.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
+    return out.getvalue()
+
+
+def build_docx(profile: Dict) -> bytes:
+    """같은 내용의 DOCX (학위 정보는 표로 넣어 extract_docx_text 의 표 경로도 사용)"""
+    from docx import Document
+
+    document = Document()
+    lines = render_lines(profile)
+    for line in lines[:7]:                     # RESUME ~ Degree
+        document.add_paragraph(line)
+    table = document.add_table(rows=2, cols=4)
+    for cell, text in zip(table.rows[0].cells, ["Name of University", "Major", "Degree", "GPA"]):
+        cell.text = text
+    for cell, text in zip(table.rows[1].cells, [profile["university"], profile["major"], profile["degree"], profile["gpa"]]):
+        cell.text = text
+    for line in lines[9:]:                     # Skills ~ Certification
+        document.add_paragraph(line)
+    out = io.BytesIO()
+    document.save(out)
+    return out.getvalue()
+
+
+def generate_corpus(count: int, seed: int = 0, docx_ratio: float = 0.0,
+                    typo_rate: float = 0.1, duplicate_ratio: float = 0.0) -> List[Tuple[str, bytes]]:
+    """
+    (파일명, 파일 바이트) 목록.
+    duplicate_ratio 비율만큼 같은 지원자의 사본을 뒤에 추가 (절반은 `이름 (1).pdf` 같은 바이트 사본,
+    절반은 같은 내용을 다른 형식(PDF <-> DOCX)으로 만든 파일). 사본은 count 에 포함되지 않는다.
+    """
+    rng = random.Random(seed)
+    documents = []
+    copies = []
+    for i in range(count):
+        profile = make_profile(rng, typo_rate)
+        stem = f"{i + 1:05d}_{profile['name'].replace(' ', '_')}"
+        is_docx = rng.random() < docx_ratio
+        if is_docx:
+            documents.append((f"{stem}.docx", build_docx(profile)))
+        else:
+            documents.append((f"{stem}.pdf", build_pdf(render_lines(profile))))
+        if duplicate_ratio > 0 and rng.random() < duplicate_ratio:
+            copies.append((stem, profile, is_docx, documents[-1][1]))
+
+    for stem, profile, is_docx, data in copies:
+        if rng.random() < 0.5:
+            documents.append((f"{stem} (1).{'docx' if is_docx else 'pdf'}", data))
+        elif is_docx:
+            documents.append((f"{stem}.pdf", build_pdf(render_lines(profile))))
+        else:
+            documents.append((f"{stem}.docx", build_docx(profile)))
+    return documents
+
+
+def build_zip(documents: List[Tuple[str, bytes]]) -> bytes:
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, data in documents:
+            zf.writestr(f"resumes/{name}", data)
+    return out.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--docx-ratio", type=float, default=0.0)
+    parser.add_argument("--typo-rate", type=float, default=0.1)
+    parser.add_argument("--duplicate-ratio", type=float, default=0.0)
+    parser.add_argument("--output", default="synthetic_resumes.zip")
+    args = parser.parse_args()
+
+    documents = generate_corpus(args.count, args.seed, args.docx_ratio, args.typo_rate, args.duplicate_ratio)
+    data = build_zip(documents)
+    with open(args.output, "wb") as f:
+        f.write(data)
+    print(f"{args.output}: 이력서 {len(documents)}개, {len(data) / 1024:.1f} KB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+# encoding_engine.ModelLoader / MicroBatchEncoder 테스트 (python -m pytest tests)
+import os
+import sys
+import threading
+import time
+import unittest
+from unittest import mock
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import encoding_engine  # noqa: E402
+
+
+class FakeEngine:
+    """문장 길이를 임베딩으로 돌려주는 인코더. forward 마다 delay 만큼 걸림"""
+
+    batch_size = 64
+    last_stats = {}
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = []
+
+    def encode(self, texts, **kwargs):
+        self.calls.append(list(texts))
+        time.sleep(self.delay)
+        return np.array([[len(t), 1.0] for t in texts], dtype=np.float32)
+
+
+class MicroBatchEncoderTest(unittest.TestCase):
+    def test_results_keep_input_order(self):
+        encoder = encoding_engine.MicroBatchEncoder(FakeEngine(), max_batch=8, max_wait_ms=1, chunk_size=3)
+        texts = ["x" * i for i in range(1, 21)]
+        vectors = encoder.encode(texts, timeout=5)
+        self.assertEqual(vectors[:, 0].tolist(), [float(i) for i in range(1, 21)])
+
+    def test_query_not_blocked_behind_large_request(self):
+        engine = FakeEngine(delay=0.02)
+        encoder = encoding_engine.MicroBatchEncoder(engine, max_batch=8, max_wait_ms=1, chunk_size=4)
+        big = threading.Thread(target=encoder.encode, args=(["resume"] * 400,), kwargs={"timeout": 30})
+        big.start()
+        while not engine.calls:
+            time.sleep(0.001)
+
+        started = time.monotonic()
+        vectors = encoder.encode(["query"], timeout=5)
+        elapsed = time.monotonic() - started
+        big.join()
+
+        self.assertEqual(vectors.tolist(), [[5.0, 1.0]])
+        # 큰 요청(forward 50회 분량)이 끝날 때까지 기다리지 않고 다음 배치 안에 처리됨
+        self.assertLess(elapsed, 0.5)
+        self.assertTrue(all(len(call) <= 8 for call in engine.calls))
+
+
+class ModelLoaderTest(unittest.TestCase):
+    def test_failed_load_is_retried(self):
+        loader = encoding_engine.ModelLoader("fake", warmup_texts=[], retry_interval=0)
+        with mock.patch.object(encoding_engine, "configure_torch_threads", return_value={}), \
+                mock.patch.object(encoding_engine, "load_model", side_effect=OSError("no model")):
+            loader.start()
+            with self.assertRaisesRegex(encoding_engine.ModelNotReady, "로드 실패"):
+                loader.get(timeout=5)
+        self.assertFalse(loader.ready)
+        self.assertEqual(loader.status()["status"], "failed")
+
+        with mock.patch.object(encoding_engine, "configure_torch_threads", return_value={}), \
+                mock.patch.object(encoding_engine, "load_model", return_value=(object(), "cpu")):
+            loader.start()
+            engine = loader.get(timeout=5)
+        self.assertTrue(loader.ready)
+        self.assertIs(engine, loader.engine)
+        self.assertIsNone(loader.error)
+
+    def test_retry_waits_for_interval(self):
+        loader = encoding_engine.ModelLoader("fake", warmup_texts=[], retry_interval=3600)
+        with mock.patch.object(encoding_engine, "configure_torch_threads", return_value={}), \
+                mock.patch.object(encoding_engine, "load_model", side_effect=OSError("no model")) as load:
+            loader.start()
+            with self.assertRaises(encoding_engine.ModelNotReady):
+                loader.get(timeout=5)
+            loader.start()
+            with self.assertRaises(encoding_engine.ModelNotReady):
+                loader.get(timeout=0)
+        self.assertEqual(load.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
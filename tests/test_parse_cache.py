@@ -0,0 +1,66 @@
+# parse_cache.ParseCache 테스트 (python -m pytest tests)
+import os
+import sys
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import parse_cache  # noqa: E402
+
+
+class ParseCacheTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tmp.name, "parsed.sqlite3")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_used_from_other_thread(self):
+        # 캐시는 import 스레드에서 만들어지고 요청 스레드에서 사용된다
+        cache = parse_cache.ParseCache(self.path)
+        cache.put("a", {"Name": "Kim"})
+        results, errors = [], []
+
+        def worker():
+            try:
+                results.append(cache.get("a"))
+                cache.put("b", {"Name": "Lee"})
+                results.append(cache.stats())
+            except Exception as e:  # 다른 스레드의 예외는 테스트 실패로 넘김
+                errors.append(e)
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(results[0], {"Name": "Kim"})
+        self.assertEqual(results[1]["items"], 2)
+        self.assertEqual(cache.get("b"), {"Name": "Lee"})
+
+    def test_counters_and_size_total(self):
+        cache = parse_cache.ParseCache(self.path)
+        cache.put("a", {"Name": "Kim"})
+        cache.put("a", {"Name": "Kim Min-su"})   # 같은 키 교체는 항목 수를 늘리지 않음
+        self.assertIsNone(cache.get("missing"))
+        self.assertIsNotNone(cache.get("a"))
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["items"]), (1, 1, 1))
+        self.assertEqual(stats["bytes"], len('{"Name": "Kim Min-su"}'.encode("utf-8")))
+
+    def test_evicts_least_recently_used(self):
+        entry = {"Name": "x" * 100}
+        size = len(parse_cache.json.dumps(entry))
+        cache = parse_cache.ParseCache(self.path, max_bytes=size * 2)
+        for key in ("a", "b", "c"):
+            cache.put(key, entry)
+        self.assertIsNone(cache.get("a"))
+        self.assertIsNotNone(cache.get("c"))
+        stats = cache.stats()
+        self.assertEqual((stats["items"], stats["bytes"]), (2, size * 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+# resume_dedup 유사 중복 제거 테스트 (python -m pytest tests)
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import resume_dedup  # noqa: E402
+
+TEMPLATE = ("Name {name} Age 29 Gender Female Job roles Data Analyst Level Senior "
+            "Degree Seoul National University Statistics Master 4.1/4.5 Certification SQLD ADsP "
+            "Skills Python SQL Tableau Spark Excel Experience built reporting pipelines and dashboards "
+            "for marketing and finance teams using Python SQL and Tableau over five years")
+
+
+def parsed(file_name: str, name: str) -> dict:
+    return {"File_Name": file_name, "Parsing_Status": "SUCCESS", "Name": name,
+            "Text_Signature": resume_dedup.text_signature(TEMPLATE.format(name=name))}
+
+
+class NearDuplicateTest(unittest.TestCase):
+    def test_same_applicant_is_merged(self):
+        report = resume_dedup.DuplicateReport()
+        results = [parsed("a.pdf", "Kim Min-ji"), parsed("a.docx", "kim  min-ji")]
+        kept = resume_dedup.drop_near_duplicates(results, resume_dedup.NearDuplicateIndex(), report)
+        self.assertEqual([r["File_Name"] for r in kept], ["a.pdf"])
+        self.assertEqual(report.to_list(), [{"kept": "a.pdf", "merged": [{"file": "a.docx", "reason": "near"}]}])
+
+    def test_same_template_different_names_are_kept(self):
+        # 같은 양식에 이름만 다른 이력서는 텍스트가 거의 같아도 다른 지원자
+        index = resume_dedup.NearDuplicateIndex(threshold=0.5)
+        report = resume_dedup.DuplicateReport()
+        results = [parsed("a.pdf", "Kim Min-ji"), parsed("b.pdf", "Lee Min-ji"), parsed("c.pdf", "Lee Min-ji")]
+        kept = resume_dedup.drop_near_duplicates(results, index, report)
+        self.assertEqual([r["File_Name"] for r in kept], ["a.pdf", "b.pdf"])
+        self.assertEqual(report.to_list(), [{"kept": "b.pdf", "merged": [{"file": "c.pdf", "reason": "near"}]}])
+
+    def test_missing_names_are_not_merged(self):
+        report = resume_dedup.DuplicateReport()
+        results = [parsed("a.pdf", ""), parsed("b.pdf", "")]
+        kept = resume_dedup.drop_near_duplicates(results, resume_dedup.NearDuplicateIndex(), report)
+        self.assertEqual(len(kept), 2)
+        self.assertEqual(len(report), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
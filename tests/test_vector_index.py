@@ -0,0 +1,56 @@
+# vector_index.CandidateVectorIndex 테스트 (python -m pytest tests)
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import vector_index  # noqa: E402
+
+
+def vectors(count, seed):
+    return np.random.default_rng(seed).normal(size=(count, 8)).astype(np.float32)
+
+
+class RemoveJobTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.index = vector_index.CandidateVectorIndex(self._tmp.name)
+        self.index.add(1, [1, 2, 3], ["a", "b", "c"], vectors(3, 1))
+        self.index.add(2, [1, 2], ["d", "e"], vectors(2, 2))
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def search_jobs(self, index, **kwargs):
+        return sorted({hit["job_id"] for hit in index.search(vectors(1, 9)[0], top_k=10, **kwargs)})
+
+    def test_removed_job_is_not_searched(self):
+        self.assertEqual(self.index.remove_job(1), 3)
+        self.assertEqual(self.search_jobs(self.index), [2])
+        self.assertEqual(self.search_jobs(self.index, job_ids=[1, 2]), [2])
+        self.assertEqual(self.search_jobs(self.index, job_ids=[1, 2], exact=False), [2])
+        self.index._training.join()   # 근사 검색이 띄운 클러스터 학습이 임시 폴더 삭제 전에 끝나도록
+
+    def test_removal_seen_by_other_instance(self):
+        # 다른 워커 프로세스의 인덱스 인스턴스도 삭제 기록을 읽음
+        other = vector_index.CandidateVectorIndex(self._tmp.name)
+        self.index.remove_job(2)
+        self.assertEqual(self.search_jobs(other), [1])
+        self.assertEqual(self.search_jobs(vector_index.CandidateVectorIndex(self._tmp.name)), [1])
+
+    def test_reused_job_id_keeps_new_rows(self):
+        # SQLite 는 삭제된 작업 id 를 새 작업에 다시 줄 수 있음
+        self.index.remove_job(2)
+        self.index.add(2, [1], ["f"], vectors(1, 3))
+        hits = self.index.search(vectors(1, 9)[0], top_k=10, job_ids=[2])
+        self.assertEqual([hit["name"] for hit in hits], ["f"])
+        reopened = vector_index.CandidateVectorIndex(self._tmp.name)
+        self.assertEqual([hit["name"] for hit in reopened.search(vectors(1, 9)[0], top_k=10, job_ids=[2])], ["f"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,309 @@
+# 지원자 벡터 인덱스 (디스크 영구 저장, 전체 분석 작업 통합 검색용)
+# - vectors.f32 : 정규화된 float32 임베딩 (append-only, memmap 으로 읽음)
+# - meta.tsv    : 행마다 job_id, rank(작업 내 순위 = 백엔드 Applicant.rank), 이름
+# - ivf.npz     : 근사 검색(ANN)용 IVF 클러스터 (검색 대상 벡터 수가 ANN_THRESHOLD 이상일 때 사용, 백그라운드 학습)
+# - deleted.tsv : 삭제된 분석 작업 (job_id, 삭제 시점의 행 수). 그 이전 행은 검색에서 제외
+#                 (SQLite 는 삭제된 작업 id 를 다시 쓸 수 있으므로 삭제 이후 같은 id 로 추가된 행은 유지)
+# 분석 작업 id + 순위로 백엔드의 applicants 행(id)을 찾을 수 있다.
+# (벡터는 백엔드가 applicants 행을 만들기 전에 AI 서버에서 저장되므로 applicant id 대신 (작업 id, 순위)로 연결)
+import json
+import os
+import tempfile
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ranking import normalize_rows
+
+try:
+    import fcntl  # 여러 워커 프로세스가 같은 인덱스에 쓰는 경우 파일 잠금
+except ImportError:  # Windows
+    fcntl = None
+
+ANN_THRESHOLD = int(os.getenv("VECTOR_INDEX_ANN_THRESHOLD", "100000"))
+ANN_NPROBE = int(os.getenv("VECTOR_INDEX_NPROBE", "8"))
+ANN_REBUILD_GROWTH = 0.2      # 마지막 학습 이후 20% 이상 늘어나면 클러스터 재학습
+KMEANS_ITERATIONS = 10
+KMEANS_SAMPLE = 50000
+
+
+class CandidateVectorIndex:
+    """job_id / rank 메타데이터와 함께 지원자 임베딩을 저장하고 코사인 유사도로 검색"""
+
+    def __init__(self, index_dir: str):
+        self.index_dir = index_dir
+        os.makedirs(index_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._dim = None
+        self._job_ids = np.zeros(0, dtype=np.int64)
+        self._ranks = np.zeros(0, dtype=np.int64)
+        self._names: List[str] = []
+        self._meta_offset = 0
+        self._deleted = np.zeros(0, dtype=bool)   # 삭제된 작업의 행
+        self._tombstones: List[tuple] = []
+        self._tombstone_offset = 0
+        self._vectors = None
+        self._ivf = None
+        self._ivf_mtime = None
+        self._training: Optional[threading.Thread] = None
+        self._load_meta()
+        self._refresh()
+
+    # ------------------------------------------------------------------
+    # 파일 경로 / 로드
+
+    def _path(self, name):
+        return os.path.join(self.index_dir, name)
+
+    def _load_meta(self):
+        if os.path.exists(self._path("meta.json")):
+            with open(self._path("meta.json"), "r", encoding="utf-8") as f:
+                self._dim = json.load(f)["dim"]
+
+    def _refresh(self):
+        """다른 프로세스가 추가한 행까지 메타데이터를 이어서 읽음"""
+        if not os.path.exists(self._path("meta.tsv")):
+            return
+        job_ids, ranks = [], []
+        start = len(self._job_ids)
+        with open(self._path("meta.tsv"), "r", encoding="utf-8") as f:
+            f.seek(self._meta_offset)
+            for line in f:
+                if not line.endswith("\n"):
+                    break
+                job_id, rank, name = line.rstrip("\n").split("\t", 2)
+                job_ids.append(int(job_id))
+                ranks.append(int(rank))
+                self._names.append(name)
+                self._meta_offset += len(line.encode("utf-8"))
+        if job_ids:
+            self._job_ids = np.concatenate([self._job_ids, np.array(job_ids, dtype=np.int64)])
+            self._ranks = np.concatenate([self._ranks, np.array(ranks, dtype=np.int64)])
+            self._deleted = np.concatenate([self._deleted, np.zeros(len(job_ids), dtype=bool)])
+            self._vectors = None
+        self._refresh_tombstones(start)
+
+    def _refresh_tombstones(self, start: int):
+        """다른 프로세스가 기록한 작업 삭제까지 이어서 읽어 삭제 행 표시 (start 이후 행은 새로 읽은 행)"""
+        new = []
+        if os.path.exists(self._path("deleted.tsv")):
+            with open(self._path("deleted.tsv"), "r", encoding="utf-8") as f:
+                f.seek(self._tombstone_offset)
+                for line in f:
+                    if not line.endswith("\n"):
+                        break
+                    job_id, count = line.rstrip("\n").split("\t")
+                    new.append((int(job_id), int(count)))
+                    self._tombstone_offset += len(line.encode("utf-8"))
+        # 이전 삭제 기록은 새로 읽은 행에만, 새 삭제 기록은 전체 행에 적용
+        for job_id, count in self._tombstones:
+            if count > start:
+                limit = min(count, len(self._job_ids))
+                self._deleted[start:limit] |= self._job_ids[start:limit] == job_id
+        for job_id, count in new:
+            limit = min(count, len(self._job_ids))
+            self._deleted[:limit] |= self._job_ids[:limit] == job_id
+        self._tombstones.extend(new)
+
+    def _matrix(self) -> Optional[np.ndarray]:
+        if self._vectors is None and self._dim and len(self._job_ids):
+            self._vectors = np.memmap(self._path("vectors.f32"), dtype=np.float32, mode="r",
+                                      shape=(len(self._job_ids), self._dim))
+        return self._vectors
+
+    def __len__(self):
+        return len(self._job_ids)
+
+    # ------------------------------------------------------------------
+    # 추가
+
+    def add(self, job_id: int, ranks: List[int], names: List[str], vectors: np.ndarray):
+        """한 분석 작업의 지원자 벡터 추가 (벡터는 정규화해서 저장)"""
+        if len(ranks) == 0:
+            return
+        vectors = normalize_rows(vectors)
+        dim = vectors.shape[1]
+        with self._lock, open(self._path("meta.tsv"), "a", encoding="utf-8") as meta_file:
+            if fcntl:
+                fcntl.flock(meta_file, fcntl.LOCK_EX)
+            try:
+                if self._dim is None:
+                    self._load_meta()
+                if self._dim is None:
+                    with open(self._path("meta.json"), "w", encoding="utf-8") as f:
+                        json.dump({"dim": dim}, f)
+                    self._dim = dim
+                if self._dim != dim:
+                    raise ValueError(f"벡터 차원 불일치: index={self._dim}, input={dim}")
+
+                # 메타데이터 줄 수와 벡터 행 수를 맞춤 (중간에 실패한 쓰기 흔적은 잘라냄)
+                self._refresh()
+                with open(self._path("vectors.f32"), "a+b") as vf:
+                    vf.truncate(len(self._job_ids) * dim * 4)
+                    vf.seek(0, os.SEEK_END)
+                    vf.write(np.ascontiguousarray(vectors).tobytes())
+                meta_file.write("".join(
+                    f"{int(job_id)}\t{int(rank)}\t{str(name).replace(chr(9), ' ').replace(chr(10), ' ')}\n"
+                    for rank, name in zip(ranks, names)
+                ))
+                meta_file.flush()
+            finally:
+                if fcntl:
+                    fcntl.flock(meta_file, fcntl.LOCK_UN)
+            self._refresh()
+
+    def remove_job(self, job_id: int) -> int:
+        """분석 작업 삭제 시 해당 작업의 벡터를 검색에서 제외. 제외한 행 수 반환 (파일 공간은 회수하지 않음)"""
+        with self._lock, open(self._path("deleted.tsv"), "a", encoding="utf-8") as tomb_file:
+            if fcntl:
+                fcntl.flock(tomb_file, fcntl.LOCK_EX)
+            try:
+                self._refresh()
+                removed = int(np.count_nonzero((self._job_ids == job_id) & ~self._deleted))
+                tomb_file.write(f"{int(job_id)}\t{len(self._job_ids)}\n")
+                tomb_file.flush()
+            finally:
+                if fcntl:
+                    fcntl.flock(tomb_file, fcntl.LOCK_UN)
+            self._refresh()
+        return removed
+
+    # ------------------------------------------------------------------
+    # 근사 검색 (IVF: k-means 클러스터 중 가까운 nprobe 개만 탐색)
+    # 클러스터 학습은 검색 요청 안에서 하지 않고 백그라운드 스레드에서 (잠금 없이) 수행.
+    # 학습된 IVF 가 없으면 학습이 끝날 때까지 정확 검색
+
+    @staticmethod
+    def _train_ivf(matrix: np.ndarray):
+        n = matrix.shape[0]
+        nlist = max(1, int(np.sqrt(n)))
+        rng = np.random.default_rng(0)
+        sample = matrix[rng.choice(n, size=min(n, KMEANS_SAMPLE), replace=False)]
+        centroids = sample[rng.choice(len(sample), size=nlist, replace=False)].copy()
+        for _ in range(KMEANS_ITERATIONS):
+            assign = np.argmax(sample @ centroids.T, axis=1)
+            for c in range(nlist):
+                members = sample[assign == c]
+                if len(members):
+                    centroids[c] = members.mean(axis=0)
+            centroids = normalize_rows(centroids)
+
+        # 전체 벡터를 청크 단위로 클러스터에 배정
+        assignments = np.empty(n, dtype=np.int32)
+        for start in range(0, n, 65536):
+            assignments[start:start + 65536] = np.argmax(matrix[start:start + 65536] @ centroids.T, axis=1)
+        return {"centroids": centroids, "assignments": assignments}
+
+    def _save_ivf(self, ivf):
+        """임시 파일에 쓴 뒤 교체 (다른 프로세스가 쓰다 만 파일을 읽지 않도록)"""
+        fd, tmp_path = tempfile.mkstemp(dir=self.index_dir, prefix="ivf.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, centroids=ivf["centroids"], assignments=ivf["assignments"])
+            os.replace(tmp_path, self._path("ivf.npz"))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _load_ivf(self):
+        """디스크의 IVF 가 더 새로우면 (다른 프로세스가 학습한 경우 포함) 다시 읽음"""
+        try:
+            mtime = os.stat(self._path("ivf.npz")).st_mtime
+        except FileNotFoundError:
+            return self._ivf
+        if self._ivf is None or mtime != self._ivf_mtime:
+            with np.load(self._path("ivf.npz")) as data:
+                self._ivf = {"centroids": data["centroids"], "assignments": data["assignments"]}
+            self._ivf_mtime = mtime
+        return self._ivf
+
+    def _ivf_is_stale(self, size: int) -> bool:
+        trained = 0 if self._ivf is None else len(self._ivf["assignments"])
+        return trained == 0 or size > trained * (1 + ANN_REBUILD_GROWTH)
+
+    def _schedule_training(self, matrix: np.ndarray):
+        """IVF 가 없거나 오래됐으면 백그라운드 학습 시작 (이미 학습 중이면 무시). self._lock 을 잡은 상태에서 호출"""
+        if self._training is not None and self._training.is_alive():
+            return
+        self._load_ivf()
+        if not self._ivf_is_stale(len(matrix)):
+            return
+
+        def train():
+            try:
+                ivf = self._train_ivf(matrix)
+                self._save_ivf(ivf)
+                with self._lock:
+                    if self._ivf is None or len(ivf["assignments"]) > len(self._ivf["assignments"]):
+                        self._ivf = ivf
+                        self._ivf_mtime = os.stat(self._path("ivf.npz")).st_mtime
+            except Exception as e:
+                print(f"경고: 벡터 인덱스 클러스터 학습 실패 - {e}")
+
+        self._training = threading.Thread(target=train, name="vector-index-ivf", daemon=True)
+        self._training.start()
+
+    def _ann_candidates(self, query: np.ndarray, size: int, nprobe: int) -> Optional[np.ndarray]:
+        """IVF 후보 행 번호. 학습된 IVF 가 없으면 None"""
+        ivf = self._ivf
+        if ivf is None:
+            return None
+        trained = len(ivf["assignments"])
+        probe = np.argsort(-(ivf["centroids"] @ query))[:nprobe]
+        candidates = np.nonzero(np.isin(ivf["assignments"], probe))[0]
+        # 클러스터 학습 이후 추가된 행은 전부 정확 검색 대상에 포함
+        return np.concatenate([candidates, np.arange(trained, size)])
+
+    # ------------------------------------------------------------------
+    # 검색
+
+    def search(self, query_vector: np.ndarray, top_k: int = 20, job_ids: Optional[List[int]] = None,
+               exact: Optional[bool] = None, nprobe: int = ANN_NPROBE) -> List[Dict]:
+        """
+        코사인 유사도 상위 top_k 지원자 (job_ids 가 주어지면 해당 작업만, 삭제된 작업의 행은 제외).
+        job_ids 에 해당하는 행을 먼저 고르고, 그 행 수가 ANN_THRESHOLD 미만이면 정확 검색.
+        근사 검색 결과가 top_k 보다 적으면 해당 행 전체를 정확 검색
+        """
+        with self._lock:
+            self._refresh()
+            matrix = self._matrix()
+            if matrix is None or top_k <= 0:
+                return []
+            query = normalize_rows(query_vector).reshape(-1)
+
+            rows = None
+            if job_ids is not None:
+                rows = np.nonzero(np.isin(self._job_ids, np.asarray(job_ids, dtype=np.int64)) & ~self._deleted)[0]
+            elif self._deleted.any():
+                rows = np.nonzero(~self._deleted)[0]
+            subset_size = len(matrix) if rows is None else len(rows)
+
+            candidates = None
+            use_ann = (subset_size >= ANN_THRESHOLD) if exact is None else not exact
+            if use_ann:
+                self._schedule_training(matrix)
+                candidates = self._ann_candidates(query, len(matrix), nprobe)
+                if candidates is not None and rows is not None:
+                    candidates = candidates[np.isin(candidates, rows)]
+                if candidates is not None and len(candidates) < min(top_k, subset_size):
+                    candidates = None
+            if candidates is None:
+                candidates = np.arange(len(matrix)) if rows is None else rows
+            if len(candidates) == 0:
+                return []
+
+            scores = np.asarray(matrix[candidates] @ query)
+            k = min(top_k, len(candidates))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top], kind="stable")]
+            return [
+                {
+                    "job_id": int(self._job_ids[candidates[i]]),
+                    "rank": int(self._ranks[candidates[i]]),
+                    "name": self._names[candidates[i]],
+                    "score": float(scores[i]),
+                }
+                for i in top
+            ]